@@ -2,5 +2,7 @@
 分析模块
 """
 from .signal_analyzer import SignalAnalyzer
+from .signal_cache import SignalCache
+from .panel_analyzer import PanelAnalyzer
 
-__all__ = ['SignalAnalyzer']
+__all__ = ['SignalAnalyzer', 'SignalCache', 'PanelAnalyzer']
@@ -0,0 +1,134 @@
+"""
+全市场面板分析器（一次计算全部股票的指标、评分和信号）
+"""
+from collections import ChainMap
+from typing import Dict, Iterable, Mapping, Optional
+import numpy as np
+import pandas as pd
+from config import INDICATORS, PANEL_CONFIG
+from indicators import MovingAverage, RelativeStrengthIndex, MACD, KDJ
+from indicators.boll import BOLLIndicator
+from indicators.graph import IndicatorGraph
+from indicators.kernels import allocate_columns
+from .signal_analyzer import SCORE_COLUMNS, score_signals
+from utils.logger import setup_logger
+
+logger = setup_logger("panel_analyzer")
+
+# 横截面结果中保留的 K 线列
+BAR_FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def align_right(fields: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    把每只股票的有效 K 线移到数组底部并保持顺序，缺失的日期移到顶部
+
+    停牌日在面板中是 NaN，逐只分析时这些日期不存在。对齐后每列只有前导
+    NaN，滑动窗口和指数加权的计算与逐只分析一致，最后一行是每只股票
+    最近一根 K 线。
+
+    Args:
+        fields: {字段名: (日期数, 股票数) 数组}，以 close 是否为 NaN 判断缺失
+
+    Returns:
+        对齐后的 {字段名: 数组}；没有中间缺失时直接返回原数组
+    """
+    valid = ~np.isnan(fields['close'])
+    # 有效之后又出现缺失才需要移动
+    if not (valid[:-1] & ~valid[1:]).any():
+        return dict(fields)
+    order = np.argsort(valid, axis=0, kind='stable')
+    return {field: np.take_along_axis(values, order, axis=0) for field, values in fields.items()}
+
+
+class PanelAnalyzer:
+    """
+    面板分析器
+
+    在 (日期数, 股票数) 的二维数组上按列同时计算 MA/RSI/MACD/KDJ/BOLL，
+    评分规则与 SignalAnalyzer 相同，每只股票最新一行的结果与逐只调用
+    SignalAnalyzer.analyze 一致。股票按 PANEL_CONFIG['analysis_chunk']
+    分批计算以限制中间数组的内存。
+    """
+
+    def __init__(self):
+        """初始化面板分析器"""
+        self.ma = MovingAverage()
+        self.rsi = RelativeStrengthIndex()
+        self.macd = MACD()
+        self.kdj = KDJ()
+        self.boll = BOLLIndicator(INDICATORS['BOLL']['period'], INDICATORS['BOLL']['std_dev'])
+        self.indicators = [self.ma, self.rsi, self.macd, self.kdj]
+
+        self.columns = {}
+        for indicator in self.indicators:
+            self.columns.update(indicator.VALUE_COLUMNS)
+            self.columns.update(indicator.SIGNAL_COLUMNS)
+        self.columns.update(self.boll.VALUE_COLUMNS)
+        self.columns.update(SCORE_COLUMNS)
+
+    def compute(self, fields: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        计算全部历史的指标、信号和评分
+
+        Args:
+            fields: {字段名: (日期数, 股票数) 数组}，每列只应有前导 NaN（见 align_right）
+
+        Returns:
+            {列名: (日期数, 股票数) 数组}，另含 SIGNAL 字符串数组
+        """
+        out = allocate_columns(fields['close'].shape, self.columns)
+        data = ChainMap(out, fields)
+        # 布林带中轨与 MA_MEDIUM 等共用的中间结果只计算一次
+        graph = IndicatorGraph(indicator.nodes() for indicator in self.indicators + [self.boll])
+        graph.run(fields, out)
+        for indicator in self.indicators:
+            indicator.compute_signal(data, out)
+        out['SIGNAL'] = score_signals(out)
+        return out
+
+    def analyze(self, panel, symbols: Optional[Iterable[str]] = None, end=None) -> pd.DataFrame:
+        """
+        计算截至 end 每只股票最近一根 K 线的指标、评分和信号
+
+        Args:
+            panel: UniversePanel
+            symbols: 股票代码，默认面板中全部股票
+            end: 截止日期，默认面板最后一天
+
+        Returns:
+            以股票代码为索引的横截面结果：date（最近一根 K 线的日期）、
+            K 线列、各指标和信号列、BUY_SCORE、SELL_SCORE、SIGNAL；
+            区间内没有数据的股票不在结果中
+        """
+        rows = panel.rows(None, end)
+        dates = panel.dates[rows]
+        symbols = list(panel.symbols if symbols is None else symbols)
+        columns = np.array([panel.column(symbol) for symbol in symbols], dtype=np.intp)
+        chunk = PANEL_CONFIG['analysis_chunk']
+        logger.info(f"开始面板分析: {len(dates)} 个交易日 × {len(symbols)} 只股票")
+
+        parts = []
+        for lo in range(0, len(symbols) if len(dates) else 0, chunk):
+            cols = columns[lo:lo + chunk]
+            fields = {field: np.asarray(panel[field][rows][:, cols]) for field in BAR_FIELDS if field in panel.fields}
+
+            # 每只股票最近一根 K 线的日期（对齐前计算）
+            valid = ~np.isnan(fields['close'])
+            has_data = valid.any(axis=0)
+            last_row = len(dates) - 1 - np.argmax(valid[::-1], axis=0)
+
+            fields = align_right(fields)
+            out = self.compute(fields)
+            latest = {'date': dates[last_row].astype('datetime64[ns]')}
+            latest.update({field: values[-1] for field, values in fields.items()})
+            latest.update({col: values[-1] for col, values in out.items()})
+            part = pd.DataFrame(latest, index=pd.Index(symbols[lo:lo + chunk], name='code'))
+            parts.append(part[has_data])
+
+        if not parts:
+            return pd.DataFrame(columns=['date'] + BAR_FIELDS + list(self.columns) + ['SIGNAL'])
+        result = pd.concat(parts)
+        logger.info(f"面板分析完成: {len(result)} 只股票，"
+                    f"买入 {(result['SIGNAL'] == 'BUY').sum()}，卖出 {(result['SIGNAL'] == 'SELL').sum()}")
+        return result
@@ -1,14 +1,56 @@
 """
 信号分析器
 """
+from collections import ChainMap
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional
 from indicators import MovingAverage, RelativeStrengthIndex, MACD, KDJ
+from indicators.graph import IndicatorGraph
+from indicators.kernels import allocate_columns, frame_arrays
+from data_source.schema import format_date
 from config import SIGNAL_CONFIG
 from utils.logger import setup_logger
 
 logger = setup_logger("signal_analyzer")
 
+# 综合评分列
+SCORE_COLUMNS = {'BUY_SCORE': np.int64, 'SELL_SCORE': np.int64}
+
+
+def score_signals(out: Mapping[str, np.ndarray]) -> np.ndarray:
+    """
+    由信号列计算综合评分并生成最终信号（数组可以是一维或二维）
+
+    Args:
+        out: {列名: 数组}，包含各指标的信号列以及待写入的 BUY_SCORE、SELL_SCORE 列
+
+    Returns:
+        信号数组：'BUY' / 'SELL' / 'HOLD'（卖出优先）
+    """
+    # 买入条件评分
+    buy_conditions = SIGNAL_CONFIG['BUY_CONDITIONS']
+    buy_score = out['BUY_SCORE']
+    buy_score[...] = 0
+    buy_score += out['MA_GOLDEN_CROSS'] * buy_conditions['MA_CROSS_UP']
+    buy_score += out['RSI_OVERSOLD'] * buy_conditions['RSI_OVERSOLD']
+    buy_score += out['MACD_GOLDEN_CROSS'] * buy_conditions['MACD_GOLDEN_CROSS']
+    buy_score += out['KDJ_OVERSOLD'] * buy_conditions['KDJ_OVERSOLD']
+
+    # 卖出条件评分
+    sell_conditions = SIGNAL_CONFIG['SELL_CONDITIONS']
+    sell_score = out['SELL_SCORE']
+    sell_score[...] = 0
+    sell_score += out['MA_DEATH_CROSS'] * sell_conditions['MA_CROSS_DOWN']
+    sell_score += out['RSI_OVERBOUGHT'] * sell_conditions['RSI_OVERBOUGHT']
+    sell_score += out['MACD_DEATH_CROSS'] * sell_conditions['MACD_DEATH_CROSS']
+    sell_score += out['KDJ_OVERBOUGHT'] * sell_conditions['KDJ_OVERBOUGHT']
+
+    # 生成最终信号：持有 / 买入 / 卖出（卖出优先）
+    return np.select(
+        [sell_score >= SIGNAL_CONFIG['SELL_THRESHOLD'], buy_score >= SIGNAL_CONFIG['BUY_THRESHOLD']],
+        ['SELL', 'BUY'], default='HOLD')
+
 
 class SignalAnalyzer:
     """买卖信号分析器"""
@@ -33,42 +75,97 @@ class SignalAnalyzer:
         """
         logger.info("开始分析股票数据...")
 
-        df = df.copy()
-
-        # 计算所有指标
+        # 各指标直接在 K 线列的底层数组上计算，写入预先分配的列块，最后一次组装结果
+        inputs = frame_arrays(df)
+        columns = {}
         for indicator in self.indicators:
-            df = indicator.calculate(df)
-            df = indicator.get_signal(df)
+            columns.update(indicator.VALUE_COLUMNS)
+            columns.update(indicator.SIGNAL_COLUMNS)
+        columns.update(SCORE_COLUMNS)
+        out = allocate_columns(len(df), columns)
+        data = ChainMap(out, inputs)
+
+        # 所有指标合并为一张计算图，共用的中间结果只计算一次
+        IndicatorGraph(indicator.nodes() for indicator in self.indicators).run(inputs, out)
+        for indicator in self.indicators:
+            indicator.compute_signal(data, out)
 
-        # 综合评分
-        df['BUY_SCORE'] = 0
-        df['SELL_SCORE'] = 0
+        # 综合评分和最终信号
+        signal = score_signals(out)
 
-        # 买入条件评分
-        buy_conditions = SIGNAL_CONFIG['BUY_CONDITIONS']
-        df['BUY_SCORE'] += df.get('MA_GOLDEN_CROSS', 0) * buy_conditions['MA_CROSS_UP']
-        df['BUY_SCORE'] += df.get('RSI_OVERSOLD', 0) * buy_conditions['RSI_OVERSOLD']
-        df['BUY_SCORE'] += df.get('MACD_GOLDEN_CROSS', 0) * buy_conditions['MACD_GOLDEN_CROSS']
-        df['BUY_SCORE'] += df.get('KDJ_OVERSOLD', 0) * buy_conditions['KDJ_OVERSOLD']
+        result = {col: values for col, values in inputs.items() if col not in columns and col != 'SIGNAL'}
+        result.update(out)
+        result['SIGNAL'] = signal
+        df = pd.DataFrame(result, index=df.index)
 
-        # 卖出条件评分
-        sell_conditions = SIGNAL_CONFIG['SELL_CONDITIONS']
-        df['SELL_SCORE'] += df.get('MA_DEATH_CROSS', 0) * sell_conditions['MA_CROSS_DOWN']
-        df['SELL_SCORE'] += df.get('RSI_OVERBOUGHT', 0) * sell_conditions['RSI_OVERBOUGHT']
-        df['SELL_SCORE'] += df.get('MACD_DEATH_CROSS', 0) * sell_conditions['MACD_DEATH_CROSS']
-        df['SELL_SCORE'] += df.get('KDJ_OVERBOUGHT', 0) * sell_conditions['KDJ_OVERBOUGHT']
+        logger.info("分析完成")
+        return df
 
-        # 生成最终信号
-        df['SIGNAL'] = 'HOLD'  # 持有
+    def seed(self, df: pd.DataFrame) -> Optional[dict]:
+        """
+        用历史 K 线初始化各指标的增量计算状态
 
-        buy_threshold = SIGNAL_CONFIG['BUY_THRESHOLD']
-        sell_threshold = SIGNAL_CONFIG['SELL_THRESHOLD']
+        Args:
+            df: 包含 OHLCV 数据的 DataFrame
 
-        df.loc[df['BUY_SCORE'] >= buy_threshold, 'SIGNAL'] = 'BUY'
-        df.loc[df['SELL_SCORE'] >= sell_threshold, 'SIGNAL'] = 'SELL'
+        Returns:
+            最后一根 K 线的指标、信号和评分，没有数据时为 None
+        """
+        rows = [indicator.seed(df) for indicator in self.indicators]
+        if any(row is None for row in rows):
+            return None
+        return self._score({key: value for row in rows for key, value in row.items()})
 
-        logger.info("分析完成")
-        return df
+    def update(self, bar) -> dict:
+        """
+        追加一根新 K 线，增量计算全部指标和信号（结果与 analyze 的最后一行相同）
+
+        Args:
+            bar: 含 open/high/low/close 的 K 线（dict 或 Series）
+
+        Returns:
+            该 K 线的指标、信号和评分
+        """
+        row = {}
+        for indicator in self.indicators:
+            row.update(indicator.update(bar))
+        return self._score(row)
+
+    def revise_last(self, bar) -> dict:
+        """
+        修正最新一根 K 线（如盘中实时价格），增量重新计算全部指标和信号
+
+        Args:
+            bar: 修正后的 K 线
+
+        Returns:
+            该 K 线的指标、信号和评分
+        """
+        row = {}
+        for indicator in self.indicators:
+            row.update(indicator.revise_last(bar))
+        return self._score(row)
+
+    @staticmethod
+    def _score(row: dict) -> dict:
+        """按 analyze 的规则为单根 K 线计算综合评分和信号"""
+        buy_conditions = SIGNAL_CONFIG['BUY_CONDITIONS']
+        sell_conditions = SIGNAL_CONFIG['SELL_CONDITIONS']
+        buy_score = (row.get('MA_GOLDEN_CROSS', 0) * buy_conditions['MA_CROSS_UP']
+                     + row.get('RSI_OVERSOLD', 0) * buy_conditions['RSI_OVERSOLD']
+                     + row.get('MACD_GOLDEN_CROSS', 0) * buy_conditions['MACD_GOLDEN_CROSS']
+                     + row.get('KDJ_OVERSOLD', 0) * buy_conditions['KDJ_OVERSOLD'])
+        sell_score = (row.get('MA_DEATH_CROSS', 0) * sell_conditions['MA_CROSS_DOWN']
+                      + row.get('RSI_OVERBOUGHT', 0) * sell_conditions['RSI_OVERBOUGHT']
+                      + row.get('MACD_DEATH_CROSS', 0) * sell_conditions['MACD_DEATH_CROSS']
+                      + row.get('KDJ_OVERBOUGHT', 0) * sell_conditions['KDJ_OVERBOUGHT'])
+
+        signal = 'HOLD'
+        if buy_score >= SIGNAL_CONFIG['BUY_THRESHOLD']:
+            signal = 'BUY'
+        if sell_score >= SIGNAL_CONFIG['SELL_THRESHOLD']:
+            signal = 'SELL'
+        return {**row, 'BUY_SCORE': buy_score, 'SELL_SCORE': sell_score, 'SIGNAL': signal}
 
     def get_analysis_report(self, df: pd.DataFrame, index: int = -1) -> str:
         """
@@ -91,7 +188,7 @@ class SignalAnalyzer:
         high = row['high']
         low = row['low']
         volume = row.get('vol', row.get('volume', 0))
-        date = row.get('trade_date', '')
+        date = format_date(row.name)
 
         report = f"""
 ╔════════════════════════════════════════════════════╗
@@ -155,7 +252,7 @@ class SignalAnalyzer:
         for idx, row in recent.iterrows():
             if row['SIGNAL'] in ['BUY', 'SELL']:
                 signals.append({
-                    'date': row.get('trade_date', ''),
+                    'date': format_date(idx),
                     'signal': row['SIGNAL'],
                     'price': row['close'],
                     'buy_score': row.get('BUY_SCORE', 0),
@@ -0,0 +1,123 @@
+"""
+预计算的分析结果缓存（收盘后由 warmup.py 生成，开盘前后直接读取）
+"""
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+import pandas as pd
+from config import WARMUP_CONFIG
+from data_source.bar_store import BarStore
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 汇总表中每只股票保存的最新一行分析结果字段
+SUMMARY_COLUMNS = ['close', 'BUY_SCORE', 'SELL_SCORE', 'SIGNAL', 'RSI', 'MACD_HIST',
+                   'MA_SHORT', 'MA_MEDIUM']
+
+
+class SignalCache:
+    """
+    分析结果缓存
+
+    每只股票保存最近若干行完整的分析结果（含全部指标列），另有一张以股票
+    代码为行的汇总表保存每只股票最新一行的评分和信号，元数据记录结果
+    对应的交易日 as_of。
+    """
+
+    SUMMARY_KEY = '_summary'
+
+    def __init__(self, root: Path = None):
+        """
+        初始化分析结果缓存
+
+        Args:
+            root: 缓存目录，默认取 WARMUP_CONFIG['signal_path']
+        """
+        self.store = BarStore(root or WARMUP_CONFIG['signal_path'])
+
+    @property
+    def as_of(self) -> Optional[pd.Timestamp]:
+        """汇总表对应的交易日，没有缓存时为 None"""
+        meta = self.store.read_meta(self.SUMMARY_KEY)
+        return pd.Timestamp(meta['as_of']) if meta else None
+
+    def is_fresh(self, as_of) -> bool:
+        """
+        判断缓存是否已包含指定交易日的结果
+
+        Args:
+            as_of: 交易日
+
+        Returns:
+            缓存的交易日不早于 as_of 时为 True
+        """
+        cached = self.as_of
+        return cached is not None and cached >= pd.Timestamp(as_of).normalize()
+
+    def save_symbol(self, code: str, df: pd.DataFrame):
+        """
+        保存一只股票的分析结果（只保留最近 WARMUP_CONFIG['history'] 行）
+
+        Args:
+            code: 股票代码
+            df: SignalAnalyzer.analyze 的结果
+        """
+        tail = df.tail(WARMUP_CONFIG['history'])
+        self.store.write(code, tail, {'as_of': tail.index[-1].strftime('%Y%m%d'), 'rows': len(tail)})
+
+    def save_summary(self, rows: Dict[str, dict], as_of: pd.Timestamp):
+        """
+        保存汇总表
+
+        Args:
+            rows: {股票代码: 最新一行的字段}
+            as_of: 结果对应的交易日
+        """
+        summary = pd.DataFrame.from_dict(rows, orient='index').rename_axis('code').reset_index()
+        self.store.write(self.SUMMARY_KEY, summary,
+                         {'as_of': as_of.strftime('%Y%m%d'), 'count': len(summary)})
+        logger.info(f"分析结果汇总已保存: {len(summary)} 只股票 ({as_of:%Y-%m-%d})")
+
+    def load_summary(self, codes: Iterable[str] = None) -> pd.DataFrame:
+        """
+        读取汇总表
+
+        Args:
+            codes: 只返回这些股票，默认全部
+
+        Returns:
+            以股票代码为索引的汇总表，没有缓存时为空表
+        """
+        summary = self.store.read(self.SUMMARY_KEY)
+        if summary.empty:
+            return summary
+        summary = summary.set_index('code')
+        if codes is not None:
+            summary = summary[summary.index.isin(list(codes))]
+        return summary
+
+    def load_symbol(self, code: str) -> pd.DataFrame:
+        """
+        读取一只股票的分析结果
+
+        Args:
+            code: 股票代码
+
+        Returns:
+            分析结果 DataFrame，没有缓存时为空表
+        """
+        return self.store.read(code)
+
+
+def summarize(df: pd.DataFrame) -> dict:
+    """
+    取分析结果最新一行的汇总字段
+
+    Args:
+        df: SignalAnalyzer.analyze 的结果
+
+    Returns:
+        汇总字段字典
+    """
+    latest = df.iloc[-1]
+    return {col: latest[col] for col in SUMMARY_COLUMNS if col in df.columns}
@@ -79,12 +79,15 @@ def analyze_batch(stock_list: Dict[str, str] = None) -> Dict:
     total = len(stock_list)
     print(f"开始批量分析 {total} 只股票...\n")
 
+    # 一次批量下载全部股票数据
+    frames = data_source.get_daily_data_many(list(stock_list), start_date, end_date)
+
     for i, (code, name) in enumerate(stock_list.items(), 1):
         print(f"[{i}/{total}] 分析 {name} ({code})...")
 
         try:
             # 获取数据
-            df = data_source.get_daily_data(code, start_date, end_date)
+            df = frames.get(code, pd.DataFrame())
 
             if df.empty:
                 print(f"  - 跳过：未获取到数据")
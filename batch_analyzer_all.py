@@ -6,8 +6,10 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from data_source import AKShareDataSource
-from analysis import SignalAnalyzer
+from data_source import AKShareDataSource, get_universe_panel
+from analysis import SignalAnalyzer, PanelAnalyzer
+from config import RATE_LIMIT_CONFIG
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from typing import List, Dict, Optional
 
@@ -17,33 +19,24 @@ def get_all_stocks(market: Optional[str] = None) -> Dict[str, str]:
     获取全部 A 股列表
 
     Args:
-        market: 市场筛选，'沪A', '深A', None(全部)
+        market: 市场筛选，'沪A', '深A', '创业板', '科创板', None(全部)
 
     Returns:
         股票代码到名称的映射
     """
-    data_source = AKShareDataSource()
-    df = data_source.get_stock_list()
-
-    stock_dict = {}
-
-    for _, row in df.iterrows():
-        code = row['code']
-        name = row['name']
-        stock_dict[code] = name
+    universe = AKShareDataSource().get_universe()
 
-    if market:
-        # 按市场筛选
-        market_map = {
-            '沪A': '沪A主板',
-            '深A': '深A主板',
-            '创业板': '创业板',
-        }
-        if market in market_map:
-            df_filtered = df[df['market'].str.contains(market_map[market])]
-            stock_dict = {row['code']: row['name'] for _, row in df_filtered.iterrows()}
+    if not market:
+        return universe.to_dict()
 
-    return stock_dict
+    # 按市场筛选
+    market_map = {
+        '沪A': {'exchange': '上交所', 'board': '主板'},
+        '深A': {'exchange': '深交所', 'board': ['主板', '中小板']},
+        '创业板': {'board': '创业板'},
+        '科创板': {'board': '科创板'},
+    }
+    return universe.to_dict(**market_map.get(market, {'board': market}))
 
 
 def analyze_batch_stocks(stock_list: Dict[str, str] = None, limit: Optional[int] = None) -> Dict:
@@ -77,52 +70,61 @@ def analyze_batch_stocks(stock_list: Dict[str, str] = None, limit: Optional[int]
     total = len(stock_list)
     print(f"开始批量分析 {total} 只股票...\\n")
 
-    for i, (code, name) in enumerate(stock_list.items(), 1):
-        print(f"[{i}/{total}] 分析 {name} ({code})...", end=' ')
+    # 并行下载，实际并发和请求速率由 AKShare 限流器自适应控制
+    with ThreadPoolExecutor(max_workers=RATE_LIMIT_CONFIG['max_concurrency']) as pool:
+        futures = {code: pool.submit(data_source.get_daily_data, code) for code in stock_list}
 
         try:
-            # 获取数据
-            df = data_source.get_daily_data(code)
-
-            if df.empty:
-                print("跳过：未获取到数据")
-                failed_stocks.append({'code': code, 'name': name, 'reason': '无数据'})
-                continue
-
-            # 技术分析
-            df = analyzer.analyze(df)
-
-            # 获取最新分析结果
-            latest = df.iloc[-1]
-            signal = latest.get('SIGNAL', 'HOLD')
-            buy_score = latest.get('BUY_SCORE', 0)
-            sell_score = latest.get('SELL_SCORE', 0)
-            price = latest['close']
-
-            stock_info = {
-                'code': code,
-                'name': name,
-                'price': price,
-                'buy_score': buy_score,
-                'sell_score': sell_score,
-                'rsi': latest.get('RSI', 0),
-                'ma_trend': '多头' if latest['MA_SHORT'] > latest['MA_MEDIUM'] else '空头',
-            }
-
-            # 分类
-            if signal == 'BUY':
-                buy_stocks.append(stock_info)
-                print(f"-> [买入建议] 买入评分: {buy_score}")
-            elif signal == 'SELL':
-                sell_stocks.append(stock_info)
-                print(f"-> [卖出建议] 卖出评分: {sell_score}")
-            else:
-                hold_stocks.append(stock_info)
-                print(f"-> [持有建议] 买入评分: {buy_score}, 卖出评分: {sell_score}")
-
-        except Exception as e:
-            print(f"-> 失败: {e}")
-            failed_stocks.append({'code': code, 'name': name, 'reason': str(e)})
+            for i, (code, name) in enumerate(stock_list.items(), 1):
+                print(f"[{i}/{total}] 分析 {name} ({code})...", end=' ')
+
+                try:
+                    # 获取数据
+                    df = futures.pop(code).result()
+
+                    if df.empty:
+                        print("跳过：未获取到数据")
+                        failed_stocks.append({'code': code, 'name': name, 'reason': '无数据'})
+                        continue
+
+                    # 技术分析
+                    df = analyzer.analyze(df)
+
+                    # 获取最新分析结果
+                    latest = df.iloc[-1]
+                    signal = latest.get('SIGNAL', 'HOLD')
+                    buy_score = latest.get('BUY_SCORE', 0)
+                    sell_score = latest.get('SELL_SCORE', 0)
+                    price = latest['close']
+
+                    stock_info = {
+                        'code': code,
+                        'name': name,
+                        'price': price,
+                        'buy_score': buy_score,
+                        'sell_score': sell_score,
+                        'rsi': latest.get('RSI', 0),
+                        'ma_trend': '多头' if latest['MA_SHORT'] > latest['MA_MEDIUM'] else '空头',
+                    }
+
+                    # 分类
+                    if signal == 'BUY':
+                        buy_stocks.append(stock_info)
+                        print(f"-> [买入建议] 买入评分: {buy_score}")
+                    elif signal == 'SELL':
+                        sell_stocks.append(stock_info)
+                        print(f"-> [卖出建议] 卖出评分: {sell_score}")
+                    else:
+                        hold_stocks.append(stock_info)
+                        print(f"-> [持有建议] 买入评分: {buy_score}, 卖出评分: {sell_score}")
+
+                except Exception as e:
+                    print(f"-> 失败: {e}")
+                    failed_stocks.append({'code': code, 'name': name, 'reason': str(e)})
+        finally:
+            # 中途异常或中断时取消尚未开始的下载，不必等它们全部完成
+            for future in futures.values():
+                future.cancel()
 
     return {
         'buy': buy_stocks,
@@ -132,6 +134,49 @@ def analyze_batch_stocks(stock_list: Dict[str, str] = None, limit: Optional[int]
     }
 
 
+def analyze_panel_stocks(stock_list: Dict[str, str] = None, limit: Optional[int] = None) -> Dict:
+    """
+    用 warmup.py 生成的全市场日线面板一次分析全部股票（不请求网络）
+
+    Args:
+        stock_list: 股票代码到名称的映射，None 表示面板中的全部股票
+        limit: 限制分析数量，None 表示全部
+
+    Returns:
+        分类结果，格式同 analyze_batch_stocks
+    """
+    panel = get_universe_panel()
+    if panel is None:
+        raise FileNotFoundError("没有全市场日线面板，请先运行 python warmup.py")
+
+    if stock_list is None:
+        stock_list = AKShareDataSource().get_universe().to_dict()
+    if limit and len(stock_list) > limit:
+        stock_list = dict(list(stock_list.items())[:limit])
+
+    symbols = [code for code in stock_list if code in panel]
+    print(f"面板分析 {len(symbols)} 只股票（数据日期 {panel.as_of}）...")
+    report = PanelAnalyzer().analyze(panel, symbols)
+
+    result = {'buy': [], 'sell': [], 'hold': [], 'failed': []}
+    for code, name in stock_list.items():
+        if code not in report.index:
+            result['failed'].append({'code': code, 'name': name, 'reason': '面板中无数据'})
+            continue
+        latest = report.loc[code]
+        stock_info = {
+            'code': code,
+            'name': name,
+            'price': latest['close'],
+            'buy_score': latest['BUY_SCORE'],
+            'sell_score': latest['SELL_SCORE'],
+            'rsi': latest['RSI'],
+            'ma_trend': '多头' if latest['MA_SHORT'] > latest['MA_MEDIUM'] else '空头',
+        }
+        result[{'BUY': 'buy', 'SELL': 'sell'}.get(latest['SIGNAL'], 'hold')].append(stock_info)
+    return result
+
+
 def print_report(result: Dict, show_all: bool = False):
     """
     打印分析报告
@@ -262,10 +307,11 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description='全部A股票批量分析工具')
     parser.add_argument('--limit', type=int, default=50, help='限制分析数量（默认50只）')
-    parser.add_argument('--market', type=str, help='市场筛选：沪A、深A')
+    parser.add_argument('--market', type=str, help='市场筛选：沪A、深A、创业板、科创板')
     parser.add_argument('--all', action='store_true', help='分析全部股票（可能很慢）')
     parser.add_argument('--show-all', action='store_true', help='显示全部持有股票')
     parser.add_argument('--save', action='store_true', help='保存报告到 CSV')
+    parser.add_argument('--panel', action='store_true', help='使用 warmup.py 生成的日线面板一次分析（不请求网络）')
 
     args = parser.parse_args()
 
@@ -280,7 +326,10 @@ if __name__ == "__main__":
         stock_list = dict(list(stock_list.items())[:args.limit])
 
     # 分析
-    result = analyze_batch_stocks(stock_list, limit=None if args.all else args.limit)
+    if args.panel:
+        result = analyze_panel_stocks(stock_list, limit=None if args.all else args.limit)
+    else:
+        result = analyze_batch_stocks(stock_list, limit=None if args.all else args.limit)
 
     # 打印报告
     print_report(result, show_all=args.show_all)
@@ -98,10 +98,13 @@ if analyze_button or 'results' not in st.session_state:
         total = len(STOCK_POOL)
         progress_bar = st.progress(0)
 
+        # 一次批量下载全部股票数据
+        frames = data_source.get_daily_data_many(list(STOCK_POOL), start_date, end_date)
+
         for i, (code, name) in enumerate(STOCK_POOL.items(), 1):
             try:
                 # 获取数据
-                df = data_source.get_daily_data(code, start_date, end_date)
+                df = frames.get(code, pd.DataFrame())
 
                 if df.empty:
                     failed_stocks.append({'code': code, 'name': name, 'reason': '无数据'})
@@ -10,9 +10,9 @@ sys.path.insert(0, str(Path(__file__).parent))
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-from data_source import YFinanceDataSource
+from data_source import AKShareDataSource, YFinanceDataSource, SYMBOL_METADATA
 from analysis import SignalAnalyzer
-from config import SIGNAL_CONFIG, INDICATORS
+from config import SIGNAL_CONFIG, INDICATORS, BATCH_WEB_CONFIG
 
 # 页面配置
 st.set_page_config(
@@ -767,6 +767,8 @@ def get_all_stocks_grouped():
     """
     获取所有A股股票，按交易所、板块和行业分组
 
+    优先使用全市场股票池索引；索引不可用（如无网络且无本地数据）时退回内置股票池。
+
     Returns:
         分组后的股票数据 {交易所: {板块: {行业: {code: (name, industry)}}}
     """
@@ -782,6 +784,16 @@ def get_all_stocks_grouped():
         }
     }
 
+    universe = AKShareDataSource().get_universe()
+    if len(universe) > 0:
+        for exchange, boards in universe.grouped().items():
+            if exchange not in grouped:
+                continue
+            for board, industries in boards.items():
+                if board in grouped[exchange]:
+                    grouped[exchange][board] = industries
+        return grouped
+
     # 分类股票
     for code, (name, industry) in STOCK_POOL.items():
         # 判断交易所和板块
@@ -806,6 +818,23 @@ def get_all_stocks_grouped():
     return grouped
 
 
+def select_stocks(codes) -> int:
+    """
+    把股票加入已选列表，总数不超过 BATCH_WEB_CONFIG['max_selection']
+
+    Args:
+        codes: 股票代码
+
+    Returns:
+        实际新增的数量
+    """
+    selected = st.session_state['selected_stocks']
+    room = BATCH_WEB_CONFIG['max_selection'] - len(selected)
+    added = [code for code in codes if code not in selected][:max(room, 0)]
+    selected.update(added)
+    return len(added)
+
+
 # 初始化 session state
 if 'selected_stocks' not in st.session_state:
     st.session_state['selected_stocks'] = set()
@@ -922,26 +951,47 @@ with left_col:
 
     st.markdown("---")
 
-    # 快捷操作按钮
+    # 股票选择区域
+    grouped = get_all_stocks_grouped()
+    all_codes = [
+        code
+        for markets in grouped.values()
+        for industries in markets.values()
+        for stocks in industries.values()
+        for code in stocks
+    ]
+
+    # 快捷操作：全选只作用于单个板块，已选总数不超过上限
+    max_selection = BATCH_WEB_CONFIG['max_selection']
+    boards = {
+        f"{exchange} · {market} ({sum(len(stocks) for stocks in industries.values())}只)":
+            [code for stocks in industries.values() for code in stocks]
+        for exchange, markets in grouped.items()
+        for market, industries in markets.items()
+        if industries
+    }
+    board = st.selectbox("板块", list(boards), key="select_board") if boards else None
+
     col1, col2 = st.columns(2)
     with col1:
-        if st.button("✓ 全选所有股票", key="select_all"):
-            for code in STOCK_POOL.keys():
-                st.session_state['selected_stocks'].add(code)
+        if st.button("✓ 全选本板块", key="select_all", disabled=board is None):
+            new_codes = [code for code in boards[board] if code not in st.session_state['selected_stocks']]
+            if select_stocks(new_codes) < len(new_codes):
+                st.session_state['selection_capped'] = True
             st.rerun()
     with col2:
         if st.button("✗ 清空选择", key="clear_all"):
             st.session_state['selected_stocks'].clear()
             st.rerun()
 
-    st.caption(f"已选择: {len(st.session_state['selected_stocks'])} / {len(STOCK_POOL)} 只股票")
+    if st.session_state.pop('selection_capped', False):
+        st.warning(f"一次最多分析 {max_selection} 只股票，超出部分未选中")
+    st.caption(f"已选择: {len(st.session_state['selected_stocks'])} / {len(all_codes)} 只股票"
+               f"（上限 {max_selection} 只）")
 
     st.markdown("---")
     st.subheader("📋 选择股票")
 
-    # 股票选择区域
-    grouped = get_all_stocks_grouped()
-
     # 按交易所展开
     for exchange, markets in grouped.items():
         with st.expander(f"🏢 {exchange}", expanded=False):
@@ -987,13 +1037,11 @@ with left_col:
                                 key=f"editor_{industry_key}"
                             )
 
-                            # 更新session state
-                            for idx, row in edited_df.iterrows():
-                                code = row['代码']
-                                if row['选择']:
-                                    st.session_state['selected_stocks'].add(code)
-                                else:
-                                    st.session_state['selected_stocks'].discard(code)
+                            # 更新session state（新勾选的股票受总数上限限制）
+                            checked = edited_df['选择'].to_numpy(dtype=bool)
+                            codes = edited_df['代码']
+                            st.session_state['selected_stocks'].difference_update(codes[~checked])
+                            select_stocks(codes[checked])
 
                             # 显示数量
                             selected_count = len([s for s in df['选择'] if s])
@@ -1125,9 +1173,13 @@ with col1:
     # 显示选择的股票数量
     selected_count = len(st.session_state['selected_stocks'])
     st.metric("已选择股票", selected_count)
+    too_many = selected_count > BATCH_WEB_CONFIG['max_selection']
+    if too_many:
+        st.warning(f"一次最多分析 {BATCH_WEB_CONFIG['max_selection']} 只股票，请减少选择")
 
     # 分析按钮
-    if st.button("📊 开始批量分析", type="primary", use_container_width=True, disabled=selected_count == 0):
+    if st.button("📊 开始批量分析", type="primary", use_container_width=True,
+                 disabled=selected_count == 0 or too_many):
         with st.spinner("正在分析股票，请稍候..."):
             data_source = YFinanceDataSource()
             analyzer = SignalAnalyzer()
@@ -1158,12 +1210,20 @@ with col1:
 
             selected_codes = sorted(list(st.session_state['selected_stocks']))
 
+            # 分批下载选中股票的数据，避免单次请求过大触发限流或超时
+            frames = {}
+            chunk = BATCH_WEB_CONFIG['download_chunk']
+            for lo in range(0, len(selected_codes), chunk):
+                status_text.text(f"正在下载数据: {lo}/{len(selected_codes)} 只")
+                frames.update(data_source.get_daily_data_many(selected_codes[lo:lo + chunk], start_date, end_date))
+                progress_bar.progress(min(lo + chunk, len(selected_codes)) / len(selected_codes) / 2)
+
             for i, code in enumerate(selected_codes, 1):
                 try:
                     status_text.text(f"正在分析: {code} ({i}/{len(selected_codes)})")
 
                     # 获取数据
-                    df = data_source.get_daily_data(code, start_date, end_date)
+                    df = frames.get(code, pd.DataFrame())
 
                     if df.empty:
                         failed_stocks.append(code)
@@ -1180,8 +1240,7 @@ with col1:
                     price = latest['close']
 
                     # 查找股票名称
-                    stock_info_data = STOCK_POOL.get(code)
-                    stock_name = stock_info_data[0] if stock_info_data else code
+                    stock_name = SYMBOL_METADATA.get_name(code)
 
                     stock_info = {
                         'code': code,
@@ -1205,7 +1264,7 @@ with col1:
                 except Exception as e:
                     failed_stocks.append(code)
 
-                progress_bar.progress(i / len(selected_codes))
+                progress_bar.progress(0.5 + i / len(selected_codes) / 2)
 
             progress_bar.empty()
             status_text.empty()
@@ -1234,7 +1293,7 @@ with col2:
     1. 点击"分析参数设置"展开参数面板
     2. 根据需要调整各项技术指标参数
     3. 展开交易所、板块和行业选择股票
-    4. 点击"全选所有股票"或手动勾选
+    4. 选择板块后点击"全选本板块"，或手动勾选（一次分析的股票数有上限）
     5. 点击"开始批量分析"按钮
 
     **参数说明:**
@@ -27,9 +27,8 @@ def plot_stock_analysis(df: pd.DataFrame, stock_name: str = "", save: bool = Tru
     fig = plt.figure(figsize=CHART_CONFIG['figsize'], dpi=CHART_CONFIG['dpi'])
     gs = GridSpec(4, 2, figure=fig, hspace=0.3, wspace=0.2)
 
-    # 日期转换
-    df['trade_date_dt'] = pd.to_datetime(df['trade_date'], format='%Y%m%d')
-    dates = mdates.date2num(df['trade_date_dt'])
+    # 日期索引直接转换为 matplotlib 日期
+    dates = mdates.date2num(df.index)
 
     # ==================== 主图：价格和均线 ====================
     ax1 = fig.add_subplot(gs[0:2, :])
@@ -53,12 +52,12 @@ def plot_stock_analysis(df: pd.DataFrame, stock_name: str = "", save: bool = Tru
     sell_points = df[df['SIGNAL'] == 'SELL']
 
     if not buy_points.empty:
-        buy_dates = mdates.date2num(pd.to_datetime(buy_points['trade_date'], format='%Y%m%d'))
+        buy_dates = mdates.date2num(buy_points.index)
         ax1.scatter(buy_dates, buy_points['close'], marker='^', color='green',
                    s=100, label='买入', zorder=5)
 
     if not sell_points.empty:
-        sell_dates = mdates.date2num(pd.to_datetime(sell_points['trade_date'], format='%Y%m%d'))
+        sell_dates = mdates.date2num(sell_points.index)
         ax1.scatter(sell_dates, sell_points['close'], marker='v', color='red',
                    s=100, label='卖出', zorder=5)
 
@@ -137,9 +136,8 @@ def plot_signal_summary(df: pd.DataFrame, stock_name: str = "", save: bool = Tru
     plt.style.use(CHART_CONFIG['style'])
     fig, axes = plt.subplots(2, 1, figsize=(CHART_CONFIG['figsize'][0], 8))
 
-    # 日期转换
-    df['trade_date_dt'] = pd.to_datetime(df['trade_date'], format='%Y%m%d')
-    dates = mdates.date2num(df['trade_date_dt'])
+    # 日期索引直接转换为 matplotlib 日期
+    dates = mdates.date2num(df.index)
 
     # ==================== 买入评分 ====================
     axes[0].plot(dates, df['BUY_SCORE'], label='买入评分', color='green', linewidth=1.5)
@@ -188,13 +186,8 @@ def plot_candlestick(df: pd.DataFrame, stock_name: str = ""):
         from plotly.subplots import make_subplots
         
         # 准备数据
-        df = df.copy()
-        if 'trade_date' in df.columns:
-            df['date'] = pd.to_datetime(df['trade_date'], format='%Y%m%d')
-        else:
-            df['date'] = pd.to_datetime(df.index)
-        
-        df = df.tail(60)  # 只显示最近60天
+        df = df.tail(60).copy()  # 只显示最近60天
+        df['date'] = df.index
         
         # 创建图表
         fig = make_subplots(rows=2, cols=1, 
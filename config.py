@@ -11,6 +11,25 @@ BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data"
 LOG_DIR = BASE_DIR / "logs"
 
+# 本地行情存储配置（按股票分文件，增量更新）
+BAR_STORE_CONFIG = {
+    "enabled": True,
+    "path": DATA_DIR / "bars",
+    "format": "parquet",       # parquet 或 feather
+    "market_close": "15:00",   # 收盘时间，之后获取的当日K线视为最终数据
+    "minute_path": DATA_DIR / "minute",
+    "minute_compression": "zstd",  # 分钟线分区文件压缩算法
+    "minute_sessions": 5,      # get_intraday_data 默认返回的最近交易日数
+}
+
+# 数据文件读写配置（save_to_csv / load_from_csv 按扩展名选择格式，CSV 仅用于导出）
+FILE_CONFIG = {
+    "format": "feather",       # 文件名不带扩展名时使用的格式: feather / parquet / csv
+    "feather_compression": "uncompressed",  # 不压缩时读取可直接内存映射
+    "parquet_compression": "zstd",
+    "memory_map": True,        # 读取 feather 时使用内存映射
+}
+
 # Tushare API 配置（需要注册获取 token）
 TUSHARE_TOKEN = os.getenv("TUSHARE_TOKEN", "")
 
@@ -36,6 +55,109 @@ WATCHLIST = [
     "002185.SZ",  # 华天科技
 ]
 
+# 交易日历配置（内置节假日表，可用 TradingCalendar.refresh() 从交易所日历更新）
+CALENDAR_CONFIG = {
+    "path": DATA_DIR / "calendar" / "trade_days.parquet",
+}
+
+# 下载数据质量检查配置（按交易日历检查缺失日、重复日期、价格异常、停牌）
+QUALITY_CONFIG = {
+    "enabled": True,
+    "invalid": "drop",         # 价格异常行: drop 删除 / keep 保留 / raise 抛出异常
+    "suspended": "keep",       # 零成交量停牌行: drop 删除 / keep 保留
+    "missing": "keep",         # 缺失交易日: fill 用前收盘价补齐 / keep 不处理
+}
+
+# 实时行情配置
+REALTIME_CONFIG = {
+    "spot_ttl": 5,             # 交易时段全市场快照缓存秒数
+    "spot_ttl_closed": 300,    # 非交易时段全市场快照缓存秒数
+}
+
+# Yahoo Finance 配置
+YFINANCE_CONFIG = {
+    "threads": True,           # 批量下载时是否多线程
+    "pool_size": 16,           # HTTP 连接池大小
+}
+
+# 批量分析网页配置（batch_web_enhanced.py）
+BATCH_WEB_CONFIG = {
+    "max_selection": 300,      # 一次最多分析的股票数（全选只作用于单个板块）
+    "download_chunk": 50,      # 每批下载的股票数
+}
+
+# 股票基础信息表配置（每日批量构建一次）
+METADATA_CONFIG = {
+    "path": DATA_DIR / "metadata",
+    "fetch_industry": True,    # 按行业板块批量获取行业
+    "fetch_list_date": True,   # 从交易所列表批量获取上市日期
+    "retry_interval": 600,     # 构建失败后的重试间隔（秒）
+}
+
+# 异步数据源配置
+ASYNC_CONFIG = {
+    "concurrency": 16,         # 同时进行的数据源调用数
+    "timeout": 60,             # 单次调用超时秒数
+}
+
+# 离线回放数据源配置（用于压测和离线测试）
+REPLAY_CONFIG = {
+    "path": DATA_DIR / "replay",
+    "latency": 0.0,            # 模拟延迟中位数（秒）
+    "latency_sigma": 0.0,      # 延迟对数正态分布的 sigma，0 为固定延迟
+    "error_rate": 0.0,         # 模拟请求失败概率
+    "seed": None,              # 随机种子
+}
+
+# AKShare 接口限流配置（令牌桶 + AIMD 自适应并发）
+RATE_LIMIT_CONFIG = {
+    "rate": 5.0,               # 初始每秒请求数
+    "min_rate": 0.5,           # 最低每秒请求数
+    "max_rate": 50.0,          # 最高每秒请求数
+    "rate_step": 1.0,          # 每轮健康请求后速率增加量
+    "burst": 10,               # 令牌桶容量（允许的突发请求数）
+    "concurrency": 4,          # 初始并发上限
+    "min_concurrency": 1,      # 最低并发上限
+    "max_concurrency": 32,     # 最高并发上限
+    "latency_target": 5.0,     # 延迟超过该秒数视为拥塞
+    "decrease_cooldown": 1.0,  # 两次减半之间的最短间隔（秒）
+    "retries": 2,              # 失败重试次数
+    "backoff": 0.5,            # 重试退避基数（秒）
+    "acquire_timeout": 120,    # 等待令牌的最长秒数
+}
+
+# 全市场日线面板配置（日期 × 股票 的内存映射数组）
+PANEL_CONFIG = {
+    "path": DATA_DIR / "panel",
+    "keep_versions": 2,        # 保留的面板版本数（含当前版本）
+    "analysis_chunk": 500,     # 面板分析时每批计算的股票数（限制中间数组的内存）
+}
+
+# 收盘后预热任务配置（warmup.py）
+WARMUP_CONFIG = {
+    "symbols": None,           # 预热的股票代码列表，None 为全市场
+    "lookback_days": 400,      # 下载的日线天数（覆盖最长指标周期）
+    "workers": 32,             # 下载线程数（实际并发由限流器控制）
+    "signal_path": DATA_DIR / "signals",  # 预计算分析结果目录
+    "history": 120,            # 每只股票保存的最近分析结果行数
+    "build_panel": True,       # 是否同时构建全市场日线面板
+}
+
+# 日线多接口请求配置（对冲请求 + 熔断）
+HEDGE_CONFIG = {
+    "enabled": False,          # 是否对冲：主接口超过延迟分位数未返回时同时请求备用接口
+    "yahoo_fallback": False,   # 是否以 Yahoo Finance 作为日线最后的备用接口（其价格已按拆股、送转调整，与不复权数据不一致）
+    "percentile": 95,          # 对冲等待时间取该接口延迟的分位数
+    "min_samples": 20,         # 样本数不足时使用 default_delay
+    "default_delay": 3.0,      # 默认对冲等待秒数
+    "min_delay": 0.5,          # 对冲等待秒数下限
+    "max_delay": 15.0,         # 对冲等待秒数上限
+    "window": 200,             # 每个接口保留的最近延迟样本数
+    "failure_threshold": 5,    # 连续失败该次数后熔断
+    "reset_timeout": 60.0,     # 熔断后放行试探请求前的冷却秒数
+    "workers": 16,             # 对冲请求线程数
+}
+
 # 技术分析参数配置
 INDICATORS = {
     "MA": {
@@ -9,16 +9,11 @@ from datetime import datetime, timedelta
 # 添加项目路径
 sys.path.insert(0, '/root/.openclaw/workspace-finance/stock-analyzer')
 
-# 判断今天是否是交易日（排除周末）
+from utils.trading_calendar import get_trading_calendar
+
+# 判断今天是否是交易日（按交易所日历，排除周末和节假日）
 def is_trading_day():
-    today = datetime.now()
-    weekday = today.weekday()
-    
-    # 周六(5)或周日(6)不交易
-    if weekday >= 5:
-        return False
-    
-    return True
+    return get_trading_calendar().is_trading_day(datetime.now())
 
 if __name__ == '__main__':
     task = sys.argv[1] if len(sys.argv) > 1 else ''
@@ -5,8 +5,10 @@
 import sys
 sys.path.insert(0, '/root/.openclaw/workspace-finance/stock-analyzer')
 
-from data_source import AKShareDataSource
-from analysis import SignalAnalyzer
+from data_source import AKShareDataSource, AsyncDataSource
+from analysis import SignalAnalyzer, SignalCache
+from utils.trading_calendar import get_trading_calendar
+import asyncio
 import pandas as pd
 
 # A股热门股票池
@@ -28,20 +30,20 @@ STOCK_POOL = [
     '000858.SZ',  # 五粮液
 ]
 
-def analyze():
-    print("=" * 50)
-    print("开盘后股票分析")
-    print("=" * 50)
-    
-    data_source = AKShareDataSource()
+async def analyze_pool():
+    data_source = AsyncDataSource(AKShareDataSource())
     analyzer = SignalAnalyzer()
     
     results = []
     
-    for code in STOCK_POOL:
+    # 一次请求获取全部股票的实时行情（含股票名称）
+    quotes = await data_source.get_realtime_batch(STOCK_POOL)
+    
+    # 并发下载，哪只股票先下载完就先分析哪只
+    async for code, df in data_source.iter_daily_data(STOCK_POOL, start_date='20250101'):
         try:
-            # 获取最近60天数据
-            df = data_source.get_daily_data(code, start_date='20250101')
+            if isinstance(df, Exception):
+                raise df
             if df is None or len(df) < 20:
                 continue
             
@@ -53,7 +55,7 @@ def analyze():
             
             results.append({
                 'code': code,
-                'name': data_source.get_stock_info(code).get('name', code),
+                'name': quotes.at[code, 'name'] if code in quotes.index else code,
                 'close': latest['close'],
                 'buy_score': int(latest.get('BUY_SCORE', 0)),
                 'sell_score': int(latest.get('SELL_SCORE', 0)),
@@ -64,6 +66,47 @@ def analyze():
         except Exception as e:
             print(f"分析 {code} 失败: {e}")
     
+    data_source.close()
+    return results
+
+
+def load_cached_results():
+    """
+    读取收盘后预热任务（warmup.py）预计算的分析结果
+
+    Returns:
+        结果列表；缓存不是上一个交易日之后的或缺少股票池中的股票时返回 None
+    """
+    cache = SignalCache()
+    if not cache.is_fresh(get_trading_calendar().previous_trading_day()):
+        return None
+    summary = cache.load_summary(STOCK_POOL)
+    if len(summary) < len(STOCK_POOL):
+        return None
+    
+    print(f"使用预计算的分析结果（{cache.as_of:%Y-%m-%d} 收盘）")
+    return [{
+        'code': code,
+        'name': row.get('name', code),
+        'close': row['close'],
+        'buy_score': int(row.get('BUY_SCORE', 0)),
+        'sell_score': int(row.get('SELL_SCORE', 0)),
+        'signal': row.get('SIGNAL', 'HOLD'),
+        'rsi': row.get('RSI', 'N/A'),
+        'macd_hist': row.get('MACD_HIST', 0),
+    } for code, row in summary.iterrows()]
+
+
+def analyze():
+    print("=" * 50)
+    print("开盘后股票分析")
+    print("=" * 50)
+    
+    # 优先使用预计算结果，--live 强制在线下载分析
+    results = None if '--live' in sys.argv else load_cached_results()
+    if results is None:
+        results = asyncio.run(analyze_pool())
+    
     # 按买入评分排序
     results.sort(key=lambda x: (x['buy_score'], x['close']), reverse=True)
     
@@ -2,6 +2,27 @@
 数据源模块
 """
 from .yfinance_source import YFinanceDataSource
-from .akshare_source import AKShareDataSource
+from .akshare_source import AKShareDataSource, SYMBOL_METADATA, DAILY_ENDPOINTS
+from .metadata import SymbolMetadata
+from .universe import UniverseIndex
+from .resample import BarResampler
+from .panel import UniversePanel, get_universe_panel
+from .schema import normalize_bars, add_trade_date
+from .persistence import save_frame, load_frame
+from .quality import QualityReport, DataQualityError, validate_bars, repair_bars, validate_batch
+from .async_source import AsyncDataSource
+from .replay_source import ReplayDataSource, ReplayError
+from .singleflight import SingleFlight, SINGLE_FLIGHT
+from .rate_limiter import AdaptiveRateLimiter, RateLimitTimeout, AKSHARE_LIMITER
+from .hedge import HedgedCaller, CircuitBreaker, CircuitOpenError
 
-__all__ = ['YFinanceDataSource', 'AKShareDataSource']
+__all__ = [
+    'YFinanceDataSource', 'AKShareDataSource', 'AsyncDataSource', 'ReplayDataSource', 'ReplayError',
+    'SymbolMetadata', 'SYMBOL_METADATA', 'DAILY_ENDPOINTS',
+    'UniverseIndex', 'UniversePanel', 'get_universe_panel', 'BarResampler',
+    'normalize_bars', 'add_trade_date', 'save_frame', 'load_frame',
+    'QualityReport', 'DataQualityError', 'validate_bars', 'repair_bars', 'validate_batch',
+    'SingleFlight', 'SINGLE_FLIGHT',
+    'AdaptiveRateLimiter', 'RateLimitTimeout', 'AKSHARE_LIMITER',
+    'HedgedCaller', 'CircuitBreaker', 'CircuitOpenError',
+]
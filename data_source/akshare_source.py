@@ -1,23 +1,62 @@
 """
 AKShare 数据源（免费，实时 A 股数据）
 """
+import numpy as np
 import pandas as pd
 import akshare as ak
 from datetime import datetime, timedelta
-from typing import Optional
-from config import DATA_DIR
+from typing import List, Optional
+from config import DATA_DIR, BAR_STORE_CONFIG, HEDGE_CONFIG
+from .bar_store import BarStore, MinuteBarStore
+from .spot_cache import SpotSnapshotCache
+from .metadata import SymbolMetadata
+from .universe import UniverseIndex
+from .singleflight import SINGLE_FLIGHT
+from .rate_limiter import AKSHARE_LIMITER
+from .hedge import HedgedCaller
+from .schema import PRICE_COLUMNS, PRICE_DTYPE, empty_bars, normalize_bars
+from .quality import check_bars
+from .persistence import load_frame, resolve_path, save_frame
+from utils.trading_calendar import get_trading_calendar
 import logging
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 支持的复权类型
+ADJUST_TYPES = ('qfq', 'hfq', '')
+
+# 全市场行情快照缓存，进程内所有实例共享
+SPOT_CACHE = SpotSnapshotCache(lambda: AKSHARE_LIMITER.call(ak.stock_zh_a_spot_em))
+
+# 股票基础信息表，进程内所有实例共享
+SYMBOL_METADATA = SymbolMetadata(lambda: SPOT_CACHE.get().df)
+
+# 日线接口（按优先级排列），延迟统计和熔断状态进程内共享
+DAILY_ENDPOINTS = HedgedCaller('akshare_daily', ['stock_zh_a_hist', 'stock_zh_a_daily', 'yahoo'])
+
 
 class AKShareDataSource:
     """AKShare 数据源 - 专门针对 A 股的实时数据"""
 
-    def __init__(self):
-        """初始化 AKShare 数据源"""
+    # 全市场股票池索引，随基础信息表每日重建，所有实例共享
+    _universe: Optional[UniverseIndex] = None
+
+    def __init__(self, use_store: bool = None):
+        """
+        初始化 AKShare 数据源
+
+        Args:
+            use_store: 是否启用本地日线和分钟线存储，默认取 BAR_STORE_CONFIG['enabled']
+        """
+        if use_store is None:
+            use_store = BAR_STORE_CONFIG['enabled']
+        self.bar_store = BarStore() if use_store else None
+        self.minute_store = MinuteBarStore() if use_store else None
+        self._yahoo = None
+        self.spot_cache = SPOT_CACHE
+        self.metadata = SYMBOL_METADATA
         logger.info("AKShare 数据源初始化成功（免费，A 股实时数据）")
 
     def _convert_symbol(self, symbol: str) -> str:
@@ -33,6 +72,7 @@ class AKShareDataSource:
         # AKShare 格式：
         # - 深交所：sz + 6位代码 (如 sz000001)
         # - 上交所：sh + 6位代码 (如 sh600519)
+        # - 北交所：bj + 6位代码 (如 bj830799)
 
         if '.SZ' in symbol:
             code = symbol.replace('.SZ', '').replace('.', '')
@@ -40,6 +80,9 @@ class AKShareDataSource:
         elif '.SH' in symbol:
             code = symbol.replace('.SH', '').replace('.', '')
             return f"sh{code}"
+        elif '.BJ' in symbol:
+            code = symbol.replace('.BJ', '').replace('.', '')
+            return f"bj{code}"
         else:
             # 如果没有后缀，尝试自动判断
             code = symbol.replace('.', '')
@@ -64,176 +107,494 @@ class AKShareDataSource:
         elif ak_symbol.startswith('sh'):
             code = ak_symbol[2:]
             return f"{code}.SH"
+        elif ak_symbol.startswith('bj'):
+            code = ak_symbol[2:]
+            return f"{code}.BJ"
         return ak_symbol
 
+    def _store_key(self, symbol: str, adjust: str) -> str:
+        """
+        生成本地存储键
+
+        Args:
+            symbol: 股票代码
+            adjust: 复权类型，或 'factor' 表示复权因子表
+
+        Returns:
+            存储键，如 '000001.SZ_none'、'000001.SZ_factor'
+        """
+        return f"{self._convert_symbol_back(self._convert_symbol(symbol))}_{adjust or 'none'}"
+
+    def _is_final(self, bar_date: pd.Timestamp, updated_at: str) -> bool:
+        """
+        判断某日 K 线在 updated_at 时刻获取时是否已收盘定型
+
+        Args:
+            bar_date: K 线日期
+            updated_at: 获取时间（ISO 格式）
+
+        Returns:
+            是否为收盘后的最终数据
+        """
+        close_time = pd.Timestamp(f"{bar_date.strftime('%Y-%m-%d')} {BAR_STORE_CONFIG['market_close']}")
+        return pd.Timestamp(updated_at) >= close_time
+
+    def _missing_ranges(self, stored: pd.DataFrame, meta: Optional[dict],
+                        start: pd.Timestamp, end: pd.Timestamp) -> list:
+        """
+        计算本地存储相对请求区间缺失的日期段
+
+        Args:
+            stored: 本地已有数据
+            meta: 本地元数据（已覆盖区间和更新时间）
+            start: 请求开始日期
+            end: 请求结束日期
+
+        Returns:
+            需要下载的 (开始, 结束) 日期段列表
+        """
+        if meta is None or stored.empty:
+            return self._trim_to_trading_days([(start, end)])
+
+        covered_start = pd.Timestamp(meta['start'])
+        covered_end = pd.Timestamp(meta['end'])
+        last_bar = stored.index[-1]
+        ranges = []
+
+        if start < covered_start:
+            ranges.append((start, covered_start - timedelta(days=1)))
+
+        # 尾部从最后一根已存 K 线开始重新获取，补全未收盘时保存的当日数据；
+        # 已覆盖区间之后没有交易日（周末、节假日）时无需请求
+        calendar = get_trading_calendar()
+        partial = not self._is_final(covered_end, meta['updated_at'])
+        if (end > covered_end and calendar.count_trading_days(covered_end + timedelta(days=1), end)) \
+                or (partial and end >= last_bar):
+            ranges.append((last_bar, max(end, covered_end)))
+
+        return self._trim_to_trading_days(ranges)
+
+    @staticmethod
+    def _trim_to_trading_days(ranges: list) -> list:
+        """
+        将日期段收缩到首尾交易日，去掉不含交易日的日期段
+
+        Args:
+            ranges: (开始, 结束) 日期段列表
+
+        Returns:
+            收缩后的日期段列表
+        """
+        calendar = get_trading_calendar()
+        trimmed = []
+        for s, e in ranges:
+            days = calendar.trading_days_between(s, e)
+            if len(days):
+                trimmed.append((days[0], days[-1]))
+        return trimmed
+
     def get_daily_data(self, symbol: str, start_date: str = None,
                       end_date: str = None, adjust: str = 'qfq') -> pd.DataFrame:
         """
         获取日线数据（支持前后复权）
 
+        启用本地存储时本地只保存不复权 K 线和后复权因子表：K 线只下载最后
+        一根已存 K 线之后（以及请求开始日期之前）缺失的部分并追加保存，
+        复权价格在读取时用因子表计算。除权除息只需刷新因子表。
+
         Args:
             symbol: 股票代码，如 '000001.SZ' (A股)
-            start_date: 开始日期，格式 'YYYY-MM-DD'
-            end_date: 结束日期，格式 'YYYY-MM-DD'
+            start_date: 开始日期，格式 'YYYY-MM-DD' 或 'YYYYMMDD'
+            end_date: 结束日期，格式 'YYYY-MM-DD' 或 'YYYYMMDD'
             adjust: 复权类型 'qfq'-前复权, 'hfq'-后复权, ''-不复权
 
         Returns:
             日线数据 DataFrame
         """
         try:
-            # 转换股票代码格式
-            ak_symbol = self._convert_symbol(symbol)
-
             # 默认获取最近一年的数据
-            if not end_date:
-                end_date = datetime.now().strftime('%Y%m%d')
-            else:
-                end_date = end_date.replace('-', '')
-            if not start_date:
-                start_date = (datetime.now() - timedelta(days=365)).strftime('%Y%m%d')
+            if adjust not in ADJUST_TYPES:
+                raise ValueError(f"不支持的复权类型: {adjust}")
+            today = pd.Timestamp(datetime.now().date())
+            # 最近一个已开盘的交易日之后不可能有数据
+            last_session = get_trading_calendar().last_session_day()
+            end = min(pd.Timestamp(end_date), last_session) if end_date else last_session
+            start = pd.Timestamp(start_date) if start_date else today - timedelta(days=365)
+
+            # 相同参数的并发请求合并为一次
+            flight_key = ('akshare_daily', self._store_key(symbol, adjust), start, end)
+            return SINGLE_FLIGHT.do(flight_key, self._get_daily_data, symbol, start, end, adjust)
+
+        except Exception as e:
+            logger.error(f"获取 {symbol} 日线数据失败: {e}")
+            raise
+
+    def _get_daily_data(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp,
+                        adjust: str) -> pd.DataFrame:
+        """
+        获取日线数据：读取本地不复权数据并下载缺失的区间，再按需计算复权价格
+
+        Args:
+            symbol: 股票代码
+            start: 开始日期
+            end: 结束日期
+            adjust: 复权类型
+
+        Returns:
+            日线数据 DataFrame
+        """
+        if self.bar_store is None:
+            return self._download_daily_data(symbol, start, end, adjust)
+
+        key = self._store_key(symbol, '')
+        with self.bar_store.lock(key):
+            meta = self.bar_store.read_meta(key)
+            stored = normalize_bars(self.bar_store.read(key)) if meta else empty_bars()
+            ranges = self._missing_ranges(stored, meta, start, end)
+
+            if ranges:
+                now = datetime.now().isoformat(timespec='seconds')
+                frames = [self._download_daily_data(symbol, s, e, '') for s, e in ranges]
+                frames = [f for f in frames if not f.empty]
+                new = pd.concat(frames) if frames else empty_bars()
+
+                covered_start = start
+                covered_end = end
+                if meta is not None and not stored.empty:
+                    covered_start = min(start, pd.Timestamp(meta['start']))
+                    covered_end = max(end, pd.Timestamp(meta['end']))
+
+                meta = {
+                    'start': covered_start.strftime('%Y%m%d'),
+                    'end': covered_end.strftime('%Y%m%d'),
+                    'updated_at': now,
+                }
+                stored = self.bar_store.merge(key, stored, new, meta)
             else:
-                start_date = start_date.replace('-', '')
+                logger.info(f"{symbol} 日线数据命中本地存储")
 
-            logger.info(f"正在获取 {symbol} 的数据 ({start_date} ~ {end_date})...")
+        if stored.empty:
+            logger.warning(f"未获取到股票 {symbol} 的数据")
+            return stored
+
+        df = stored[(stored.index >= start) & (stored.index <= end)]
+        if not adjust:
+            return df
+
+        factors = self._get_adjust_factors(symbol)
+        if factors.empty:
+            # 没有可用的复权因子时直接下载复权数据（不写入本地存储）
+            logger.warning(f"{symbol} 复权因子不可用，直接下载{adjust}数据")
+            return self._download_daily_data(symbol, start, end, adjust)
+        return self._apply_adjust(df, factors, adjust)
+
+    def _get_adjust_factors(self, symbol: str) -> pd.DataFrame:
+        """
+        获取后复权因子表（本地保存，每天最多刷新一次）
+
+        Args:
+            symbol: 股票代码
+
+        Returns:
+            以日期为索引、按日期升序的因子表（hfq_factor 列），获取失败且本地没有时为空
+        """
+        key = self._store_key(symbol, 'factor')
+        today = datetime.now().strftime('%Y%m%d')
+        with self.bar_store.lock(key):
+            meta = self.bar_store.read_meta(key)
+            if meta and meta.get('updated_on') == today:
+                return self.bar_store.read(key)
 
-            # 使用 AKShare 获取股票数据
             try:
-                # 尝试使用 stock_zh_a_hist 方法（推荐）
-                df = ak.stock_zh_a_hist(
-                    symbol=ak_symbol[2:],  # 去掉 sh/sz 前缀
-                    period="daily",
-                    start_date=start_date,
-                    end_date=end_date,
-                    adjust=adjust
-                )
+                factors = self._download_adjust_factors(symbol)
+                self.bar_store.write(key, factors, {'updated_on': today, 'count': len(factors)})
+                return factors
             except Exception as e:
-                # 如果失败，尝试旧版接口
-                logger.warning(f"新接口失败，尝试旧接口: {e}")
-                df = ak.stock_zh_a_daily(
-                    symbol=ak_symbol,
-                    start_date=start_date,
-                    end_date=end_date,
-                    adjust=adjust
-                )
+                logger.warning(f"获取 {symbol} 复权因子失败: {e}")
+                return self.bar_store.read(key) if meta else pd.DataFrame()
 
-            if df.empty:
-                logger.warning(f"未获取到股票 {symbol} 的数据")
-                return df
+    def _download_adjust_factors(self, symbol: str) -> pd.DataFrame:
+        """
+        从 AKShare 下载后复权因子
 
-            # 转换为标准格式
-            # AKShare 返回的列名可能是中文，需要转换
-            column_map = {
-                '日期': 'date',
-                '开盘': 'open',
-                '最高': 'high',
-                '最低': 'low',
-                '收盘': 'close',
-                '成交量': 'volume',
-                '成交额': 'amount',
-                '振幅': 'amplitude',
-                '涨跌幅': 'change_pct',
-                '涨跌额': 'change_amount',
-                '换手率': 'turnover',
-            }
+        Args:
+            symbol: 股票代码
 
-            # 检查是否有英文列名（新版接口）
-            if 'date' in df.columns or 'Date' in df.columns:
-                df.columns = df.columns.str.lower()
-                column_map = {
-                    'date': 'date',
-                    'open': 'open',
-                    'high': 'high',
-                    'low': 'low',
-                    'close': 'close',
-                    'volume': 'volume',
-                }
+        Returns:
+            以日期为索引、按日期升序的因子表（hfq_factor 列）
+        """
+        logger.info(f"正在获取 {symbol} 的复权因子...")
+        df = AKSHARE_LIMITER.call(ak.stock_zh_a_daily, symbol=self._convert_symbol(symbol),
+                                  adjust='hfq-factor')
+        if df.empty:
+            raise ValueError("复权因子为空")
+        factors = pd.DataFrame(
+            {'hfq_factor': pd.to_numeric(df['hfq_factor'], errors='coerce').to_numpy()},
+            index=pd.DatetimeIndex(pd.to_datetime(df['date']), name='date'),
+        )
+        return factors.dropna().sort_index()
+
+    def _apply_adjust(self, df: pd.DataFrame, factors: pd.DataFrame, adjust: str) -> pd.DataFrame:
+        """
+        用后复权因子计算复权价格（向量化）
 
-            df = df.rename(columns=column_map)
+        后复权价 = 不复权价 × 当日因子；前复权价 = 后复权价 / 最新因子。
 
-            # 确保日期是 datetime 格式
-            if 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'])
+        Args:
+            df: 不复权日线数据
+            factors: 后复权因子表
+            adjust: 复权类型 'qfq' 或 'hfq'
 
-            # 保留必要的列
-            required_cols = ['date', 'open', 'high', 'low', 'close', 'volume']
-            existing_cols = [col for col in required_cols if col in df.columns]
-            df = df[existing_cols]
+        Returns:
+            复权后的日线数据（成交量不变）
+        """
+        # 每根 K 线取不晚于当日的最近一个因子，早于第一个因子的 K 线取第一个因子
+        pos = factors.index.searchsorted(df.index, side='right') - 1
+        values = factors['hfq_factor'].to_numpy()
+        factor = values[pos.clip(min=0)]
+        if adjust == 'qfq':
+            factor = factor / values[-1]
+
+        df = df.copy()
+        cols = [col for col in PRICE_COLUMNS if col in df.columns]
+        df[cols] = (df[cols].to_numpy(dtype=np.float64) * factor[:, None]).astype(PRICE_DTYPE)
+        return df
+
+    def _download_daily_data(self, symbol: str, start: pd.Timestamp,
+                             end: pd.Timestamp, adjust: str) -> pd.DataFrame:
+        """
+        从 AKShare 下载日线数据并转换为标准格式
 
-            # 转换日期格式
-            df['trade_date'] = df['date'].dt.strftime('%Y%m%d')
+        Args:
+            symbol: 股票代码
+            start: 开始日期
+            end: 结束日期
+            adjust: 复权类型
 
-            # 按日期排序
-            df = df.sort_values('date').reset_index(drop=True)
+        Returns:
+            日线数据 DataFrame
+        """
+        # 转换股票代码格式
+        ak_symbol = self._convert_symbol(symbol)
+        start_date = start.strftime('%Y%m%d')
+        end_date = end.strftime('%Y%m%d')
+
+        logger.info(f"正在获取 {symbol} 的数据 ({start_date} ~ {end_date})...")
+
+        # 按优先级请求各接口（新接口、旧接口、Yahoo），失败或无数据时换下一个；
+        # 对冲模式下主接口超过延迟分位数仍未返回就同时请求下一个；熔断的接口跳过。
+        # 各接口只请求一次（不在限流器内退避重试），失败后立即切换
+        calls = [
+            ('stock_zh_a_hist', lambda: self._fetch_hist(ak_symbol, start_date, end_date, adjust)),
+            ('stock_zh_a_daily', lambda: self._fetch_legacy_daily(ak_symbol, start_date, end_date, adjust)),
+        ]
+        # Yahoo 的价格和成交量已按拆股、送转调整（auto_adjust=False 只是不按分红调整），
+        # 与不复权数据不一致：备用区间内有除权事件时，写入本地存储的价格会出错，
+        # 读取时还会再乘一次复权因子。因此默认关闭，只在能接受这一误差时开启
+        if not adjust and HEDGE_CONFIG['yahoo_fallback'] and ak_symbol[:2] in ('sh', 'sz'):
+            calls.append(('yahoo', lambda: self._fetch_yahoo(symbol, start, end)))
+        df = DAILY_ENDPOINTS.call(calls, is_valid=lambda result: not result.empty)
+
+        if df.empty:
+            logger.warning(f"未获取到股票 {symbol} 的数据")
+            return empty_bars()
+
+        # 转换为以日期为索引的标准 K 线格式，按交易日历检查并修复数据质量问题
+        rows = len(df)
+        df = normalize_bars(df)
+        df = check_bars(df, start, end, symbol, duplicates=rows - len(df))
+
+        logger.info(f"获取 {symbol} 日线数据成功，共 {len(df)} 条记录")
+        return df
+
+    def _fetch_hist(self, ak_symbol: str, start_date: str, end_date: str, adjust: str) -> pd.DataFrame:
+        """
+        新接口 stock_zh_a_hist（东方财富），成交量单位为手
 
-            logger.info(f"获取 {symbol} 日线数据成功，共 {len(df)} 条记录")
-            return df
+        Returns:
+            英文列名的日线数据
+        """
+        df = AKSHARE_LIMITER.call_once(
+            ak.stock_zh_a_hist,
+            symbol=ak_symbol[2:],  # 去掉 sh/sz 前缀
+            period="daily",
+            start_date=start_date,
+            end_date=end_date,
+            adjust=adjust
+        )
+        # AKShare 返回的列名是中文，需要转换
+        column_map = {
+            '日期': 'date',
+            '开盘': 'open',
+            '最高': 'high',
+            '最低': 'low',
+            '收盘': 'close',
+            '成交量': 'volume',
+            '成交额': 'amount',
+            '振幅': 'amplitude',
+            '涨跌幅': 'change_pct',
+            '涨跌额': 'change_amount',
+            '换手率': 'turnover',
+        }
+        return df.rename(columns=column_map)
+
+    def _fetch_legacy_daily(self, ak_symbol: str, start_date: str, end_date: str,
+                            adjust: str) -> pd.DataFrame:
+        """
+        旧接口 stock_zh_a_daily（新浪），成交量单位为股，换算为手与新接口一致
 
-        except Exception as e:
-            logger.error(f"获取 {symbol} 日线数据失败: {e}")
-            raise
+        Returns:
+            英文列名的日线数据
+        """
+        df = AKSHARE_LIMITER.call_once(
+            ak.stock_zh_a_daily,
+            symbol=ak_symbol,
+            start_date=start_date,
+            end_date=end_date,
+            adjust=adjust
+        )
+        df.columns = df.columns.str.lower()
+        if 'volume' in df.columns:
+            df['volume'] = df['volume'] / 100
+        return df
+
+    def _fetch_yahoo(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """
+        Yahoo Finance 日线（已按拆股、送转调整，未按分红调整），成交量单位为股，
+        换算为手与新接口一致
 
-    def get_intraday_data(self, symbol: str) -> pd.DataFrame:
+        Returns:
+            标准 K 线
+        """
+        if self._yahoo is None:
+            from .yfinance_source import YFinanceDataSource
+            self._yahoo = YFinanceDataSource()
+        # Yahoo 的结束日期不含当天
+        df = self._yahoo.get_daily_data(symbol, start.strftime('%Y-%m-%d'),
+                                        (end + timedelta(days=1)).strftime('%Y-%m-%d'),
+                                        auto_adjust=False)
+        if not df.empty:
+            df = df.assign(volume=df['volume'] // 100)
+        return df
+
+    def get_intraday_data(self, symbol: str, date: str = None) -> pd.DataFrame:
         """
-        获取分时数据（当天实时）
+        获取分时数据（1 分钟线）
+
+        启用本地存储时分钟线按交易日分区保存，每次只下载最后一根已存分钟线
+        之后的数据；已保存的历史交易日可以离线读取。
 
         Args:
             symbol: 股票代码，如 '000001.SZ'
+            date: 交易日，格式 'YYYY-MM-DD' 或 'YYYYMMDD'；默认返回最近
+                BAR_STORE_CONFIG['minute_sessions'] 个交易日
 
         Returns:
             分时数据 DataFrame
         """
         try:
-            ak_symbol = self._convert_symbol(symbol)
-            code = ak_symbol[2:]  # 去掉 sh/sz 前缀
-            logger.info(f"正在获取 {symbol} 的分时数据...")
+            if self.minute_store is None:
+                df = self._download_intraday_data(symbol)
+                if date and not df.empty:
+                    df = df[df.index.normalize() == pd.Timestamp(date)]
+                return df
 
-            # 获取分时数据
-            df = ak.stock_zh_a_hist_min_em(symbol=code, period='1', adjust='')
+            key = self._convert_symbol_back(self._convert_symbol(symbol))
+            day = pd.Timestamp(date).strftime('%Y%m%d') if date else None
+
+            with self.minute_store.lock(key):
+                # 指定的历史交易日已保存时直接离线读取
+                if day is None or day not in self.minute_store.dates(key) \
+                        or day >= get_trading_calendar().last_session_day().strftime('%Y%m%d'):
+                    last = self.minute_store.last_timestamp(key)
+                    if self._intraday_stale(last):
+                        new = self._download_intraday_data(symbol, since=last)
+                        self.minute_store.append(key, new)
+                    else:
+                        logger.info(f"{symbol} 分时数据命中本地存储")
+
+                if day is not None:
+                    df = self.minute_store.read(key, day, day)
+                else:
+                    days = self.minute_store.dates(key)[-BAR_STORE_CONFIG['minute_sessions']:]
+                    df = self.minute_store.read(key, days[0], days[-1]) if days else pd.DataFrame()
 
             if df.empty:
                 logger.warning(f"未获取到股票 {symbol} 的分时数据")
-                return df
+            return df
 
-            # 转换列名
-            column_map = {
-                '时间': 'date',
-                '开盘': 'open',
-                '收盘': 'close',
-                '最高': 'high',
-                '最低': 'low',
-                '成交量': 'volume',
-                '时间': 'datetime',
-            }
+        except Exception as e:
+            logger.error(f"获取 {symbol} 分时数据失败: {e}")
+            return pd.DataFrame()
+
+    def _intraday_stale(self, last: Optional[pd.Timestamp]) -> bool:
+        """
+        判断本地分钟线是否需要更新：最近交易日收盘后的分钟线已保存时无需下载
+
+        Args:
+            last: 本地最后一根分钟线的时间
+
+        Returns:
+            是否需要下载新数据
+        """
+        if last is None:
+            return True
+        close_time = pd.Timestamp(
+            f"{get_trading_calendar().last_session_day().strftime('%Y-%m-%d')} {BAR_STORE_CONFIG['market_close']}")
+        return last < close_time
 
-            # 检查是否有英文列名（新版接口）
-            if 'datetime' in df.columns or 'DateTime' in df.columns:
-                df.columns = df.columns.str.lower()
+    def _download_intraday_data(self, symbol: str, since: pd.Timestamp = None) -> pd.DataFrame:
+        """
+        从 AKShare 下载 1 分钟线并转换为标准格式
 
-            df = df.rename(columns=column_map)
+        Args:
+            symbol: 股票代码
+            since: 只下载该时间（含）之后的分钟线，默认下载接口提供的全部数据
 
-            # 确保日期是 datetime 格式
-            if 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'])
-            elif 'datetime' in df.columns:
-                df['date'] = pd.to_datetime(df['datetime'])
+        Returns:
+            分时数据 DataFrame
+        """
+        ak_symbol = self._convert_symbol(symbol)
+        code = ak_symbol[2:]  # 去掉 sh/sz 前缀
+        logger.info(f"正在获取 {symbol} 的分时数据...")
 
-            # 保留必要的列
-            required_cols = ['date', 'open', 'high', 'low', 'close', 'volume']
-            existing_cols = [col for col in required_cols if col in df.columns]
-            df = df[existing_cols]
+        kwargs = {'symbol': code, 'period': '1', 'adjust': ''}
+        if since is not None:
+            # 从最后一根已存分钟线开始重新获取，补全保存时尚未走完的那一分钟
+            kwargs['start_date'] = since.strftime('%Y-%m-%d %H:%M:%S')
 
-            # 转换日期格式
-            df['trade_date'] = df['date'].dt.strftime('%Y%m%d')
+        # 获取分时数据
+        df = SINGLE_FLIGHT.do(('akshare_intraday', code, kwargs.get('start_date')),
+                              AKSHARE_LIMITER.call, ak.stock_zh_a_hist_min_em, **kwargs)
 
-            # 按时间排序
-            df = df.sort_values('date').reset_index(drop=True)
+        if df.empty:
+            return empty_bars()
 
-            logger.info(f"获取 {symbol} 分时数据成功，共 {len(df)} 条记录")
-            return df
+        # 转换列名
+        column_map = {
+            '时间': 'date',
+            '开盘': 'open',
+            '收盘': 'close',
+            '最高': 'high',
+            '最低': 'low',
+            '成交量': 'volume',
+            '时间': 'datetime',
+        }
 
-        except Exception as e:
-            logger.error(f"获取 {symbol} 分时数据失败: {e}")
-            return pd.DataFrame()
+        # 检查是否有英文列名（新版接口）
+        if 'datetime' in df.columns or 'DateTime' in df.columns:
+            df.columns = df.columns.str.lower()
+
+        df = df.rename(columns=column_map)
+
+        if 'date' not in df.columns and 'datetime' in df.columns:
+            df['date'] = df['datetime']
+
+        # 转换为以时间为索引的标准 K 线格式
+        df = normalize_bars(df)
+
+        logger.info(f"获取 {symbol} 分时数据成功，共 {len(df)} 条记录")
+        return df
 
     def get_realtime_data(self, symbol: str) -> pd.DataFrame:
         """
@@ -250,59 +611,20 @@ class AKShareDataSource:
             code = ak_symbol[2:]  # 去掉 sh/sz 前缀
             logger.info(f"正在获取 {symbol} 的实时数据...")
 
-            # 获取实时行情
-            df = ak.stock_zh_a_spot_em()
+            # 从共享快照中按代码索引查找
+            snapshot = self.spot_cache.get()
 
-            if df.empty:
+            if snapshot.df.empty:
                 logger.warning(f"实时行情数据为空")
                 return pd.DataFrame()
 
-            # 打印前几行的列名用于调试
-            logger.debug(f"实时数据列名: {df.columns.tolist()[:5]}")
-
-            # 尝试多种方式筛选股票
-            stock_df = pd.DataFrame()
-
-            # 方式1: 通过代码列筛选
-            if '代码' in df.columns:
-                stock_df = df[df['代码'] == code]
-            # 方式2: 通过英文列名筛选
-            elif 'code' in df.columns:
-                stock_df = df[df['code'] == code]
-
-            # 如果还是空，尝试带市场前缀
-            if stock_df.empty:
-                if '代码' in df.columns:
-                    stock_df = df[df['代码'] == ak_symbol]
-                elif 'code' in df.columns:
-                    stock_df = df[df['code'] == ak_symbol]
+            # 先用纯代码查找，再尝试带市场前缀的代码（已转换为英文列名）
+            stock_df = snapshot.lookup(code, ak_symbol)
 
             if stock_df.empty:
                 logger.warning(f"未找到股票 {symbol} ({code}) 的实时数据")
-                logger.debug(f"可用的股票代码示例: {df['代码'].head(3).tolist() if '代码' in df.columns else 'N/A'}")
                 return pd.DataFrame()
 
-            # 转换列名
-            column_map = {
-                '代码': 'symbol',
-                '名称': 'name',
-                '最新价': 'price',
-                '涨跌幅': 'change_pct',
-                '涨跌额': 'change_amount',
-                '成交量': 'volume',
-                '成交额': 'amount',
-                '振幅': 'amplitude',
-                '最高': 'high',
-                '最低': 'low',
-                '今开': 'open',
-                '昨收': 'prev_close',
-                '换手率': 'turnover',
-                '市盈率-动态': 'pe_ttm',
-                '市盈率': 'pe_ttm',
-            }
-
-            stock_df = stock_df.rename(columns=column_map)
-
             logger.info(f"获取 {symbol} 实时数据成功: {stock_df.iloc[0].get('price', 'N/A')}")
             return stock_df
 
@@ -310,9 +632,45 @@ class AKShareDataSource:
             logger.error(f"获取 {symbol} 实时数据失败: {e}")
             return pd.DataFrame()
 
+    def get_realtime_batch(self, symbols: List[str]) -> pd.DataFrame:
+        """
+        批量获取实时行情（所有股票共用一次全市场快照）
+
+        Args:
+            symbols: 股票代码列表，如 ['000001.SZ', '600519.SH']
+
+        Returns:
+            以传入代码为索引的实时数据 DataFrame，包含 price/high/low/volume/prev_close 等列，
+            未找到的股票不包含在结果中
+        """
+        try:
+            logger.info(f"正在批量获取 {len(symbols)} 只股票的实时数据...")
+            snapshot = self.spot_cache.get()
+
+            found = []
+            positions = []
+            for symbol in symbols:
+                ak_symbol = self._convert_symbol(symbol)
+                pos = snapshot.position(ak_symbol[2:], ak_symbol)
+                if pos is None:
+                    logger.warning(f"未找到股票 {symbol} 的实时数据")
+                    continue
+                found.append(symbol)
+                positions.append(pos)
+
+            quotes = snapshot.quotes.iloc[positions].copy()
+            quotes.index = pd.Index(found, name='code')
+
+            logger.info(f"批量获取实时数据成功，共 {len(quotes)} 只股票")
+            return quotes
+
+        except Exception as e:
+            logger.error(f"批量获取实时数据失败: {e}")
+            return pd.DataFrame()
+
     def get_stock_info(self, symbol: str) -> dict:
         """
-        获取股票信息
+        获取股票信息（优先查询本地基础信息表）
 
         Args:
             symbol: 股票代码
@@ -321,11 +679,23 @@ class AKShareDataSource:
             股票信息字典
         """
         try:
+            info = self.metadata.lookup(symbol)
+            if info is not None:
+                return {
+                    'name': info['name'],
+                    'symbol': symbol,
+                    'industry': info['industry'],
+                    'market_cap': info['market_cap'],
+                    'board': info['board'],
+                    'list_date': info['list_date'],
+                }
+
             ak_symbol = self._convert_symbol(symbol)
             code = ak_symbol[2:]  # 去掉 sh/sz 前缀
 
             # 获取股票基本信息
-            info_df = ak.stock_individual_info_em(symbol=code)
+            info_df = SINGLE_FLIGHT.do(('akshare_info', code), AKSHARE_LIMITER.call,
+                                      ak.stock_individual_info_em, symbol=code)
 
             if info_df.empty:
                 return {'name': symbol, 'symbol': symbol}
@@ -357,38 +727,53 @@ class AKShareDataSource:
         """
         try:
             logger.info("正在获取 A 股股票列表...")
-            df = ak.stock_zh_a_spot_em()
+            df = self.spot_cache.get().df.copy()
             logger.info(f"获取 A 股股票列表成功，共 {len(df)} 只股票")
             return df
         except Exception as e:
             logger.error(f"获取 A 股股票列表失败: {e}")
             return pd.DataFrame()
 
+    def get_universe(self) -> UniverseIndex:
+        """
+        获取全市场股票池索引（代码、名称、交易所、板块、行业）
+
+        Returns:
+            股票池索引
+        """
+        self.metadata.load()
+        universe = AKShareDataSource._universe
+        if universe is None or universe.built_on is None or universe.built_on != self.metadata.built_on:
+            universe = UniverseIndex.from_metadata(self.metadata)
+            AKShareDataSource._universe = universe
+        return universe
+
     def save_to_csv(self, df: pd.DataFrame, filename: str):
         """
-        保存数据到 CSV 文件
+        保存数据到文件，按扩展名选择格式：.feather/.arrow（Arrow IPC）、
+        .parquet 或 .csv（仅用于导出）；没有扩展名时使用 FILE_CONFIG['format']
 
         Args:
             df: 要保存的数据
             filename: 文件名
         """
-        filepath = DATA_DIR / filename
-        df.to_csv(filepath, index=False, encoding='utf-8-sig')
+        filepath = save_frame(df, DATA_DIR / filename)
         logger.info(f"数据已保存到 {filepath}")
 
-    def load_from_csv(self, filename: str) -> pd.DataFrame:
+    def load_from_csv(self, filename: str, columns: List[str] = None) -> pd.DataFrame:
         """
-        从 CSV 文件加载数据
+        从文件加载数据，格式由扩展名决定（见 save_to_csv）
 
         Args:
             filename: 文件名
+            columns: 只读取这些列，默认读取全部（Feather/Parquet 不会解码其余列）
 
         Returns:
             数据 DataFrame
         """
-        filepath = DATA_DIR / filename
+        filepath = resolve_path(DATA_DIR / filename)
         if filepath.exists():
-            df = pd.read_csv(filepath)
+            df = load_frame(filepath, columns)
             logger.info(f"从 {filepath} 加载数据成功")
             return df
         logger.warning(f"文件 {filepath} 不存在")
@@ -0,0 +1,173 @@
+"""
+异步数据源（在线程池中执行阻塞的数据源调用，限制并发并支持超时和取消）
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, List, Optional, Tuple, Union
+import pandas as pd
+from config import ASYNC_CONFIG
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDataSource:
+    """
+    同步数据源的 asyncio 包装
+
+    每次调用在线程池中执行底层数据源的阻塞方法，同时进行的调用数由信号量
+    限制，超过 timeout 的调用抛出 asyncio.TimeoutError。调用被取消或超时后
+    协程立即返回，但已在线程中开始的底层请求无法中断，会在后台执行完毕。
+
+    用法:
+        async with AsyncDataSource(AKShareDataSource()) as ads:
+            async for symbol, df in ads.iter_daily_data(symbols):
+                ...
+    """
+
+    def __init__(self, source=None, concurrency: int = None, timeout: float = None,
+                 executor: ThreadPoolExecutor = None):
+        """
+        初始化异步数据源
+
+        Args:
+            source: 同步数据源，默认使用 AKShareDataSource
+            concurrency: 最大并发调用数，默认取 ASYNC_CONFIG['concurrency']
+            timeout: 单次调用超时秒数，默认取 ASYNC_CONFIG['timeout']，None 或 0 表示不超时
+            executor: 执行阻塞调用的线程池，默认新建一个
+        """
+        if source is None:
+            from .akshare_source import AKShareDataSource
+            source = AKShareDataSource()
+        self.source = source
+        self.concurrency = concurrency or ASYNC_CONFIG['concurrency']
+        self.timeout = ASYNC_CONFIG['timeout'] if timeout is None else timeout
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix='async-source')
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> 'AsyncDataSource':
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """关闭自建的线程池（不等待后台仍在执行的请求）"""
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+    async def _run(self, method: str, *args, timeout: float = None, **kwargs):
+        """
+        在线程池中执行底层数据源的方法
+
+        Args:
+            method: 底层数据源的方法名
+            args: 位置参数
+            timeout: 本次调用的超时秒数，默认取实例的 timeout
+            kwargs: 关键字参数
+
+        Returns:
+            底层方法的返回值
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = self.timeout if timeout is None else timeout
+
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(getattr(self.source, method), *args, **kwargs)
+            future = loop.run_in_executor(self._executor, call)
+            return await asyncio.wait_for(future, timeout or None)
+
+    async def get_daily_data(self, symbol: str, start_date: str = None,
+                             end_date: str = None, **kwargs) -> pd.DataFrame:
+        """
+        获取日线数据，参数同底层数据源的 get_daily_data
+
+        Returns:
+            日线数据 DataFrame
+        """
+        return await self._run('get_daily_data', symbol, start_date, end_date, **kwargs)
+
+    async def get_realtime_data(self, symbol: str) -> pd.DataFrame:
+        """
+        获取实时行情数据
+
+        Args:
+            symbol: 股票代码
+
+        Returns:
+            实时数据 DataFrame
+        """
+        return await self._run('get_realtime_data', symbol)
+
+    async def get_realtime_batch(self, symbols: List[str]) -> pd.DataFrame:
+        """
+        批量获取实时行情
+
+        Args:
+            symbols: 股票代码列表
+
+        Returns:
+            以代码为索引的实时数据 DataFrame
+        """
+        return await self._run('get_realtime_batch', list(symbols))
+
+    async def get_intraday_data(self, symbol: str, **kwargs) -> pd.DataFrame:
+        """
+        获取分时数据，参数同底层数据源的 get_intraday_data
+
+        Returns:
+            分时数据 DataFrame
+        """
+        return await self._run('get_intraday_data', symbol, **kwargs)
+
+    async def get_stock_info(self, symbol: str) -> dict:
+        """
+        获取股票信息
+
+        Args:
+            symbol: 股票代码
+
+        Returns:
+            股票信息字典
+        """
+        return await self._run('get_stock_info', symbol)
+
+    async def iter_daily_data(self, symbols: Iterable[str], start_date: str = None,
+                              end_date: str = None, **kwargs
+                              ) -> AsyncIterator[Tuple[str, Union[pd.DataFrame, Exception]]]:
+        """
+        并发获取多只股票的日线数据，按完成顺序逐个返回
+
+        调用方可以在其余股票仍在下载时处理已完成的股票。失败或超时的股票
+        返回异常对象而不是抛出，不影响其余股票；迭代提前结束时取消未完成的请求。
+
+        Args:
+            symbols: 股票代码列表
+            start_date: 开始日期
+            end_date: 结束日期
+            kwargs: 传给 get_daily_data 的其他参数
+
+        Yields:
+            (股票代码, 日线数据 DataFrame 或异常)
+        """
+        async def fetch(symbol: str):
+            try:
+                return symbol, await self.get_daily_data(symbol, start_date, end_date, **kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"异步获取 {symbol} 日线数据失败: {e!r}")
+                return symbol, e
+
+        tasks = [asyncio.ensure_future(fetch(symbol)) for symbol in symbols]
+        try:
+            for done in asyncio.as_completed(tasks):
+                yield await done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,304 @@
+"""
+本地 K 线存储（按股票分文件的列式存储，支持增量追加；分钟线按交易日分区）
+"""
+import json
+import os
+import threading
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional
+from config import BAR_STORE_CONFIG
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BarStore:
+    """
+    按股票代码分文件保存日线数据
+
+    每只股票对应一个 Parquet/Feather 文件，以及一个记录已覆盖日期区间的
+    JSON 元数据文件。数据源先读本地，只向上游请求缺失的日期区间。
+    以 'date' 为索引的数据在文件中保存为 date 列，读取时恢复为索引。
+    """
+
+    SUFFIXES = {'parquet': '.parquet', 'feather': '.feather'}
+
+    def __init__(self, root: Path = None, fmt: str = None):
+        """
+        初始化本地存储
+
+        Args:
+            root: 存储目录，默认取 BAR_STORE_CONFIG['path']
+            fmt: 文件格式 'parquet' 或 'feather'
+        """
+        self.root = Path(root or BAR_STORE_CONFIG['path'])
+        self.fmt = fmt or BAR_STORE_CONFIG['format']
+        if self.fmt not in self.SUFFIXES:
+            raise ValueError(f"不支持的存储格式: {self.fmt}")
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}{self.SUFFIXES[self.fmt]}"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    @staticmethod
+    def _to_file(df: pd.DataFrame) -> pd.DataFrame:
+        return df.reset_index() if df.index.name == 'date' else df.reset_index(drop=True)
+
+    @staticmethod
+    def _from_file(df: pd.DataFrame) -> pd.DataFrame:
+        return df.set_index('date') if 'date' in df.columns else df
+
+    def lock(self, key: str) -> threading.Lock:
+        """
+        获取某个 key 的进程内锁，避免同一文件被并发读改写
+
+        Args:
+            key: 存储键
+
+        Returns:
+            该键对应的锁
+        """
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def read(self, key: str, start: pd.Timestamp = None,
+             end: pd.Timestamp = None) -> pd.DataFrame:
+        """
+        读取本地数据
+
+        Args:
+            key: 存储键
+            start: 开始日期（含）
+            end: 结束日期（含）
+
+        Returns:
+            以日期为索引、按日期排序的 DataFrame，不存在时返回空 DataFrame
+        """
+        path = self._path(key)
+        if not path.exists():
+            return pd.DataFrame()
+
+        try:
+            if self.fmt == 'parquet':
+                df = pd.read_parquet(path)
+            else:
+                df = pd.read_feather(path)
+        except Exception as e:
+            logger.warning(f"读取本地数据 {path} 失败，将重新下载: {e}")
+            return pd.DataFrame()
+
+        df = self._from_file(df)
+        if start is not None:
+            df = df[df.index >= start]
+        if end is not None:
+            df = df[df.index <= end]
+        return df
+
+    def read_meta(self, key: str) -> Optional[dict]:
+        """
+        读取元数据
+
+        Args:
+            key: 存储键
+
+        Returns:
+            元数据字典，不存在时返回 None
+        """
+        path = self._meta_path(key)
+        if not path.exists() or not self._path(key).exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except Exception as e:
+            logger.warning(f"读取元数据 {path} 失败: {e}")
+            return None
+
+    def write(self, key: str, df: pd.DataFrame, meta: dict):
+        """
+        覆盖写入数据和元数据（先写临时文件再原子替换）
+
+        Args:
+            key: 存储键
+            df: 数据
+            meta: 元数据
+        """
+        path = self._path(key)
+        tmp_path = path.with_name(path.name + '.tmp')
+        df = self._to_file(df)
+        if self.fmt == 'parquet':
+            df.to_parquet(tmp_path, index=False)
+        else:
+            df.to_feather(tmp_path)
+        os.replace(tmp_path, path)
+
+        meta_path = self._meta_path(key)
+        tmp_meta = meta_path.with_name(meta_path.name + '.tmp')
+        tmp_meta.write_text(json.dumps(meta, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_meta, meta_path)
+
+    def merge(self, key: str, existing: pd.DataFrame, new: pd.DataFrame,
+              meta: dict) -> pd.DataFrame:
+        """
+        将新数据合并进已有数据并写回，同一日期以新数据为准
+
+        Args:
+            key: 存储键
+            existing: 已有数据
+            new: 新下载的数据
+            meta: 合并后的元数据
+
+        Returns:
+            合并后的 DataFrame
+        """
+        if existing.empty:
+            combined = new
+        elif new.empty:
+            combined = existing
+        else:
+            combined = pd.concat([existing, new])
+            combined = combined[~combined.index.duplicated(keep='last')]
+        combined = combined.sort_index()
+        self.write(key, combined, meta)
+        return combined
+
+    def delete(self, key: str):
+        """
+        删除某个 key 的数据和元数据
+
+        Args:
+            key: 存储键
+        """
+        for path in (self._path(key), self._meta_path(key)):
+            if path.exists():
+                path.unlink()
+
+
+class MinuteBarStore:
+    """
+    按股票、按交易日分区保存分钟线
+
+    目录结构为 <root>/<代码>/<YYYYMMDD>.parquet，每个交易日一个压缩文件。
+    新数据只追加到对应日期的分区，历史交易日的分区写入后不再改变，
+    可以离线读取用于盘中分析和回放。
+    """
+
+    def __init__(self, root: Path = None, compression: str = None):
+        """
+        初始化分钟线存储
+
+        Args:
+            root: 存储目录，默认取 BAR_STORE_CONFIG['minute_path']
+            compression: Parquet 压缩算法，默认取 BAR_STORE_CONFIG['minute_compression']
+        """
+        self.root = Path(root or BAR_STORE_CONFIG['minute_path'])
+        self.compression = compression or BAR_STORE_CONFIG['minute_compression']
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _partition(self, symbol: str, day: str) -> Path:
+        return self.root / symbol / f"{day}.parquet"
+
+    def lock(self, symbol: str) -> threading.Lock:
+        """
+        获取某只股票的进程内锁
+
+        Args:
+            symbol: 股票代码
+
+        Returns:
+            该股票对应的锁
+        """
+        with self._locks_guard:
+            if symbol not in self._locks:
+                self._locks[symbol] = threading.Lock()
+            return self._locks[symbol]
+
+    def dates(self, symbol: str) -> List[str]:
+        """
+        列出已保存的交易日
+
+        Args:
+            symbol: 股票代码
+
+        Returns:
+            升序的交易日列表 'YYYYMMDD'
+        """
+        folder = self.root / symbol
+        if not folder.exists():
+            return []
+        return sorted(path.stem for path in folder.glob('*.parquet'))
+
+    def _read_partition(self, symbol: str, day: str) -> pd.DataFrame:
+        path = self._partition(symbol, day)
+        try:
+            return BarStore._from_file(pd.read_parquet(path))
+        except Exception as e:
+            logger.warning(f"读取分钟线 {path} 失败: {e}")
+            return pd.DataFrame()
+
+    def read(self, symbol: str, start: str = None, end: str = None) -> pd.DataFrame:
+        """
+        读取若干交易日的分钟线
+
+        Args:
+            symbol: 股票代码
+            start: 开始交易日 'YYYYMMDD'（含）
+            end: 结束交易日 'YYYYMMDD'（含）
+
+        Returns:
+            以时间为索引、按时间排序的 DataFrame，没有数据时返回空 DataFrame
+        """
+        days = [d for d in self.dates(symbol)
+                if (start is None or d >= start) and (end is None or d <= end)]
+        frames = [self._read_partition(symbol, day) for day in days]
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames)
+
+    def last_timestamp(self, symbol: str) -> Optional[pd.Timestamp]:
+        """
+        获取已保存的最后一根分钟线的时间
+
+        Args:
+            symbol: 股票代码
+
+        Returns:
+            最后一根分钟线的时间，没有数据时返回 None
+        """
+        for day in reversed(self.dates(symbol)):
+            df = self._read_partition(symbol, day)
+            if not df.empty:
+                return df.index.max()
+        return None
+
+    def append(self, symbol: str, df: pd.DataFrame):
+        """
+        按交易日追加分钟线，同一时间以新数据为准
+
+        Args:
+            symbol: 股票代码
+            df: 以时间为索引的分钟线数据
+        """
+        if df.empty:
+            return
+        (self.root / symbol).mkdir(parents=True, exist_ok=True)
+        for day, part in df.groupby(df.index.strftime('%Y%m%d'), sort=True):
+            path = self._partition(symbol, day)
+            if path.exists():
+                part = pd.concat([self._read_partition(symbol, day), part])
+                part = part[~part.index.duplicated(keep='last')]
+            part = part.sort_index()
+
+            tmp_path = path.with_name(path.name + '.tmp')
+            BarStore._to_file(part).to_parquet(tmp_path, index=False, compression=self.compression)
+            os.replace(tmp_path, path)
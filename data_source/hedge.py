@@ -0,0 +1,378 @@
+"""
+多接口对冲请求（按延迟分位数启动备用接口，熔断持续失败的接口）
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from config import HEDGE_CONFIG
+from .rate_limiter import RateLimitTimeout
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(ConnectionError):
+    """所有可用接口都处于熔断状态"""
+
+
+def is_upstream_failure(error: Exception) -> bool:
+    """
+    是否为接口本身的故障（网络、超时、HTTP 错误等），只有这类异常计入熔断
+
+    单只股票的代码无效、数据为空等解析异常以及本地限流等待超时
+    （RateLimitTimeout）不说明接口不可用，不计入熔断。
+
+    Args:
+        error: 请求抛出的异常
+
+    Returns:
+        是否计入熔断
+    """
+    return isinstance(error, OSError) and not isinstance(error, RateLimitTimeout)
+
+
+class LatencyTracker:
+    """最近若干次成功请求的耗时，用于计算延迟分位数"""
+
+    def __init__(self, window: int = None):
+        """
+        初始化延迟统计
+
+        Args:
+            window: 保留的最近样本数，默认取 HEDGE_CONFIG['window']
+        """
+        self._samples = deque(maxlen=window or HEDGE_CONFIG['window'])
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency: float):
+        """记录一次成功请求的耗时（秒）"""
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        延迟分位数
+
+        Args:
+            q: 分位数（0~100）
+
+        Returns:
+            耗时秒数，没有样本时为 None
+        """
+        with self._lock:
+            if not self._samples:
+                return None
+            return float(np.percentile(np.fromiter(self._samples, dtype=float), q))
+
+
+class CircuitBreaker:
+    """
+    熔断器
+
+    连续失败达到阈值后熔断，熔断期间不再调用该接口；冷却时间过后放行
+    一次试探请求，成功则恢复，失败则重新熔断。
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = None, reset_timeout: float = None):
+        """
+        初始化熔断器
+
+        Args:
+            name: 名称，用于日志
+            failure_threshold: 触发熔断的连续失败次数，默认取 HEDGE_CONFIG['failure_threshold']
+            reset_timeout: 熔断后放行试探请求前的冷却秒数，默认取 HEDGE_CONFIG['reset_timeout']
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold or HEDGE_CONFIG['failure_threshold']
+        self.reset_timeout = HEDGE_CONFIG['reset_timeout'] if reset_timeout is None else reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """当前状态"""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        是否允许发起请求；冷却结束后只放行一次试探请求
+
+        Returns:
+            是否允许
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        """记录一次成功请求"""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"{self.name} 熔断恢复")
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_ignored(self):
+        """请求结束但不计成败（如单只股票的数据无效）：试探请求不算数，下次再放行试探"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.OPEN
+
+    def record_failure(self):
+        """记录一次失败请求"""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"{self.name} 连续失败 {self._failures} 次，熔断 {self.reset_timeout} 秒")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class HedgedCaller:
+    """
+    多接口请求器
+
+    按优先级排列的同类接口（如 stock_zh_a_hist、stock_zh_a_daily、Yahoo），
+    每个接口有独立的延迟统计和熔断器。
+
+    - 对冲模式：先请求第一个接口，超过其历史延迟分位数仍未返回时启动下一个
+      接口，取最先返回的有效结果；接口失败或结果无效时立即启动下一个
+    - 顺序模式：按顺序请求，失败或结果无效时再请求下一个
+
+    两种模式都跳过处于熔断状态的接口。只有接口本身的故障（见 is_upstream_failure）
+    计入熔断，单只股票的无效代码、空数据和本地限流超时不计入。未被采用的请求无法中断，会在后台
+    执行完毕，其耗时和成败仍计入统计。
+    """
+
+    def __init__(self, name: str, endpoints: List[str], config: dict = None,
+                 is_failure: Callable[[Exception], bool] = is_upstream_failure):
+        """
+        初始化多接口请求器
+
+        Args:
+            name: 名称，用于日志
+            endpoints: 接口名称列表
+            config: 参数，默认取 HEDGE_CONFIG
+            is_failure: 判断异常是否计入熔断，默认只计接口本身的故障
+        """
+        self.name = name
+        self.is_failure = is_failure
+        self.config = {**HEDGE_CONFIG, **(config or {})}
+        self.trackers = {ep: LatencyTracker(self.config['window']) for ep in endpoints}
+        self.breakers = {ep: CircuitBreaker(f"{name}.{ep}", self.config['failure_threshold'],
+                                            self.config['reset_timeout']) for ep in endpoints}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._stats = {'calls': 0, 'hedged': 0, 'hedge_wins': 0, 'failovers': 0, 'short_circuited': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.config['workers'],
+                                                    thread_name_prefix=f"hedge-{self.name}")
+            return self._executor
+
+    def hedge_delay(self, endpoint: str) -> float:
+        """
+        启动下一个接口前等待的秒数：该接口延迟的 percentile 分位数，
+        样本不足时使用 default_delay，并限制在 [min_delay, max_delay]
+
+        Args:
+            endpoint: 接口名称
+
+        Returns:
+            等待秒数
+        """
+        tracker = self.trackers[endpoint]
+        delay = tracker.percentile(self.config['percentile'])
+        if delay is None or len(tracker) < self.config['min_samples']:
+            delay = self.config['default_delay']
+        return min(max(delay, self.config['min_delay']), self.config['max_delay'])
+
+    def _run(self, endpoint: str, fn: Callable[[], Any], is_valid: Callable[[Any], bool]) -> Any:
+        """
+        执行一次接口请求并记录耗时和成败
+
+        只有 is_upstream_failure 认定的异常计入熔断；其他异常和无效结果
+        （如单只股票代码无效、没有数据）直接返回调用方，不计成败。
+        """
+        breaker = self.breakers[endpoint]
+        started = time.monotonic()
+        try:
+            result = fn()
+        except Exception as e:
+            if self.is_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.record_ignored()
+            raise
+        if not is_valid(result):
+            breaker.record_ignored()
+            return result
+        self.trackers[endpoint].record(time.monotonic() - started)
+        breaker.record_success()
+        return result
+
+    def call(self, calls: List[Tuple[str, Callable[[], Any]]],
+             is_valid: Callable[[Any], bool] = None, hedge: bool = None) -> Any:
+        """
+        请求多个接口，返回第一个有效结果
+
+        Args:
+            calls: 按优先级排列的 [(接口名称, 无参请求函数), ...]
+            is_valid: 判断结果是否有效，默认非 None 即有效
+            hedge: 是否对冲，默认取配置 enabled
+
+        Returns:
+            第一个有效结果；都无效时返回第一个无效结果
+
+        Raises:
+            CircuitOpenError: 所有接口都处于熔断状态
+            Exception: 所有接口都失败时抛出最后一个异常
+        """
+        is_valid = is_valid or (lambda result: result is not None)
+        hedge = self.config['enabled'] if hedge is None else hedge
+        self._count('calls')
+
+        if hedge and len(calls) > 1:
+            return self._call_hedged(list(calls), is_valid)
+        return self._call_sequential(calls, is_valid)
+
+    def _next_allowed(self, queue: list) -> Optional[Tuple[str, Callable[[], Any]]]:
+        """取出队列中下一个未熔断的接口（熔断器在真正发起请求前才放行试探请求）"""
+        while queue:
+            endpoint, fn = queue.pop(0)
+            if self.breakers[endpoint].allow():
+                return endpoint, fn
+        return None
+
+    def _short_circuit(self, calls) -> CircuitOpenError:
+        self._count('short_circuited')
+        return CircuitOpenError(f"{self.name} 的接口均处于熔断状态: {[ep for ep, _ in calls]}")
+
+    def _call_sequential(self, calls, is_valid) -> Any:
+        queue = list(calls)
+        invalid, error, attempts = [], None, 0
+        while True:
+            item = self._next_allowed(queue)
+            if item is None:
+                break
+            endpoint, fn = item
+            if attempts:
+                self._count('failovers')
+            attempts += 1
+            try:
+                result = self._run(endpoint, fn, is_valid)
+            except Exception as e:
+                logger.warning(f"{self.name}.{endpoint} 请求失败: {e}")
+                error = e
+                continue
+            if is_valid(result):
+                return result
+            invalid.append(result)
+
+        if invalid:
+            return invalid[0]
+        if error is None:
+            raise self._short_circuit(calls)
+        raise error
+
+    def _call_hedged(self, calls, is_valid) -> Any:
+        pool = self._pool()
+        pending: Dict[Future, str] = {}
+        queue = list(calls)
+        invalid, error = [], None
+
+        def launch() -> Optional[str]:
+            item = self._next_allowed(queue)
+            if item is None:
+                return None
+            endpoint, fn = item
+            pending[pool.submit(self._run, endpoint, fn, is_valid)] = endpoint
+            return endpoint
+
+        primary = launch()
+        if primary is None:
+            raise self._short_circuit(calls)
+        deadline = time.monotonic() + self.hedge_delay(primary)
+
+        while pending:
+            timeout = max(deadline - time.monotonic(), 0) if queue else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                # 当前接口超过延迟分位数仍未返回，启动下一个接口对冲
+                endpoint = launch()
+                if endpoint is not None:
+                    self._count('hedged')
+                    logger.info(f"{self.name} 请求超过延迟阈值，对冲请求 {endpoint}")
+                    deadline = time.monotonic() + self.hedge_delay(endpoint)
+                continue
+
+            for future in done:
+                endpoint = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"{self.name}.{endpoint} 请求失败: {e}")
+                    error = e
+                    continue
+                if is_valid(result):
+                    if endpoint != primary:
+                        self._count('hedge_wins')
+                    return result
+                invalid.append(result)
+
+            # 已返回的接口都失败或结果无效时立即启动下一个
+            if not pending:
+                endpoint = launch()
+                if endpoint is not None:
+                    self._count('failovers')
+                    deadline = time.monotonic() + self.hedge_delay(endpoint)
+
+        if invalid:
+            return invalid[0]
+        raise error
+
+    def stats(self) -> dict:
+        """
+        获取各接口的延迟分位数、熔断状态和对冲计数，用于监控
+
+        Returns:
+            状态字典
+        """
+        endpoints = {}
+        for endpoint, tracker in self.trackers.items():
+            p50 = tracker.percentile(50)
+            p95 = tracker.percentile(95)
+            endpoints[endpoint] = {
+                'samples': len(tracker),
+                'p50': round(p50, 3) if p50 is not None else None,
+                'p95': round(p95, 3) if p95 is not None else None,
+                'state': self.breakers[endpoint].state,
+            }
+        with self._stats_lock:
+            return {'name': self.name, **self._stats, 'endpoints': endpoints}
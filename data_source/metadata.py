@@ -0,0 +1,262 @@
+"""
+股票基础信息表（每日批量构建一次，本地持久化，内存中按代码索引）
+"""
+import threading
+import time
+import numpy as np
+import pandas as pd
+import akshare as ak
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from config import METADATA_CONFIG
+from .bar_store import BarStore
+from .rate_limiter import AKSHARE_LIMITER
+from utils.trading_calendar import get_trading_calendar
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 代码前缀 -> (交易所, 板块, 后缀)，按前缀长度从长到短匹配
+BOARD_RULES = [
+    ('688', '上交所', '科创板', 'SH'),
+    ('689', '上交所', '科创板', 'SH'),
+    ('60', '上交所', '主板', 'SH'),
+    ('000', '深交所', '主板', 'SZ'),
+    ('001', '深交所', '主板', 'SZ'),
+    ('003', '深交所', '主板', 'SZ'),
+    ('002', '深交所', '中小板', 'SZ'),
+    ('300', '深交所', '创业板', 'SZ'),
+    ('301', '深交所', '创业板', 'SZ'),
+    ('920', '北交所', '北交所', 'BJ'),
+    ('4', '北交所', '北交所', 'BJ'),
+    ('8', '北交所', '北交所', 'BJ'),
+]
+
+
+def classify_codes(codes: pd.Series) -> pd.DataFrame:
+    """
+    按代码前缀批量判断交易所和板块（向量化）
+
+    Args:
+        codes: 6 位股票代码序列
+
+    Returns:
+        包含 code/symbol/exchange/board 列的 DataFrame，无法识别的板块为空字符串
+    """
+    codes = codes.astype(str).str.zfill(6)
+    conditions = [codes.str.startswith(prefix).to_numpy() for prefix, _, _, _ in BOARD_RULES]
+    exchange = np.select(conditions, [rule[1] for rule in BOARD_RULES], default='')
+    board = np.select(conditions, [rule[2] for rule in BOARD_RULES], default='')
+    suffix = np.select(conditions, [rule[3] for rule in BOARD_RULES], default='SZ')
+    return pd.DataFrame({
+        'code': codes.to_numpy(),
+        'symbol': codes.to_numpy() + '.' + suffix,
+        'exchange': exchange,
+        'board': board,
+    })
+
+
+def to_code(symbol: str) -> str:
+    """
+    将各种写法的股票代码转换为 6 位纯代码
+
+    Args:
+        symbol: 股票代码，如 '000001.SZ'、'sz000001'、'000001'
+
+    Returns:
+        6 位代码，如 '000001'
+    """
+    code = symbol.strip().upper().split('.')[0]
+    if code[:2] in ('SH', 'SZ', 'BJ'):
+        code = code[2:]
+    return code
+
+
+class SymbolMetadata:
+    """
+    A 股基础信息表
+
+    包含代码、名称、交易所、板块、行业、总市值和上市日期。每天第一次使用时
+    批量构建并保存到本地，之后在内存中以字典索引，名称查询只是一次字典访问。
+    """
+
+    STORE_KEY = 'symbols'
+    COLUMNS = ['code', 'symbol', 'name', 'exchange', 'board', 'industry', 'market_cap', 'list_date']
+
+    def __init__(self, fetch_spot: Callable[[], pd.DataFrame], store: BarStore = None):
+        """
+        初始化基础信息表
+
+        Args:
+            fetch_spot: 获取全市场行情快照的函数（用于代码、名称和市值）
+            store: 本地存储，默认保存在 METADATA_CONFIG['path']
+        """
+        self.fetch_spot = fetch_spot
+        self.store = store or BarStore(METADATA_CONFIG['path'])
+        self._table: Optional[pd.DataFrame] = None
+        self._index: Dict[str, dict] = {}
+        self._built_on: Optional[str] = None
+        self._retry_after = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def table(self) -> pd.DataFrame:
+        """当日的基础信息表"""
+        self.load()
+        return self._table
+
+    @property
+    def built_on(self) -> Optional[str]:
+        """当前基础信息表的构建日期 'YYYYMMDD'"""
+        return self._built_on
+
+    def load(self, refresh: bool = False) -> pd.DataFrame:
+        """
+        加载基础信息表：内存中已是当前数据则直接返回，否则读取本地文件，
+        本地也不是当前数据时重新构建。上一个交易日（含）之后构建的表视为
+        当前数据，因此收盘后预热任务构建的表次日可以直接使用
+
+        Args:
+            refresh: 是否强制重新构建
+
+        Returns:
+            基础信息表
+        """
+        with self._lock:
+            today = datetime.now().strftime('%Y%m%d')
+            if not refresh and self._table is not None:
+                if self._is_current(self._built_on) or time.monotonic() < self._retry_after:
+                    return self._table
+
+            meta = self.store.read_meta(self.STORE_KEY)
+            if not refresh and meta and self._is_current(meta.get('built_on')):
+                self._set_table(self.store.read(self.STORE_KEY), meta['built_on'])
+                return self._table
+
+            try:
+                table = self.build()
+                self.store.write(self.STORE_KEY, table, {'built_on': today, 'count': len(table)})
+                self._set_table(table, today)
+            except Exception as e:
+                # 构建失败时使用旧数据，并在一段时间内不再重试
+                logger.warning(f"构建股票基础信息表失败，使用本地旧数据: {e}")
+                stale = self.store.read(self.STORE_KEY) if meta else pd.DataFrame(columns=self.COLUMNS)
+                self._set_table(stale, meta.get('built_on') if meta else None)
+                self._retry_after = time.monotonic() + METADATA_CONFIG['retry_interval']
+            return self._table
+
+    @staticmethod
+    def _is_current(built_on: Optional[str]) -> bool:
+        """构建日期不早于上一个交易日时视为当前数据"""
+        if not built_on:
+            return False
+        return built_on >= get_trading_calendar().previous_trading_day().strftime('%Y%m%d')
+
+    def _set_table(self, table: pd.DataFrame, built_on: Optional[str]):
+        self._table = table
+        self._built_on = built_on
+        self._index = dict(zip(table['code'], table.to_dict('records'))) if not table.empty else {}
+
+    def build(self) -> pd.DataFrame:
+        """
+        批量构建基础信息表
+
+        Returns:
+            基础信息表
+        """
+        logger.info("正在批量构建股票基础信息表...")
+        spot = self.fetch_spot()
+        if spot.empty:
+            raise ValueError("全市场行情为空")
+
+        table = classify_codes(spot['代码'])
+        table['name'] = spot['名称'].astype(str).to_numpy()
+        if '总市值' in spot.columns:
+            table['market_cap'] = pd.to_numeric(spot['总市值'], errors='coerce').to_numpy()
+        else:
+            table['market_cap'] = np.nan
+
+        industry = self._fetch_industry() if METADATA_CONFIG['fetch_industry'] else {}
+        table['industry'] = table['code'].map(industry).fillna('')
+
+        list_dates = self._fetch_list_dates() if METADATA_CONFIG['fetch_list_date'] else {}
+        table['list_date'] = table['code'].map(list_dates).fillna('')
+
+        table = table[self.COLUMNS].sort_values('code').reset_index(drop=True)
+        logger.info(f"股票基础信息表构建完成，共 {len(table)} 只股票")
+        return table
+
+    def _fetch_industry(self) -> Dict[str, str]:
+        """
+        按行业板块批量获取成分股，得到代码到行业的映射
+
+        Returns:
+            {代码: 行业}
+        """
+        mapping = {}
+        try:
+            boards = AKSHARE_LIMITER.call(ak.stock_board_industry_name_em)
+        except Exception as e:
+            logger.warning(f"获取行业板块列表失败: {e}")
+            return mapping
+
+        for board in boards['板块名称']:
+            try:
+                cons = AKSHARE_LIMITER.call(ak.stock_board_industry_cons_em, symbol=board)
+            except Exception as e:
+                logger.warning(f"获取行业 {board} 成分股失败: {e}")
+                continue
+            for code in cons['代码'].astype(str):
+                mapping.setdefault(code, board)
+        return mapping
+
+    def _fetch_list_dates(self) -> Dict[str, str]:
+        """
+        从沪深交易所股票列表批量获取上市日期
+
+        Returns:
+            {代码: 上市日期 'YYYYMMDD'}
+        """
+        sources = [
+            (lambda: AKSHARE_LIMITER.call(ak.stock_info_sh_name_code, symbol="主板A股"), '证券代码', '上市日期'),
+            (lambda: AKSHARE_LIMITER.call(ak.stock_info_sh_name_code, symbol="科创板"), '证券代码', '上市日期'),
+            (lambda: AKSHARE_LIMITER.call(ak.stock_info_sz_name_code, symbol="A股列表"), 'A股代码', 'A股上市日期'),
+        ]
+        mapping = {}
+        for fetch, code_col, date_col in sources:
+            try:
+                df = fetch()
+                dates = pd.to_datetime(df[date_col], errors='coerce').dt.strftime('%Y%m%d')
+                mapping.update(dict(zip(df[code_col].astype(str).str.zfill(6), dates.fillna(''))))
+            except Exception as e:
+                logger.warning(f"获取上市日期失败: {e}")
+        return mapping
+
+    def lookup(self, symbol: str) -> Optional[dict]:
+        """
+        查询单只股票的基础信息
+
+        Args:
+            symbol: 股票代码，如 '000001.SZ' 或 '000001'
+
+        Returns:
+            基础信息字典，未找到返回 None
+        """
+        self.load()
+        return self._index.get(to_code(symbol))
+
+    def get_name(self, symbol: str, default: str = None) -> str:
+        """
+        查询股票名称
+
+        Args:
+            symbol: 股票代码
+            default: 未找到时的返回值，默认返回代码本身
+
+        Returns:
+            股票名称
+        """
+        info = self.lookup(symbol)
+        if info is None:
+            return symbol if default is None else default
+        return info['name']
@@ -0,0 +1,320 @@
+"""
+全市场日线面板（按 日期 × 股票 对齐的内存映射 NumPy 数组）
+"""
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
+import numpy as np
+import pandas as pd
+from config import PANEL_CONFIG
+from utils.trading_calendar import get_trading_calendar
+from .schema import BAR_COLUMNS, PRICE_COLUMNS, PRICE_DTYPE, VOLUME_DTYPE
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 指向当前版本目录的文件名
+CURRENT_FILE = 'CURRENT'
+
+
+class UniversePanel:
+    """
+    全市场日线面板
+
+    每个字段（open/high/low/close/volume）是一个形状为 (日期数, 股票数) 的
+    C 顺序数组：某一日的横截面是连续内存，某只股票的时间序列是跨步视图，
+    两者都不复制数据。缺失的价格为 NaN，缺失的成交量为 0。
+
+    面板以 .npy 文件保存，load() 以只读内存映射方式打开，只读取文件头，
+    各进程通过操作系统页缓存共享同一份数据。
+    """
+
+    def __init__(self, dates: np.ndarray, symbols: List[str], fields: Dict[str, np.ndarray],
+                 as_of: Optional[str] = None):
+        """
+        初始化面板
+
+        Args:
+            dates: 交易日数组（datetime64[D]，升序）
+            symbols: 股票代码列表，对应数组的列
+            fields: {字段名: (日期数, 股票数) 数组}
+            as_of: 面板数据对应的交易日 'YYYYMMDD'
+        """
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.symbols = list(symbols)
+        self.fields = fields
+        self.as_of = as_of
+        self._columns = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._columns
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.fields[field]
+
+    @property
+    def shape(self) -> tuple:
+        """(日期数, 股票数)"""
+        return len(self.dates), len(self.symbols)
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        """日期索引"""
+        return pd.DatetimeIndex(self.dates.astype('datetime64[ns]'), name='date')
+
+    def column(self, symbol: str) -> int:
+        """
+        股票代码对应的列号
+
+        Args:
+            symbol: 股票代码
+
+        Returns:
+            列号
+        """
+        try:
+            return self._columns[symbol]
+        except KeyError:
+            raise KeyError(f"面板中没有股票 {symbol}") from None
+
+    def row(self, date) -> int:
+        """
+        日期对应的行号（二分查找）
+
+        Args:
+            date: 交易日
+
+        Returns:
+            行号
+        """
+        day = np.datetime64(pd.Timestamp(date).date(), 'D')
+        pos = int(np.searchsorted(self.dates, day))
+        if pos == len(self.dates) or self.dates[pos] != day:
+            raise KeyError(f"面板中没有交易日 {pd.Timestamp(date):%Y-%m-%d}")
+        return pos
+
+    def rows(self, start=None, end=None) -> slice:
+        """
+        日期区间对应的行切片（含首尾）
+
+        Args:
+            start: 开始日期，默认第一天
+            end: 结束日期，默认最后一天
+
+        Returns:
+            行切片
+        """
+        lo = 0 if start is None else int(np.searchsorted(
+            self.dates, np.datetime64(pd.Timestamp(start).date(), 'D'), side='left'))
+        hi = len(self.dates) if end is None else int(np.searchsorted(
+            self.dates, np.datetime64(pd.Timestamp(end).date(), 'D'), side='right'))
+        return slice(lo, hi)
+
+    def series(self, symbol: str, field: str = 'close', start=None, end=None) -> np.ndarray:
+        """
+        一只股票某字段的时间序列（跨步视图，不复制）
+
+        Args:
+            symbol: 股票代码
+            field: 字段名
+            start: 开始日期
+            end: 结束日期
+
+        Returns:
+            一维数组视图
+        """
+        return self.fields[field][self.rows(start, end), self.column(symbol)]
+
+    def arrays(self, symbol: str, start=None, end=None) -> Dict[str, np.ndarray]:
+        """
+        一只股票全部字段的时间序列（跨步视图，不复制）
+
+        Args:
+            symbol: 股票代码
+            start: 开始日期
+            end: 结束日期
+
+        Returns:
+            {字段名: 一维数组视图}
+        """
+        rows, col = self.rows(start, end), self.column(symbol)
+        return {field: values[rows, col] for field, values in self.fields.items()}
+
+    def cross_section(self, date, field: str = 'close') -> np.ndarray:
+        """
+        某一交易日全部股票某字段的横截面（连续内存视图，不复制）
+
+        Args:
+            date: 交易日
+            field: 字段名
+
+        Returns:
+            一维数组视图，顺序同 symbols
+        """
+        return self.fields[field][self.row(date)]
+
+    def bars(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """
+        一只股票的标准 K 线 DataFrame（会复制数据，去掉停牌等缺失的日期）
+
+        Args:
+            symbol: 股票代码
+            start: 开始日期
+            end: 结束日期
+
+        Returns:
+            以日期为索引的标准 K 线
+        """
+        rows = self.rows(start, end)
+        columns = self.arrays(symbol, start, end)
+        df = pd.DataFrame(columns, index=self.index[rows])
+        return df[~np.isnan(columns['close'])]
+
+    @classmethod
+    def from_frames(cls, frames: Mapping[str, pd.DataFrame], start=None, end=None,
+                    as_of: Optional[str] = None) -> 'UniversePanel':
+        """
+        由各股票的标准 K 线构建面板，日期轴为交易日历上的全部交易日
+
+        Args:
+            frames: {股票代码: 以日期为索引的标准 K 线}
+            start: 开始日期，默认取所有 K 线中最早的日期
+            end: 结束日期，默认取所有 K 线中最晚的日期
+            as_of: 面板数据对应的交易日 'YYYYMMDD'
+
+        Returns:
+            面板（数组在内存中）
+        """
+        frames = {symbol: df for symbol, df in frames.items() if not df.empty}
+        if not frames:
+            raise ValueError("没有可用于构建面板的数据")
+        start = pd.Timestamp(start) if start is not None else min(df.index[0] for df in frames.values())
+        end = pd.Timestamp(end) if end is not None else max(df.index[-1] for df in frames.values())
+        dates = get_trading_calendar().trading_day_values(start, end)
+
+        symbols = sorted(frames)
+        shape = (len(dates), len(symbols))
+        fields = {col: np.full(shape, np.nan, dtype=PRICE_DTYPE) for col in PRICE_COLUMNS}
+        fields['volume'] = np.zeros(shape, dtype=VOLUME_DTYPE)
+
+        for j, symbol in enumerate(symbols):
+            df = frames[symbol]
+            days = df.index.values.astype('datetime64[D]')
+            pos = np.searchsorted(dates, days)
+            # 只保留落在日期轴上的 K 线
+            valid = (pos < len(dates)) & (dates[pos.clip(max=len(dates) - 1)] == days)
+            for col in BAR_COLUMNS:
+                if col in df.columns:
+                    fields[col][pos[valid], j] = df[col].to_numpy()[valid]
+
+        as_of = as_of or pd.Timestamp(dates[-1]).strftime('%Y%m%d')
+        return cls(dates, symbols, fields, as_of)
+
+    @classmethod
+    def build(cls, fetch: Callable[[str], pd.DataFrame], symbols: Iterable[str],
+              start=None, end=None) -> 'UniversePanel':
+        """
+        逐只获取 K 线并构建面板
+
+        Args:
+            fetch: 股票代码 -> 标准 K 线，如 lambda s: source.get_daily_data(s, start, end)
+            symbols: 股票代码列表
+            start: 开始日期
+            end: 结束日期
+
+        Returns:
+            面板
+        """
+        frames = {}
+        for symbol in symbols:
+            try:
+                frames[symbol] = fetch(symbol)
+            except Exception as e:
+                logger.warning(f"构建面板时获取 {symbol} 失败: {e}")
+        return cls.from_frames(frames, start, end)
+
+    def save(self, root: Path = None) -> Path:
+        """
+        保存面板：写入新的版本目录后原子切换 CURRENT 指针
+
+        已打开旧版本的进程继续读取旧文件，旧版本目录只保留
+        PANEL_CONFIG['keep_versions'] 个。
+
+        Args:
+            root: 面板目录，默认取 PANEL_CONFIG['path']
+
+        Returns:
+            版本目录
+        """
+        root = Path(root or PANEL_CONFIG['path'])
+        version = f"{self.as_of}_{datetime.now():%H%M%S%f}"
+        directory = root / version
+        directory.mkdir(parents=True, exist_ok=True)
+
+        np.save(directory / 'dates.npy', self.dates)
+        for field, values in self.fields.items():
+            np.save(directory / f"{field}.npy", np.ascontiguousarray(values))
+        meta = {'as_of': self.as_of, 'symbols': self.symbols, 'fields': list(self.fields),
+                'shape': list(self.shape)}
+        (directory / 'meta.json').write_text(json.dumps(meta, ensure_ascii=False), encoding='utf-8')
+
+        tmp_path = root / f"{CURRENT_FILE}.tmp"
+        tmp_path.write_text(version, encoding='utf-8')
+        os.replace(tmp_path, root / CURRENT_FILE)
+
+        # 清理旧版本
+        versions = sorted(p for p in root.iterdir() if p.is_dir() and p.name != version)
+        for old in versions[:max(len(versions) - PANEL_CONFIG['keep_versions'] + 1, 0)]:
+            shutil.rmtree(old, ignore_errors=True)
+
+        logger.info(f"面板已保存到 {directory}：{self.shape[0]} 个交易日 × {self.shape[1]} 只股票")
+        return directory
+
+    @classmethod
+    def load(cls, root: Path = None) -> Optional['UniversePanel']:
+        """
+        以只读内存映射方式打开当前版本的面板（不读取数组数据）
+
+        Args:
+            root: 面板目录，默认取 PANEL_CONFIG['path']
+
+        Returns:
+            面板，不存在时返回 None
+        """
+        root = Path(root or PANEL_CONFIG['path'])
+        current = root / CURRENT_FILE
+        if not current.exists():
+            return None
+        directory = root / current.read_text(encoding='utf-8').strip()
+        meta = json.loads((directory / 'meta.json').read_text(encoding='utf-8'))
+        dates = np.load(directory / 'dates.npy')
+        fields = {field: np.load(directory / f"{field}.npy", mmap_mode='r') for field in meta['fields']}
+        return cls(dates, meta['symbols'], fields, meta['as_of'])
+
+
+_panel: Optional[UniversePanel] = None
+_panel_lock = threading.Lock()
+
+
+def get_universe_panel(reload: bool = False) -> Optional[UniversePanel]:
+    """
+    获取进程内共享的面板（首次调用时以内存映射方式打开）
+
+    Args:
+        reload: 是否重新打开（面板更新后使用）
+
+    Returns:
+        面板，不存在时返回 None
+    """
+    global _panel
+    with _panel_lock:
+        if _panel is None or reload:
+            _panel = UniversePanel.load()
+        return _panel
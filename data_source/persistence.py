@@ -0,0 +1,133 @@
+"""
+DataFrame 文件读写（按扩展名选择 Feather / Parquet / CSV）
+
+Feather（Arrow IPC）保留列类型，读取时可内存映射；Parquet 压缩率高，
+读取时只解码需要的列；CSV 只作为导出给表格软件的格式。
+"""
+import os
+from pathlib import Path
+from typing import List, Optional, Union
+import pandas as pd
+from config import FILE_CONFIG
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 扩展名 -> 文件格式
+SUFFIX_FORMATS = {
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.parquet': 'parquet',
+    '.csv': 'csv',
+}
+
+# 文件格式 -> 默认扩展名
+FORMAT_SUFFIXES = {'feather': '.feather', 'parquet': '.parquet', 'csv': '.csv'}
+
+
+def resolve_path(path: Union[str, Path]) -> Path:
+    """
+    补全文件扩展名：没有扩展名时使用 FILE_CONFIG['format'] 对应的扩展名
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        带扩展名的路径
+    """
+    path = Path(path)
+    if path.suffix.lower() in SUFFIX_FORMATS:
+        return path
+    return path.with_name(path.name + FORMAT_SUFFIXES[FILE_CONFIG['format']])
+
+
+def file_format(path: Union[str, Path]) -> str:
+    """
+    根据扩展名判断文件格式
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        'feather'、'parquet' 或 'csv'
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in SUFFIX_FORMATS:
+        raise ValueError(f"不支持的文件格式: {suffix or path}，可选 {tuple(SUFFIX_FORMATS)}")
+    return SUFFIX_FORMATS[suffix]
+
+
+def save_frame(df: pd.DataFrame, path: Union[str, Path]) -> Path:
+    """
+    保存 DataFrame，二进制格式先写临时文件再原子替换
+
+    以日期为索引的 K 线连同 date 列一起保存，读取时恢复为索引。
+
+    Args:
+        df: 要保存的数据
+        path: 文件路径，格式由扩展名决定
+
+    Returns:
+        实际写入的路径
+    """
+    path = resolve_path(path)
+    fmt = file_format(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if fmt == 'csv':
+        df.to_csv(path, index=df.index.name == 'date', encoding='utf-8-sig')
+        return path
+
+    # Arrow 格式不保存 pandas 索引，日期索引转为普通列
+    table = df.reset_index() if df.index.name == 'date' else df.reset_index(drop=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if fmt == 'feather':
+        table.to_feather(tmp_path, compression=FILE_CONFIG['feather_compression'])
+    else:
+        table.to_parquet(tmp_path, index=False, compression=FILE_CONFIG['parquet_compression'])
+    os.replace(tmp_path, path)
+    return path
+
+
+def _file_columns(path: Path, fmt: str) -> List[str]:
+    """只读取文件头中的列名（不读取数据）"""
+    if fmt == 'feather':
+        import pyarrow as pa
+        with pa.memory_map(str(path)) as source:
+            return pa.ipc.open_file(source).schema.names
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns)
+
+
+def load_frame(path: Union[str, Path], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    读取 save_frame 保存的文件
+
+    Args:
+        path: 文件路径，格式由扩展名决定
+        columns: 只读取这些列（date 列总会读取并作为索引），默认读取全部
+
+    Returns:
+        数据 DataFrame，含 date 列时以日期为索引
+    """
+    path = resolve_path(path)
+    fmt = file_format(path)
+
+    if columns is not None:
+        available = _file_columns(path, fmt)
+        columns = [col for col in available if col == 'date' or col in columns]
+
+    if fmt == 'feather':
+        from pyarrow import feather
+        table = feather.read_table(path, columns=columns, memory_map=FILE_CONFIG['memory_map'])
+        df = table.to_pandas()
+    elif fmt == 'parquet':
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        df = pd.read_csv(path, usecols=columns, encoding='utf-8-sig')
+
+    if 'date' in df.columns:
+        df = df.set_index(pd.DatetimeIndex(pd.to_datetime(df.pop('date')), name='date'))
+    return df
@@ -0,0 +1,279 @@
+"""
+K 线数据质量检查与修复（下载后按交易日历向量化校验）
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Mapping, Optional
+from config import QUALITY_CONFIG
+from utils.trading_calendar import TradingCalendar, get_trading_calendar
+from .schema import PRICE_COLUMNS
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 报告中最多保留的缺失日期数
+MAX_MISSING_DATES = 10
+
+
+class DataQualityError(ValueError):
+    """数据质量检查未通过（修复策略为 'raise' 时抛出）"""
+
+
+class QualityReport:
+    """
+    单只股票一次数据检查的结果
+
+    只保存各类问题的计数和少量缺失日期，可以在全市场批量检查时汇总成表。
+    """
+
+    __slots__ = ('symbol', 'rows', 'duplicates', 'missing', 'missing_dates',
+                 'non_positive', 'high_low', 'suspended')
+
+    def __init__(self, symbol: str = '', rows: int = 0, duplicates: int = 0,
+                 missing: int = 0, missing_dates: list = None, non_positive: int = 0,
+                 high_low: int = 0, suspended: int = 0):
+        self.symbol = symbol
+        self.rows = rows
+        self.duplicates = duplicates
+        self.missing = missing
+        self.missing_dates = missing_dates or []
+        self.non_positive = non_positive
+        self.high_low = high_low
+        self.suspended = suspended
+
+    @property
+    def invalid(self) -> int:
+        """价格异常的行数（非正价格或最高价低于最低价）"""
+        return self.non_positive + self.high_low
+
+    @property
+    def ok(self) -> bool:
+        """是否没有发现任何问题"""
+        return not (self.duplicates or self.missing or self.invalid or self.suspended)
+
+    def to_dict(self) -> dict:
+        """
+        转换为字典
+
+        Returns:
+            各项计数（缺失日期为 'YYYYMMDD' 字符串列表）
+        """
+        return {
+            'symbol': self.symbol,
+            'rows': self.rows,
+            'duplicates': self.duplicates,
+            'missing': self.missing,
+            'missing_dates': [d.strftime('%Y%m%d') for d in self.missing_dates],
+            'non_positive': self.non_positive,
+            'high_low': self.high_low,
+            'suspended': self.suspended,
+        }
+
+    def __repr__(self) -> str:
+        problems = [f"{name}={getattr(self, name)}"
+                    for name in ('duplicates', 'missing', 'non_positive', 'high_low', 'suspended')
+                    if getattr(self, name)]
+        return f"QualityReport({self.symbol or '-'}, rows={self.rows}, {', '.join(problems) or 'ok'})"
+
+
+def _invalid_masks(bars: pd.DataFrame):
+    """
+    计算价格异常行和停牌行的布尔掩码（逐列取 numpy 数组，避免 DataFrame 索引开销）
+
+    Returns:
+        (非正价格或缺失, 最高价低于最低价, 零成交量) 三个布尔数组
+    """
+    arrays = {col: values.to_numpy() for col, values in bars.items()}
+    non_positive = np.zeros(len(bars), dtype=bool)
+    for col in PRICE_COLUMNS:
+        if col in arrays:
+            # NaN 与非正价格同样视为无效
+            non_positive |= ~(arrays[col] > 0)
+    if 'high' in arrays and 'low' in arrays:
+        high_low = (arrays['high'] < arrays['low']) & ~non_positive
+    else:
+        high_low = np.zeros(len(bars), dtype=bool)
+    if 'volume' in arrays:
+        suspended = arrays['volume'] == 0
+    else:
+        suspended = np.zeros(len(bars), dtype=bool)
+    return non_positive, high_low, suspended
+
+
+def _expected_days(dates: np.ndarray, start, end, calendar: TradingCalendar) -> np.ndarray:
+    """
+    K 线应覆盖的交易日：请求区间与 K 线首尾的交集（上市前和尚未发布的日期不算缺失）
+
+    Args:
+        dates: K 线日期（datetime64[D]，升序）
+        start: 请求开始日期
+        end: 请求结束日期
+        calendar: 交易日历
+
+    Returns:
+        交易日数组（datetime64[D]）
+    """
+    lo, hi = dates[0], dates[-1]
+    if start is not None:
+        lo = max(lo, np.datetime64(pd.Timestamp(start).date(), 'D'))
+    if end is not None:
+        hi = min(hi, np.datetime64(pd.Timestamp(end).date(), 'D'))
+    return calendar.trading_day_values(lo, hi)
+
+
+def _missing_days(dates: np.ndarray, expected: np.ndarray) -> np.ndarray:
+    """
+    找出 expected 中 dates 没有的交易日（两者均升序，二分查找）
+
+    Returns:
+        缺失交易日的布尔掩码（对应 expected）
+    """
+    if not len(dates):
+        return np.ones(len(expected), dtype=bool)
+    pos = np.searchsorted(dates, expected).clip(max=len(dates) - 1)
+    return dates[pos] != expected
+
+
+def validate_bars(bars: pd.DataFrame, start=None, end=None, symbol: str = '',
+                  duplicates: int = 0, calendar: TradingCalendar = None) -> QualityReport:
+    """
+    检查标准格式的日线 K 线
+
+    检查项：重复日期、相对交易日历缺失的交易日（通常为停牌）、非正价格、
+    最高价低于最低价、零成交量（停牌当日的占位 K 线）。
+
+    Args:
+        bars: 以日期为索引的标准 K 线
+        start: 请求开始日期，默认取第一根 K 线
+        end: 请求结束日期，默认取最后一根 K 线
+        symbol: 股票代码（仅用于报告）
+        duplicates: 转换为标准格式前已去掉的重复日期数
+        calendar: 交易日历，默认使用共享日历
+
+    Returns:
+        检查报告
+    """
+    report = QualityReport(symbol, len(bars), duplicates)
+    if bars.empty:
+        return report
+
+    index = bars.index
+    if index.has_duplicates:
+        report.duplicates += int(index.duplicated().sum())
+
+    non_positive, high_low, suspended = _invalid_masks(bars)
+    report.non_positive = int(non_positive.sum())
+    report.high_low = int(high_low.sum())
+    report.suspended = int(suspended.sum())
+
+    dates = index.values.astype('datetime64[D]')
+    expected = _expected_days(dates, start, end, calendar or get_trading_calendar())
+    missing = _missing_days(dates, expected)
+    report.missing = int(missing.sum())
+    if report.missing:
+        report.missing_dates = list(pd.DatetimeIndex(expected[missing][:MAX_MISSING_DATES]))
+    return report
+
+
+def repair_bars(bars: pd.DataFrame, report: QualityReport = None, policy: dict = None,
+                start=None, end=None, calendar: TradingCalendar = None) -> pd.DataFrame:
+    """
+    按修复策略处理 K 线
+
+    策略（默认取 QUALITY_CONFIG）：
+        invalid: 价格异常行 'drop' 删除 / 'keep' 保留 / 'raise' 抛出 DataQualityError
+        suspended: 零成交量停牌行 'drop' 删除 / 'keep' 保留
+        missing: 缺失交易日 'fill' 用前收盘价补齐（成交量为 0）/ 'keep' 不处理
+
+    Args:
+        bars: 以日期为索引的标准 K 线（已去重排序）
+        report: validate_bars 的检查报告，无问题时直接返回原数据
+        policy: 修复策略，缺省的项取 QUALITY_CONFIG
+        start: 请求开始日期（补齐缺失日时使用）
+        end: 请求结束日期（补齐缺失日时使用）
+        calendar: 交易日历，默认使用共享日历
+
+    Returns:
+        修复后的 K 线
+    """
+    if bars.empty or (report is not None and report.ok):
+        return bars
+    policy = {**QUALITY_CONFIG, **(policy or {})}
+
+    non_positive, high_low, suspended = _invalid_masks(bars)
+    invalid = non_positive | high_low
+    if invalid.any():
+        if policy['invalid'] == 'raise':
+            raise DataQualityError(f"{report or 'K 线'} 含 {int(invalid.sum())} 行价格异常数据")
+        if policy['invalid'] == 'drop':
+            bars = bars[~invalid]
+            suspended = suspended[~invalid]
+    if policy['suspended'] == 'drop' and suspended.any():
+        bars = bars[~suspended]
+
+    if policy['missing'] == 'fill' and not bars.empty:
+        dates = bars.index.values.astype('datetime64[D]')
+        expected = _expected_days(dates, start, end, calendar or get_trading_calendar())
+        missing = _missing_days(dates, expected)
+        if missing.any():
+            # 停牌日价格保持前收盘价不变，成交量为 0
+            filled = bars.reindex(bars.index.union(pd.DatetimeIndex(expected[missing])))
+            close = filled['close'].ffill()
+            for col in PRICE_COLUMNS:
+                if col in filled.columns:
+                    filled[col] = filled[col].fillna(close).astype(bars[col].dtype)
+            for col in filled.columns.difference(PRICE_COLUMNS):
+                filled[col] = filled[col].fillna(0).astype(bars[col].dtype)
+            filled.index.name = bars.index.name
+            bars = filled
+    return bars
+
+
+def validate_batch(frames: Mapping[str, pd.DataFrame], start=None, end=None,
+                   calendar: TradingCalendar = None) -> pd.DataFrame:
+    """
+    批量检查多只股票，返回紧凑的汇总表
+
+    Args:
+        frames: {股票代码: 标准 K 线}
+        start: 请求开始日期
+        end: 请求结束日期
+        calendar: 交易日历，默认使用共享日历
+
+    Returns:
+        以股票代码为索引、每类问题一列计数的 DataFrame（只含有问题的股票）
+    """
+    calendar = calendar or get_trading_calendar()
+    rows: Dict[str, dict] = {}
+    for symbol, bars in frames.items():
+        report = validate_bars(bars, start, end, symbol, calendar=calendar)
+        if not report.ok:
+            rows[symbol] = report.to_dict()
+    columns = ['rows', 'duplicates', 'missing', 'non_positive', 'high_low', 'suspended',
+               'missing_dates']
+    return pd.DataFrame.from_dict(rows, orient='index', columns=columns).rename_axis('symbol')
+
+
+def check_bars(bars: pd.DataFrame, start=None, end=None, symbol: str = '',
+               duplicates: int = 0, policy: Optional[dict] = None) -> pd.DataFrame:
+    """
+    下载入口使用的检查 + 修复：发现问题时记录日志并按策略修复
+
+    Args:
+        bars: 以日期为索引的标准 K 线
+        start: 请求开始日期
+        end: 请求结束日期
+        symbol: 股票代码
+        duplicates: 转换为标准格式前已去掉的重复日期数
+        policy: 修复策略，默认取 QUALITY_CONFIG
+
+    Returns:
+        修复后的 K 线
+    """
+    if not QUALITY_CONFIG['enabled'] or bars.empty:
+        return bars
+    report = validate_bars(bars, start, end, symbol, duplicates)
+    if report.ok:
+        return bars
+    logger.warning(f"{symbol} 数据质量检查: {report}")
+    return repair_bars(bars, report, policy, start, end)
@@ -0,0 +1,200 @@
+"""
+自适应限流器（令牌桶 + AIMD 并发控制）
+"""
+import random
+import threading
+import time
+from typing import Any, Callable
+from config import RATE_LIMIT_CONFIG
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitTimeout(Exception):
+    """等待令牌或并发名额超时"""
+
+
+class AdaptiveRateLimiter:
+    """
+    自适应限流器
+
+    - 令牌桶限制每秒请求数，允许一定突发
+    - 并发上限和请求速率按 AIMD 调整：一轮（等于当前并发上限次数）请求都
+      成功且延迟低于目标值时加性增加；出错或延迟超标时减半
+    - 失败的请求按指数退避重试
+    """
+
+    def __init__(self, name: str, config: dict = None):
+        """
+        初始化限流器
+
+        Args:
+            name: 名称，用于日志
+            config: 限流参数，默认取 RATE_LIMIT_CONFIG
+        """
+        self.name = name
+        self.config = {**RATE_LIMIT_CONFIG, **(config or {})}
+
+        self._rate = float(self.config['rate'])
+        self._limit = int(self.config['concurrency'])
+        self._tokens = float(self.config['burst'])
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._in_flight = 0
+        self._healthy_streak = 0
+        self._cond = threading.Condition()
+        self._stats = {'calls': 0, 'successes': 0, 'errors': 0, 'slow': 0,
+                       'retries': 0, 'throttled': 0, 'rejections': 0}
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._tokens = min(float(self.config['burst']), self._tokens + elapsed * self._rate)
+        self._last_refill = now
+
+    def acquire(self, timeout: float = None):
+        """
+        获取一个令牌和一个并发名额，必要时等待
+
+        Args:
+            timeout: 最长等待秒数，默认取配置 acquire_timeout
+
+        Raises:
+            RateLimitTimeout: 超时仍未获取到
+        """
+        timeout = self.config['acquire_timeout'] if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._in_flight < self._limit and self._tokens >= 1:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    if waited:
+                        self._stats['throttled'] += 1
+                    return
+
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._stats['rejections'] += 1
+                    raise RateLimitTimeout(f"{self.name} 限流等待超时 ({timeout}s)")
+
+                waited = True
+                wait = remaining
+                if self._tokens < 1:
+                    wait = min(wait, (1 - self._tokens) / self._rate)
+                self._cond.wait(wait)
+
+    def release(self, latency: float, ok: bool):
+        """
+        归还并发名额，并根据本次请求结果调整速率和并发上限
+
+        Args:
+            latency: 请求耗时（秒）
+            ok: 请求是否成功
+        """
+        with self._cond:
+            self._in_flight -= 1
+            slow = latency > self.config['latency_target']
+            if ok:
+                self._stats['successes'] += 1
+            else:
+                self._stats['errors'] += 1
+            if slow:
+                self._stats['slow'] += 1
+
+            if ok and not slow:
+                # 加性增加：连续一轮健康请求后并发上限 +1，速率增加一个步长
+                self._healthy_streak += 1
+                if self._healthy_streak >= self._limit:
+                    self._healthy_streak = 0
+                    self._limit = min(self.config['max_concurrency'], self._limit + 1)
+                    self._rate = min(self.config['max_rate'], self._rate + self.config['rate_step'])
+            else:
+                # 乘性减少：同一冷却期内只减半一次，避免并发失败时连续减半
+                self._healthy_streak = 0
+                now = time.monotonic()
+                if now - self._last_decrease >= self.config['decrease_cooldown']:
+                    self._last_decrease = now
+                    self._limit = max(self.config['min_concurrency'], self._limit // 2)
+                    self._rate = max(self.config['min_rate'], self._rate / 2)
+                    logger.info(f"{self.name} 限流收紧: 并发上限 {self._limit}, 速率 {self._rate:.2f}/s")
+
+            self._cond.notify_all()
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        在限流下执行请求，失败时指数退避重试
+
+        Args:
+            fn: 请求函数
+            args: 传给 fn 的位置参数
+            kwargs: 传给 fn 的关键字参数
+
+        Returns:
+            fn 的返回值
+        """
+        return self._call(fn, self.config['retries'], args, kwargs)
+
+    def call_once(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        在限流下执行一次请求，失败时直接抛出异常不重试
+
+        用于有备用接口的请求：失败后立即切换接口，比在同一接口上退避重试更快。
+
+        Args:
+            fn: 请求函数
+            args: 传给 fn 的位置参数
+            kwargs: 传给 fn 的关键字参数
+
+        Returns:
+            fn 的返回值
+        """
+        return self._call(fn, 0, args, kwargs)
+
+    def _call(self, fn: Callable[..., Any], retries: int, args: tuple, kwargs: dict) -> Any:
+        """执行请求，失败时最多指数退避重试 retries 次"""
+        for attempt in range(retries + 1):
+            self.acquire()
+            with self._cond:
+                self._stats['calls'] += 1
+            start = time.monotonic()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self.release(time.monotonic() - start, ok=False)
+                if attempt >= retries:
+                    raise
+                backoff = self.config['backoff'] * (2 ** attempt) * (1 + random.random())
+                with self._cond:
+                    self._stats['retries'] += 1
+                logger.warning(f"{self.name} 请求失败，{backoff:.1f}s 后重试 ({attempt + 1}/{retries}): {e}")
+                time.sleep(backoff)
+            else:
+                self.release(time.monotonic() - start, ok=True)
+                return result
+
+    def stats(self) -> dict:
+        """
+        获取限流器当前状态，用于监控
+
+        Returns:
+            包含当前速率、并发上限、进行中请求数、可用令牌和各项计数的字典
+        """
+        with self._cond:
+            self._refill(time.monotonic())
+            return {
+                'name': self.name,
+                'rate': round(self._rate, 3),
+                'concurrency_limit': self._limit,
+                'in_flight': self._in_flight,
+                'tokens': round(self._tokens, 3),
+                **self._stats,
+            }
+
+
+# AKShare 接口共用的限流器
+AKSHARE_LIMITER = AdaptiveRateLimiter('akshare')
@@ -0,0 +1,274 @@
+"""
+离线回放数据源（从本地样本文件读取，可注入延迟和错误，用于压测和离线测试）
+"""
+import json
+import math
+import random
+import threading
+import time
+import pandas as pd
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+from config import REPLAY_CONFIG
+from .bar_store import BarStore
+from .spot_cache import SpotSnapshot
+from .schema import normalize_bars
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayError(ConnectionError):
+    """回放数据源注入的模拟网络错误"""
+
+
+class ReplayDataSource:
+    """
+    离线回放数据源
+
+    接口与 AKShareDataSource 一致，数据来自 record() 录制的样本文件：
+
+        <path>/daily/<代码>_<复权>.parquet    日线
+        <path>/intraday/<代码>.parquet        分时
+        <path>/spot.parquet                   全市场行情快照（AKShare 原始列名）
+        <path>/info.json                      {代码: 股票信息}
+
+    每次请求前按配置模拟网络延迟（对数正态分布）和随机错误，
+    各方法的调用次数、注入错误次数和累计延迟可通过 stats() 读取。
+    """
+
+    def __init__(self, path: Path = None, latency: float = None, latency_sigma: float = None,
+                 error_rate: float = None, seed: int = None):
+        """
+        初始化回放数据源
+
+        Args:
+            path: 样本目录，默认取 REPLAY_CONFIG['path']
+            latency: 模拟延迟的中位数（秒），0 表示不延迟
+            latency_sigma: 延迟对数正态分布的 sigma，0 表示固定延迟
+            error_rate: 每次请求失败的概率（0~1）
+            seed: 随机种子，固定后延迟和错误序列可复现
+        """
+        self.path = Path(path or REPLAY_CONFIG['path'])
+        self.latency = REPLAY_CONFIG['latency'] if latency is None else latency
+        self.latency_sigma = REPLAY_CONFIG['latency_sigma'] if latency_sigma is None else latency_sigma
+        self.error_rate = REPLAY_CONFIG['error_rate'] if error_rate is None else error_rate
+        self._random = random.Random(REPLAY_CONFIG['seed'] if seed is None else seed)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, dict] = {}
+
+        self.daily_store = BarStore(self.path / 'daily')
+        self.intraday_store = BarStore(self.path / 'intraday')
+        self.spot_store = BarStore(self.path)
+        self._snapshot = None
+        self._info = None
+        logger.info(f"回放数据源初始化成功（样本目录: {self.path}）")
+
+    def _simulate(self, method: str):
+        """模拟一次网络请求：按配置等待并随机抛出错误"""
+        with self._lock:
+            delay = 0.0
+            if self.latency > 0:
+                delay = self.latency * math.exp(self._random.gauss(0, self.latency_sigma))
+            failed = self._random.random() < self.error_rate
+            stats = self._stats.setdefault(method, {'calls': 0, 'errors': 0, 'latency': 0.0})
+            stats['calls'] += 1
+            stats['latency'] += delay
+            if failed:
+                stats['errors'] += 1
+
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise ReplayError(f"模拟网络错误: {method}")
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        获取各方法的调用统计
+
+        Returns:
+            {方法名: {'calls': 调用次数, 'errors': 注入错误次数, 'latency': 累计模拟延迟秒数}}
+        """
+        with self._lock:
+            return {method: dict(stats) for method, stats in self._stats.items()}
+
+    def _daily_key(self, symbol: str, adjust: str) -> str:
+        return f"{symbol.upper()}_{adjust or 'none'}"
+
+    def _load_snapshot(self) -> SpotSnapshot:
+        if self._snapshot is None:
+            self._snapshot = SpotSnapshot(self.spot_store.read('spot'), time.monotonic())
+        return self._snapshot
+
+    def _load_info(self) -> Dict[str, dict]:
+        if self._info is None:
+            info_path = self.path / 'info.json'
+            self._info = json.loads(info_path.read_text(encoding='utf-8')) if info_path.exists() else {}
+        return self._info
+
+    @staticmethod
+    def _code(symbol: str) -> str:
+        return symbol.split('.')[0]
+
+    def get_daily_data(self, symbol: str, start_date: str = None,
+                       end_date: str = None, adjust: str = 'qfq') -> pd.DataFrame:
+        """
+        获取日线数据
+
+        Args:
+            symbol: 股票代码，如 '000001.SZ'
+            start_date: 开始日期，格式 'YYYY-MM-DD' 或 'YYYYMMDD'
+            end_date: 结束日期，格式 'YYYY-MM-DD' 或 'YYYYMMDD'
+            adjust: 复权类型 'qfq'-前复权, 'hfq'-后复权, ''-不复权
+
+        Returns:
+            日线数据 DataFrame，默认返回样本中最后一年的数据
+        """
+        try:
+            self._simulate('get_daily_data')
+            df = normalize_bars(self.daily_store.read(self._daily_key(symbol, adjust)))
+            if df.empty:
+                logger.warning(f"未找到股票 {symbol} 的日线样本")
+                return df
+
+            end = pd.Timestamp(end_date) if end_date else df.index[-1]
+            start = pd.Timestamp(start_date) if start_date else end - timedelta(days=365)
+            return df[(df.index >= start) & (df.index <= end)]
+
+        except Exception as e:
+            logger.error(f"获取 {symbol} 日线数据失败: {e}")
+            raise
+
+    def get_intraday_data(self, symbol: str, date: str = None) -> pd.DataFrame:
+        """
+        获取分时数据
+
+        Args:
+            symbol: 股票代码，如 '000001.SZ'
+            date: 交易日，格式 'YYYY-MM-DD' 或 'YYYYMMDD'，默认返回全部样本
+
+        Returns:
+            分时数据 DataFrame
+        """
+        try:
+            self._simulate('get_intraday_data')
+            df = normalize_bars(self.intraday_store.read(symbol.upper()))
+            if date and not df.empty:
+                df = df[df.index.normalize() == pd.Timestamp(date)]
+            return df
+        except Exception as e:
+            logger.error(f"获取 {symbol} 分时数据失败: {e}")
+            return pd.DataFrame()
+
+    def get_realtime_data(self, symbol: str) -> pd.DataFrame:
+        """
+        获取实时行情数据
+
+        Args:
+            symbol: 股票代码，如 '000001.SZ'
+
+        Returns:
+            实时数据 DataFrame（英文列名）
+        """
+        try:
+            self._simulate('get_realtime_data')
+            stock_df = self._load_snapshot().lookup(self._code(symbol))
+            if stock_df.empty:
+                logger.warning(f"未找到股票 {symbol} 的实时数据")
+            return stock_df
+        except Exception as e:
+            logger.error(f"获取 {symbol} 实时数据失败: {e}")
+            return pd.DataFrame()
+
+    def get_realtime_batch(self, symbols: List[str]) -> pd.DataFrame:
+        """
+        批量获取实时行情
+
+        Args:
+            symbols: 股票代码列表，如 ['000001.SZ', '600519.SH']
+
+        Returns:
+            以传入代码为索引的实时数据 DataFrame，未找到的股票不包含在结果中
+        """
+        try:
+            self._simulate('get_realtime_batch')
+            snapshot = self._load_snapshot()
+            found = [s for s in symbols if snapshot.position(self._code(s)) is not None]
+            quotes = snapshot.quotes.iloc[[snapshot.position(self._code(s)) for s in found]].copy()
+            quotes.index = pd.Index(found, name='code')
+            return quotes
+        except Exception as e:
+            logger.error(f"批量获取实时数据失败: {e}")
+            return pd.DataFrame()
+
+    def get_stock_info(self, symbol: str) -> dict:
+        """
+        获取股票信息
+
+        Args:
+            symbol: 股票代码
+
+        Returns:
+            股票信息字典
+        """
+        try:
+            self._simulate('get_stock_info')
+            return self._load_info().get(symbol.upper(), {'name': symbol, 'symbol': symbol})
+        except Exception as e:
+            logger.error(f"获取 {symbol} 信息失败: {e}")
+            return {'name': symbol, 'symbol': symbol}
+
+    def get_stock_list(self) -> pd.DataFrame:
+        """
+        获取 A 股所有股票列表
+
+        Returns:
+            股票列表 DataFrame（AKShare 原始列名）
+        """
+        try:
+            self._simulate('get_stock_list')
+            return self._load_snapshot().df.copy()
+        except Exception as e:
+            logger.error(f"获取 A 股股票列表失败: {e}")
+            return pd.DataFrame()
+
+    def record(self, source, symbols: List[str], start_date: str = None,
+               end_date: str = None, adjust: str = 'qfq', intraday: bool = True):
+        """
+        从在线数据源录制样本文件
+
+        Args:
+            source: 在线数据源，如 AKShareDataSource()
+            symbols: 要录制的股票代码列表
+            start_date: 日线开始日期
+            end_date: 日线结束日期
+            adjust: 复权类型
+            intraday: 是否同时录制分时数据
+        """
+        recorded_at = datetime.now().isoformat(timespec='seconds')
+        info = dict(self._load_info())
+
+        for symbol in symbols:
+            try:
+                daily = source.get_daily_data(symbol, start_date, end_date, adjust=adjust)
+                if not daily.empty:
+                    self.daily_store.write(self._daily_key(symbol, adjust), daily,
+                                           {'recorded_at': recorded_at})
+                if intraday:
+                    minute = source.get_intraday_data(symbol)
+                    if not minute.empty:
+                        self.intraday_store.write(symbol.upper(), minute, {'recorded_at': recorded_at})
+                info[symbol.upper()] = source.get_stock_info(symbol)
+                logger.info(f"已录制 {symbol} 的样本数据")
+            except Exception as e:
+                logger.warning(f"录制 {symbol} 失败: {e}")
+
+        spot = source.get_stock_list()
+        if not spot.empty:
+            self.spot_store.write('spot', spot, {'recorded_at': recorded_at})
+
+        (self.path / 'info.json').write_text(
+            json.dumps(info, ensure_ascii=False, default=str), encoding='utf-8')
+        self._snapshot = None
+        self._info = None
@@ -0,0 +1,221 @@
+"""
+多周期 K 线合成（由 1 分钟线合成 5/15/30/60 分钟线，由日线合成周线/月线）
+"""
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, Hashable
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 分钟周期 -> 每根 K 线包含的分钟数
+MINUTE_TIMEFRAMES = {'5m': 5, '15m': 15, '30m': 30, '60m': 60}
+
+# 日线以上周期 -> pandas Period 频率
+PERIOD_TIMEFRAMES = {'W': 'W-FRI', 'M': 'M'}
+
+TIMEFRAMES = tuple(MINUTE_TIMEFRAMES) + tuple(PERIOD_TIMEFRAMES)
+
+# 上午、下午各 120 分钟的连续竞价时段
+MORNING_OPEN = 9 * 60 + 30
+AFTERNOON_OPEN = 13 * 60
+SESSION_MINUTES = 120
+
+AGGREGATIONS = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum',
+    'amount': 'sum',
+}
+
+
+def minute_bucket_labels(dates: pd.DatetimeIndex, minutes: int) -> np.ndarray:
+    """
+    计算每根 1 分钟线所属的 N 分钟 K 线的结束时间（向量化）
+
+    分钟线按交易时段内的序号分组：上午 09:31~11:30 为第 1~120 分钟，
+    下午 13:01~15:00 为第 121~240 分钟，N 能整除 120 时任何一根 K 线都不会
+    跨越午休。09:30 的开盘集合竞价归入第一根 K 线。
+
+    Args:
+        dates: 1 分钟线的时间（以结束时间标记）
+        minutes: 周期分钟数
+
+    Returns:
+        每根分钟线对应的 K 线结束时间数组
+    """
+    if SESSION_MINUTES % minutes:
+        raise ValueError(f"周期分钟数须能整除 {SESSION_MINUTES}: {minutes}")
+
+    day = dates.normalize()
+    minute_of_day = (dates - day).total_seconds().to_numpy() // 60
+    afternoon = minute_of_day >= AFTERNOON_OPEN
+    session_minute = np.where(afternoon, minute_of_day - AFTERNOON_OPEN + SESSION_MINUTES,
+                              minute_of_day - MORNING_OPEN)
+    session_minute = session_minute.clip(1, 2 * SESSION_MINUTES)
+
+    # 向上取整到周期末尾，再换算回时钟时间
+    end_minute = np.ceil(session_minute / minutes) * minutes
+    clock = np.where(end_minute > SESSION_MINUTES, end_minute - SESSION_MINUTES + AFTERNOON_OPEN,
+                     end_minute + MORNING_OPEN)
+    return (day + pd.to_timedelta(clock, unit='min')).to_numpy()
+
+
+def period_bucket_labels(dates: pd.DatetimeIndex, timeframe: str) -> np.ndarray:
+    """
+    计算每根日线所属的周线/月线分组
+
+    Args:
+        dates: 日线日期
+        timeframe: 'W' 或 'M'
+
+    Returns:
+        每根日线对应的周期起始日期数组
+    """
+    return dates.to_period(PERIOD_TIMEFRAMES[timeframe]).start_time.to_numpy()
+
+
+def bucket_labels(df: pd.DataFrame, timeframe: str) -> np.ndarray:
+    """
+    计算每根基础 K 线所属的目标周期分组
+
+    Args:
+        df: 基础 K 线（分钟周期为 1 分钟线，W/M 为日线）
+        timeframe: 目标周期，见 TIMEFRAMES
+
+    Returns:
+        分组标签数组，随时间单调不减
+    """
+    if timeframe in MINUTE_TIMEFRAMES:
+        return minute_bucket_labels(df.index, MINUTE_TIMEFRAMES[timeframe])
+    if timeframe in PERIOD_TIMEFRAMES:
+        return period_bucket_labels(df.index, timeframe)
+    raise ValueError(f"不支持的周期: {timeframe}，可选 {TIMEFRAMES}")
+
+
+def aggregate(df: pd.DataFrame, labels: np.ndarray, timeframe: str) -> pd.DataFrame:
+    """
+    按分组合成 OHLCV
+
+    Args:
+        df: 按时间排序的基础 K 线
+        labels: 每根基础 K 线的分组标签
+        timeframe: 目标周期
+
+    Returns:
+        合成后的标准 K 线。分钟周期以 K 线结束时间为索引，周线/月线以周期内
+        最后一个交易日为索引
+    """
+    agg = {col: how for col, how in AGGREGATIONS.items() if col in df.columns}
+    grouped = df.groupby(labels, sort=True).agg(agg)
+
+    if timeframe in MINUTE_TIMEFRAMES:
+        grouped.index = pd.DatetimeIndex(grouped.index, name='date')
+    else:
+        last_dates = df.index.to_series().groupby(labels, sort=True).last()
+        grouped.index = pd.DatetimeIndex(last_dates.to_numpy(), name='date')
+    return grouped
+
+
+def resample(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    将基础 K 线合成为目标周期
+
+    Args:
+        df: 基础 K 线（分钟周期传 1 分钟线，W/M 传日线）
+        timeframe: 目标周期 '5m'/'15m'/'30m'/'60m'/'W'/'M'
+
+    Returns:
+        合成后的 K 线
+    """
+    if df.empty:
+        return df
+    df = df.sort_index()
+    return aggregate(df, bucket_labels(df, timeframe), timeframe)
+
+
+class BarResampler:
+    """
+    带缓存的多周期合成器
+
+    按 (股票, 周期) 缓存合成结果。基础 K 线新增时只重新合成最后一根
+    （可能尚未走完的）目标 K 线及其之后的部分，之前的结果直接复用；
+    基础 K 线的起点或第一根价格变化（如复权价格改变）时全部重新合成。
+    """
+
+    def __init__(self, source=None):
+        """
+        初始化合成器
+
+        Args:
+            source: 提供 get_daily_data / get_intraday_data 的数据源，
+                默认使用 AKShareDataSource
+        """
+        if source is None:
+            from .akshare_source import AKShareDataSource
+            source = AKShareDataSource()
+        self.source = source
+        self._cache: Dict[Hashable, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, timeframe: str, start_date: str = None,
+            end_date: str = None) -> pd.DataFrame:
+        """
+        获取目标周期的 K 线
+
+        Args:
+            symbol: 股票代码
+            timeframe: 目标周期 '5m'/'15m'/'30m'/'60m'/'W'/'M'
+            start_date: 周线/月线的日线开始日期
+            end_date: 周线/月线的日线结束日期
+
+        Returns:
+            合成后的 K 线
+        """
+        if timeframe in MINUTE_TIMEFRAMES:
+            base = self.source.get_intraday_data(symbol)
+        elif timeframe in PERIOD_TIMEFRAMES:
+            base = self.source.get_daily_data(symbol, start_date, end_date)
+        else:
+            raise ValueError(f"不支持的周期: {timeframe}，可选 {TIMEFRAMES}")
+        return self.update((symbol, timeframe), base, timeframe)
+
+    def update(self, key: Hashable, base: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        """
+        用最新的基础 K 线更新缓存并返回合成结果
+
+        Args:
+            key: 缓存键，如 (股票代码, 周期)
+            base: 按时间排序的基础 K 线
+            timeframe: 目标周期
+
+        Returns:
+            合成后的 K 线
+        """
+        if base.empty:
+            return pd.DataFrame()
+
+        labels = bucket_labels(base, timeframe)
+        with self._lock:
+            entry = self._cache.get(key)
+
+        first = (base.index[0], float(base['close'].iloc[0]))
+        if entry is not None and entry['first'] == first and len(entry['result']):
+            # 只重新合成最后一根缓存 K 线所在分组及之后的部分
+            tail = labels >= entry['last_label']
+            result = pd.concat([entry['result'].iloc[:-1],
+                                aggregate(base[tail], labels[tail], timeframe)])
+        else:
+            result = aggregate(base, labels, timeframe)
+
+        with self._lock:
+            self._cache[key] = {'first': first, 'last_label': labels[-1], 'result': result}
+        return result.copy()
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,93 @@
+"""
+K 线标准格式（所有数据源在下载后统一转换一次）
+"""
+import numpy as np
+import pandas as pd
+
+# 价格列（float32）
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+
+# 标准 K 线列：价格 + 成交量（int64）
+BAR_COLUMNS = PRICE_COLUMNS + ['volume']
+
+PRICE_DTYPE = np.float32
+VOLUME_DTYPE = np.int64
+
+
+def empty_bars() -> pd.DataFrame:
+    """
+    空的标准 K 线
+
+    Returns:
+        只有列和索引、没有数据的 DataFrame
+    """
+    df = pd.DataFrame({col: pd.Series(dtype=PRICE_DTYPE) for col in PRICE_COLUMNS})
+    df['volume'] = pd.Series(dtype=VOLUME_DTYPE)
+    df.index = pd.DatetimeIndex([], name='date')
+    return df
+
+
+def normalize_bars(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    转换为标准 K 线格式
+
+    - 以 datetime64 的 'date' 为索引（去掉时区，升序，同一时间只保留最后一条）
+    - 价格列为 float32，成交量为 int64
+    - 只保留 BAR_COLUMNS 中存在的列，不再附带字符串日期列
+
+    Args:
+        df: 含 date 列（或以日期为索引）和 OHLCV 列的 DataFrame
+
+    Returns:
+        标准格式的 DataFrame
+    """
+    if df.empty:
+        return empty_bars()
+
+    if 'date' in df.columns:
+        df = df.set_index('date')
+    index = pd.DatetimeIndex(pd.to_datetime(df.index), name='date')
+    if index.tz is not None:
+        index = index.tz_localize(None)
+
+    columns = {}
+    for col in PRICE_COLUMNS:
+        if col in df.columns:
+            columns[col] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=PRICE_DTYPE)
+    if 'volume' in df.columns:
+        volume = pd.to_numeric(df['volume'], errors='coerce').fillna(0)
+        columns['volume'] = volume.to_numpy().astype(VOLUME_DTYPE)
+
+    bars = pd.DataFrame(columns, index=index)
+    if not bars.index.is_monotonic_increasing or bars.index.has_duplicates:
+        bars = bars[~bars.index.duplicated(keep='last')].sort_index()
+    return bars
+
+
+def add_trade_date(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    附加 'YYYYMMDD' 格式的 trade_date 字符串列（用于导出 CSV 等需要字符串日期的场合）
+
+    Args:
+        df: 标准格式的 K 线
+
+    Returns:
+        附加了 trade_date 列的副本
+    """
+    return df.assign(trade_date=df.index.strftime('%Y%m%d'))
+
+
+def format_date(value, fmt: str = '%Y%m%d') -> str:
+    """
+    将 K 线的索引值格式化为日期字符串
+
+    Args:
+        value: 索引值（Timestamp）或已有的日期字符串
+        fmt: 日期格式
+
+    Returns:
+        日期字符串
+    """
+    if isinstance(value, pd.Timestamp):
+        return value.strftime(fmt)
+    return str(value)
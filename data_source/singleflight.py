@@ -0,0 +1,76 @@
+"""
+并发请求合并（single-flight）
+"""
+import threading
+import pandas as pd
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    相同请求的并发合并
+
+    同一 key 的请求正在进行时，后来的调用者不再发起新请求，而是等待第一个
+    调用者的结果（或异常）。DataFrame 结果会复制一份给每个等待者，
+    避免调用方之间互相修改同一个对象。
+    """
+
+    def __init__(self):
+        """初始化请求合并器"""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._stats = {'calls': 0, 'shared': 0}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        执行请求，相同 key 的并发请求只执行一次
+
+        Args:
+            key: 请求标识，参数相同的请求应生成相同的 key
+            fn: 实际执行请求的函数
+            args: 传给 fn 的位置参数
+            kwargs: 传给 fn 的关键字参数
+
+        Returns:
+            fn 的返回值
+        """
+        with self._lock:
+            self._stats['calls'] += 1
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self._stats['shared'] += 1
+
+        if not leader:
+            result = future.result()
+            return result.copy() if isinstance(result, (pd.DataFrame, pd.Series)) else result
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self) -> dict:
+        """
+        获取统计信息
+
+        Returns:
+            {'calls': 总调用次数, 'shared': 合并到已有请求的次数, 'in_flight': 正在进行的请求数}
+        """
+        with self._lock:
+            return {**self._stats, 'in_flight': len(self._calls)}
+
+
+# 进程内共享的请求合并器，所有数据源共用
+SINGLE_FLIGHT = SingleFlight()
@@ -0,0 +1,162 @@
+"""
+全市场实时行情快照缓存（进程内共享）
+"""
+import threading
+import time
+import pandas as pd
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from config import REALTIME_CONFIG
+from utils.trading_calendar import get_trading_calendar
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 实时行情中文列名到英文列名的映射
+SPOT_COLUMN_MAP = {
+    '代码': 'symbol',
+    '名称': 'name',
+    '最新价': 'price',
+    '涨跌幅': 'change_pct',
+    '涨跌额': 'change_amount',
+    '成交量': 'volume',
+    '成交额': 'amount',
+    '振幅': 'amplitude',
+    '最高': 'high',
+    '最低': 'low',
+    '今开': 'open',
+    '昨收': 'prev_close',
+    '换手率': 'turnover',
+    '市盈率-动态': 'pe_ttm',
+    '市盈率': 'pe_ttm',
+}
+
+
+def is_trading_hours(now: datetime = None) -> bool:
+    """
+    判断当前是否处于 A 股交易时段（含集合竞价）
+
+    Args:
+        now: 当前时间，默认取系统时间
+
+    Returns:
+        是否处于交易时段
+    """
+    return get_trading_calendar().is_trading_time(now)
+
+
+class SpotSnapshot:
+    """
+    一次全市场行情下载的结果，附带按代码的哈希索引
+
+    列名转换只在每份快照上做一次，所有按代码的查询共用转换后的结果。
+    """
+
+    def __init__(self, df: pd.DataFrame, fetched_at: float):
+        """
+        初始化快照
+
+        Args:
+            df: stock_zh_a_spot_em 返回的原始数据
+            fetched_at: 下载完成时间（time.monotonic()）
+        """
+        self.df = df.reset_index(drop=True)
+        self.fetched_at = fetched_at
+
+        code_col = '代码' if '代码' in self.df.columns else 'code'
+        if code_col in self.df.columns:
+            codes = self.df[code_col].astype(str)
+            self.index: Dict[str, int] = dict(zip(codes, range(len(codes))))
+        else:
+            self.index = {}
+        self._quotes: Optional[pd.DataFrame] = None
+
+    @property
+    def quotes(self) -> pd.DataFrame:
+        """转换为英文列名后的行情数据（首次访问时转换并缓存）"""
+        if self._quotes is None:
+            quotes = self.df.rename(columns=SPOT_COLUMN_MAP)
+            self._quotes = quotes.loc[:, ~quotes.columns.duplicated()]
+        return self._quotes
+
+    def position(self, *codes: str) -> Optional[int]:
+        """
+        按代码查找行号，依次尝试给定的多个代码写法
+
+        Args:
+            codes: 候选代码，如 ('000001', 'sz000001')
+
+        Returns:
+            行号，未命中返回 None
+        """
+        for code in codes:
+            pos = self.index.get(code)
+            if pos is not None:
+                return pos
+        return None
+
+    def lookup(self, *codes: str) -> pd.DataFrame:
+        """
+        按代码查找行情行（英文列名），依次尝试给定的多个代码写法
+
+        Args:
+            codes: 候选代码，如 ('000001', 'sz000001')
+
+        Returns:
+            命中的一行 DataFrame，未命中返回空 DataFrame
+        """
+        pos = self.position(*codes)
+        if pos is None:
+            return pd.DataFrame()
+        return self.quotes.iloc[[pos]]
+
+
+class SpotSnapshotCache:
+    """
+    全市场行情快照缓存
+
+    同一进程内所有数据源实例（以及所有 Streamlit 会话）共享同一份快照，
+    过期前不会重复下载；过期后只有一个线程负责重新下载，其余线程等待结果。
+    """
+
+    def __init__(self, fetch: Callable[[], pd.DataFrame], ttl: float = None,
+                 ttl_closed: float = None):
+        """
+        初始化快照缓存
+
+        Args:
+            fetch: 下载全市场行情的函数
+            ttl: 交易时段内的缓存秒数
+            ttl_closed: 非交易时段的缓存秒数
+        """
+        self.fetch = fetch
+        self.ttl = REALTIME_CONFIG['spot_ttl'] if ttl is None else ttl
+        self.ttl_closed = REALTIME_CONFIG['spot_ttl_closed'] if ttl_closed is None else ttl_closed
+        self._snapshot: Optional[SpotSnapshot] = None
+        self._lock = threading.Lock()
+
+    def _current_ttl(self) -> float:
+        return self.ttl if is_trading_hours() else self.ttl_closed
+
+    def get(self) -> SpotSnapshot:
+        """
+        获取未过期的快照，必要时重新下载
+
+        Returns:
+            行情快照
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() - snapshot.fetched_at < self._current_ttl():
+                return snapshot
+
+            logger.info("正在下载全市场实时行情快照...")
+            df = self.fetch()
+            self._snapshot = SpotSnapshot(df, time.monotonic())
+            logger.info(f"全市场实时行情快照更新完成，共 {len(df)} 只股票")
+            return self._snapshot
+
+    def invalidate(self):
+        """清空缓存，下次访问时重新下载"""
+        with self._lock:
+            self._snapshot = None
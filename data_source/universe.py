@@ -0,0 +1,139 @@
+"""
+A 股股票池索引（按交易所、板块、代码前缀预先建立分组索引）
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional, Union
+from .metadata import SymbolMetadata
+
+
+class UniverseIndex:
+    """
+    全市场股票池索引
+
+    以列数组保存代码、名称、交易所、板块和行业，并预先建立
+    交易所/板块/行业/代码前缀到行号数组的字典，按分组筛选只需一次字典访问。
+    数据来自每日构建并保存在本地的 SymbolMetadata，随之每日刷新。
+    """
+
+    COLUMNS = ['code', 'symbol', 'name', 'exchange', 'board', 'industry']
+    PREFIX_LENGTHS = (1, 2, 3)
+
+    def __init__(self, table: pd.DataFrame, built_on: Optional[str] = None):
+        """
+        初始化股票池索引
+
+        Args:
+            table: 至少包含 COLUMNS 各列的股票表
+            built_on: 数据构建日期 'YYYYMMDD'
+        """
+        self.table = table[self.COLUMNS].reset_index(drop=True)
+        self.built_on = built_on
+        self._groups = {
+            'exchange': self._group_positions(self.table['exchange']),
+            'board': self._group_positions(self.table['board']),
+            'industry': self._group_positions(self.table['industry']),
+        }
+        codes = self.table['code'].astype(str)
+        self._prefixes = {
+            length: self._group_positions(codes.str[:length]) for length in self.PREFIX_LENGTHS
+        }
+
+    @staticmethod
+    def _group_positions(values: pd.Series) -> Dict[str, np.ndarray]:
+        """按取值分组，返回 {取值: 行号数组}"""
+        return {key: np.asarray(pos) for key, pos in values.groupby(values, sort=False).indices.items()}
+
+    @classmethod
+    def from_metadata(cls, metadata: SymbolMetadata) -> 'UniverseIndex':
+        """
+        从股票基础信息表构建索引
+
+        Args:
+            metadata: 股票基础信息表
+
+        Returns:
+            股票池索引
+        """
+        table = metadata.table
+        if table.empty:
+            table = pd.DataFrame(columns=cls.COLUMNS)
+        return cls(table, metadata.built_on)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def positions(self, exchange: Optional[str] = None,
+                  board: Union[str, Iterable[str], None] = None,
+                  industry: Optional[str] = None,
+                  prefix: Optional[str] = None) -> np.ndarray:
+        """
+        按条件筛选，返回行号数组（多个条件取交集）
+
+        Args:
+            exchange: 交易所，如 '上交所'
+            board: 板块或板块列表，如 '创业板'、['主板', '中小板']
+            industry: 行业
+            prefix: 代码前缀（1~3 位），如 '688'
+
+        Returns:
+            升序的行号数组
+        """
+        selected = None
+        empty = np.array([], dtype=np.intp)
+
+        criteria = []
+        if exchange is not None:
+            criteria.append(self._groups['exchange'].get(exchange, empty))
+        if board is not None:
+            boards = [board] if isinstance(board, str) else list(board)
+            parts = [self._groups['board'].get(b, empty) for b in boards]
+            criteria.append(np.concatenate(parts) if parts else empty)
+        if industry is not None:
+            criteria.append(self._groups['industry'].get(industry, empty))
+        if prefix is not None:
+            if len(prefix) not in self._prefixes:
+                raise ValueError(f"代码前缀长度须为 {self.PREFIX_LENGTHS} 之一: {prefix}")
+            criteria.append(self._prefixes[len(prefix)].get(prefix, empty))
+
+        for positions in criteria:
+            selected = positions if selected is None else np.intersect1d(selected, positions)
+
+        if selected is None:
+            return np.arange(len(self.table))
+        return np.sort(selected)
+
+    def filter(self, **criteria) -> pd.DataFrame:
+        """
+        按条件筛选股票，参数同 positions
+
+        Returns:
+            筛选后的股票表
+        """
+        return self.table.iloc[self.positions(**criteria)]
+
+    def to_dict(self, **criteria) -> Dict[str, str]:
+        """
+        按条件筛选并返回 {代码: 名称}，参数同 positions
+
+        Returns:
+            股票代码（如 '000001.SZ'）到名称的映射
+        """
+        df = self.filter(**criteria)
+        return dict(zip(df['symbol'], df['name']))
+
+    def grouped(self) -> Dict[str, Dict[str, Dict[str, Dict[str, tuple]]]]:
+        """
+        按交易所、板块和行业分组
+
+        Returns:
+            {交易所: {板块: {行业: {代码: (名称, 行业)}}}}，行业为空时归入 '其他'
+        """
+        grouped = {}
+        df = self.table.assign(industry=self.table['industry'].replace('', '其他'))
+        for (exchange, board, industry), part in df.groupby(['exchange', 'board', 'industry'], sort=True):
+            if not exchange or not board:
+                continue
+            stocks = grouped.setdefault(exchange, {}).setdefault(board, {}).setdefault(industry, {})
+            stocks.update(zip(part['symbol'], zip(part['name'], part['industry'])))
+        return grouped
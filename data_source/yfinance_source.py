@@ -4,8 +4,11 @@ Yahoo Finance 数据源（免费，不需要 token）
 import pandas as pd
 import yfinance as yf
 from datetime import datetime, timedelta
-from typing import Optional
-from config import DATA_DIR
+from typing import Dict, List, Optional
+from config import DATA_DIR, YFINANCE_CONFIG
+from .singleflight import SINGLE_FLIGHT
+from .schema import normalize_bars
+from .persistence import load_frame, resolve_path, save_frame
 import logging
 
 # 配置日志
@@ -18,8 +21,31 @@ class YFinanceDataSource:
 
     def __init__(self):
         """初始化 Yahoo Finance 数据源"""
+        self.session = self._create_session()
         logger.info("Yahoo Finance 数据源初始化成功（无需 token）")
 
+    def _create_session(self):
+        """
+        创建复用连接池的 HTTP 会话，所有请求共用
+
+        新版 yfinance 要求使用 curl_cffi 会话；未安装 curl_cffi 时退回 requests 连接池。
+
+        Returns:
+            HTTP 会话对象
+        """
+        try:
+            from curl_cffi import requests as curl_requests
+            return curl_requests.Session(impersonate="chrome")
+        except ImportError:
+            import requests
+            from requests.adapters import HTTPAdapter
+            pool_size = YFINANCE_CONFIG['pool_size']
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            return session
+
     def _convert_symbol(self, symbol: str) -> str:
         """
         转换股票代码以匹配 Yahoo Finance 格式
@@ -40,8 +66,22 @@ class YFinanceDataSource:
             return symbol.replace('.SH', '.SS')
         return symbol
 
+    def _normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        将 Yahoo Finance 返回的数据转换为系统标准格式
+
+        Args:
+            df: 以日期为索引、列为 Open/High/Low/Close/Volume 的 DataFrame
+
+        Returns:
+            以日期为索引、包含 open/high/low/close/volume 列的标准 K 线
+        """
+        df = df.rename_axis(index='date', columns=None)
+        df.columns = df.columns.str.lower()
+        return normalize_bars(df)
+
     def get_daily_data(self, symbol: str, start_date: str = None,
-                      end_date: str = None) -> pd.DataFrame:
+                      end_date: str = None, auto_adjust: bool = True) -> pd.DataFrame:
         """
         获取日线数据
 
@@ -49,6 +89,7 @@ class YFinanceDataSource:
             symbol: 股票代码，如 '000001.SZ' (A股) 或 'AAPL' (美股)
             start_date: 开始日期，格式 'YYYY-MM-DD'
             end_date: 结束日期，格式 'YYYY-MM-DD'
+            auto_adjust: 是否返回复权价格
 
         Returns:
             日线数据 DataFrame
@@ -65,29 +106,17 @@ class YFinanceDataSource:
 
             logger.info(f"正在获取 {symbol} 的数据 ({start_date} ~ {end_date})...")
 
-            ticker = yf.Ticker(yf_symbol)
-            df = ticker.history(start=start_date, end=end_date)
+            # 相同参数的并发请求合并为一次
+            ticker = yf.Ticker(yf_symbol, session=self.session)
+            df = SINGLE_FLIGHT.do(('yfinance_daily', yf_symbol, start_date, end_date, auto_adjust),
+                                  ticker.history, start=start_date, end=end_date,
+                                  auto_adjust=auto_adjust)
 
             if df.empty:
                 logger.warning(f"未获取到股票 {symbol} 的数据")
                 return df
 
-            # 转换为标准格式
-            df = df.reset_index()
-            df.columns = df.columns.str.lower()
-
-            # 重命名列以匹配系统格式
-            column_map = {
-                'adj close': 'adj_close',
-            }
-            df = df.rename(columns=column_map)
-
-            # 保留必要的列
-            required_cols = ['date', 'open', 'high', 'low', 'close', 'volume']
-            df = df[required_cols]
-
-            # 转换日期格式
-            df['trade_date'] = df['date'].dt.strftime('%Y%m%d')
+            df = self._normalize(df)
 
             logger.info(f"获取 {symbol} 日线数据成功，共 {len(df)} 条记录")
             return df
@@ -96,6 +125,63 @@ class YFinanceDataSource:
             logger.error(f"获取 {symbol} 日线数据失败: {e}")
             raise
 
+    def get_daily_data_many(self, symbols: List[str], start_date: str = None,
+                            end_date: str = None) -> Dict[str, pd.DataFrame]:
+        """
+        批量获取多只股票的日线数据（一次多股票下载请求）
+
+        Args:
+            symbols: 股票代码列表，如 ['000001.SZ', 'AAPL']
+            start_date: 开始日期，格式 'YYYY-MM-DD'
+            end_date: 结束日期，格式 'YYYY-MM-DD'
+
+        Returns:
+            {股票代码: 日线数据 DataFrame}，格式与 get_daily_data 相同，未获取到数据的股票为空 DataFrame
+        """
+        # 默认获取最近一年的数据
+        if not end_date:
+            end_date = datetime.now().strftime('%Y-%m-%d')
+        if not start_date:
+            start_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+
+        yf_symbols = {self._convert_symbol(symbol): symbol for symbol in symbols}
+        logger.info(f"正在批量获取 {len(symbols)} 只股票的数据 ({start_date} ~ {end_date})...")
+
+        raw = SINGLE_FLIGHT.do(
+            ('yfinance_daily_many', tuple(sorted(yf_symbols)), start_date, end_date),
+            yf.download,
+            list(yf_symbols),
+            start=start_date,
+            end=end_date,
+            group_by='ticker',
+            auto_adjust=True,
+            threads=YFINANCE_CONFIG['threads'],
+            progress=False,
+            session=self.session,
+        )
+
+        result = {}
+        for yf_symbol, symbol in yf_symbols.items():
+            if isinstance(raw.columns, pd.MultiIndex):
+                if yf_symbol not in raw.columns.get_level_values(0):
+                    df = pd.DataFrame()
+                else:
+                    df = raw[yf_symbol]
+            else:
+                # 旧版 yfinance 单只股票时不返回多级列
+                df = raw if len(yf_symbols) == 1 else pd.DataFrame()
+
+            df = df.dropna(how='all')
+            if df.empty:
+                logger.warning(f"未获取到股票 {symbol} 的数据")
+                result[symbol] = pd.DataFrame()
+                continue
+
+            result[symbol] = self._normalize(df)
+
+        logger.info(f"批量获取日线数据完成，成功 {sum(not df.empty for df in result.values())}/{len(symbols)} 只")
+        return result
+
     def get_stock_info(self, symbol: str) -> dict:
         """
         获取股票信息
@@ -109,8 +195,8 @@ class YFinanceDataSource:
         try:
             # 转换股票代码格式
             yf_symbol = self._convert_symbol(symbol)
-            ticker = yf.Ticker(yf_symbol)
-            info = ticker.info
+            ticker = yf.Ticker(yf_symbol, session=self.session)
+            info = SINGLE_FLIGHT.do(('yfinance_info', yf_symbol), lambda: ticker.info)
 
             return {
                 'name': info.get('longName', symbol),
@@ -125,29 +211,30 @@ class YFinanceDataSource:
 
     def save_to_csv(self, df: pd.DataFrame, filename: str):
         """
-        保存数据到 CSV 文件
+        保存数据到文件，按扩展名选择格式：.feather/.arrow（Arrow IPC）、
+        .parquet 或 .csv（仅用于导出）；没有扩展名时使用 FILE_CONFIG['format']
 
         Args:
             df: 要保存的数据
             filename: 文件名
         """
-        filepath = DATA_DIR / filename
-        df.to_csv(filepath, index=False, encoding='utf-8-sig')
+        filepath = save_frame(df, DATA_DIR / filename)
         logger.info(f"数据已保存到 {filepath}")
 
-    def load_from_csv(self, filename: str) -> pd.DataFrame:
+    def load_from_csv(self, filename: str, columns: List[str] = None) -> pd.DataFrame:
         """
-        从 CSV 文件加载数据
+        从文件加载数据，格式由扩展名决定（见 save_to_csv）
 
         Args:
             filename: 文件名
+            columns: 只读取这些列，默认读取全部（Feather/Parquet 不会解码其余列）
 
         Returns:
             数据 DataFrame
         """
-        filepath = DATA_DIR / filename
+        filepath = resolve_path(DATA_DIR / filename)
         if filepath.exists():
-            df = pd.read_csv(filepath)
+            df = load_frame(filepath, columns)
             logger.info(f"从 {filepath} 加载数据成功")
             return df
         logger.warning(f"文件 {filepath} 不存在")
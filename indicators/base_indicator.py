@@ -2,8 +2,12 @@
 技术指标基类
 """
 from abc import ABC, abstractmethod
+from typing import Callable, Dict, Mapping, Optional
+import numpy as np
 import pandas as pd
 from utils.logger import setup_logger
+from .graph import IndicatorGraph, Node
+from .kernels import allocate_columns, frame_arrays
 
 logger = setup_logger("indicator")
 
@@ -11,6 +15,10 @@ logger = setup_logger("indicator")
 class BaseIndicator(ABC):
     """技术指标基类"""
 
+    # calculate 生成的指标列和 get_signal 生成的信号列 {列名: dtype}
+    VALUE_COLUMNS: Dict[str, type] = {}
+    SIGNAL_COLUMNS: Dict[str, type] = {}
+
     def __init__(self, name: str):
         """
         初始化技术指标
@@ -19,6 +27,7 @@ class BaseIndicator(ABC):
             name: 指标名称
         """
         self.name = name
+        self._stream_ready = False
 
     @abstractmethod
     def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -45,3 +54,141 @@ class BaseIndicator(ABC):
             添加了信号列的 DataFrame
         """
         pass
+
+    @abstractmethod
+    def nodes(self) -> Dict[str, Node]:
+        """
+        声明指标的计算图
+
+        Returns:
+            {VALUE_COLUMNS 中的列名: 节点}，与其他指标相同的中间节点只计算一次
+        """
+
+    def compute(self, data: Mapping[str, np.ndarray], out: Mapping[str, np.ndarray]):
+        """
+        在数组上计算指标，写入预先分配的 VALUE_COLUMNS 数组
+
+        Args:
+            data: {列名: 一维数组}，至少包含计算所需的 K 线列
+            out: {列名: 一维数组}，包含 VALUE_COLUMNS 中的全部列
+        """
+        IndicatorGraph([self.nodes()]).run(data, out)
+
+    @abstractmethod
+    def compute_signal(self, data: Mapping[str, np.ndarray], out: Mapping[str, np.ndarray]):
+        """
+        在数组上由指标生成信号，写入预先分配的 SIGNAL_COLUMNS 数组
+
+        Args:
+            data: {列名: 一维数组}，包含 VALUE_COLUMNS 中的指标列
+            out: {列名: 一维数组}，包含 SIGNAL_COLUMNS 中的全部列
+        """
+
+    def _assign(self, df: pd.DataFrame, columns: Dict[str, type],
+                compute: Callable[[Mapping, Mapping], None]) -> pd.DataFrame:
+        """在 df 的底层数组上计算 columns，返回添加了这些列的副本"""
+        out = allocate_columns(len(df), columns)
+        compute(frame_arrays(df), out)
+        df = df.copy()
+        for col, values in out.items():
+            df[col] = values
+        return df
+
+    # ------------------------------------------------------------------
+    # 增量计算：实时行情只改变最新一根 K 线时，不必重新计算全部历史
+
+    def reset(self, dtype=np.float64):
+        """
+        清空增量计算状态
+
+        Args:
+            dtype: 价格列的类型，增量计算先把价格转换为该类型，与批量计算保持一致
+        """
+        self._dtype = np.dtype(dtype)
+        self._last: Optional[dict] = None
+        self._prev: Optional[dict] = None
+        self._reset_state()
+        self._stream_ready = True
+
+    def seed(self, df: pd.DataFrame) -> Optional[dict]:
+        """
+        用历史 K 线初始化增量计算状态
+
+        Args:
+            df: 包含 OHLCV 数据的 DataFrame
+
+        Returns:
+            最后一根 K 线的指标和信号，没有数据时为 None
+        """
+        dtype = df['close'].dtype
+        self.reset(dtype if np.issubdtype(dtype, np.floating) else np.float64)
+        columns = {col: df[col].to_numpy() for col in ('open', 'high', 'low', 'close') if col in df.columns}
+        for i in range(len(df)):
+            self.update({col: values[i] for col, values in columns.items()})
+        return self._last
+
+    def update(self, bar: Mapping) -> dict:
+        """
+        追加一根新 K 线，O(1) 更新指标
+
+        Args:
+            bar: 含 open/high/low/close 的 K 线（dict 或 Series）
+
+        Returns:
+            该 K 线的指标和信号，列名与 calculate/get_signal 相同
+        """
+        if not self._stream_ready:
+            self.reset()
+        values = self._step(bar, revise=False)
+        self._prev, self._last = self._last, {**values, **self._signals(values, self._last)}
+        return self._last
+
+    def revise_last(self, bar: Mapping) -> dict:
+        """
+        修正最新一根 K 线（如盘中实时价格变化），O(1) 更新指标
+
+        Args:
+            bar: 修正后的 K 线
+
+        Returns:
+            该 K 线的指标和信号
+        """
+        if not self._stream_ready or self._last is None:
+            raise ValueError(f"{self.name} 还没有 K 线，请先调用 seed 或 update")
+        values = self._step(bar, revise=True)
+        self._last = {**values, **self._signals(values, self._prev)}
+        return self._last
+
+    def _price(self, bar: Mapping, col: str = 'close'):
+        """按价格列类型取 K 线中的价格（NumPy 标量）"""
+        return self._dtype.type(bar[col])
+
+    @abstractmethod
+    def _reset_state(self):
+        """创建增量计算用的滑动窗口状态"""
+
+    @abstractmethod
+    def _step(self, bar: Mapping, revise: bool) -> dict:
+        """
+        把一根 K 线送入滑动窗口状态
+
+        Args:
+            bar: K 线
+            revise: True 表示替换最新一根，False 表示追加
+
+        Returns:
+            该 K 线的指标值，列名同 calculate
+        """
+
+    @abstractmethod
+    def _signals(self, values: dict, previous: Optional[dict]) -> dict:
+        """
+        由指标值生成信号，规则同 get_signal
+
+        Args:
+            values: 该 K 线的指标值
+            previous: 前一根 K 线的指标和信号，没有时为 None
+
+        Returns:
+            信号列
+        """
@@ -3,11 +3,33 @@
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Mapping
+from .graph import IndicatorGraph, Node
+from .kernels import allocate_columns, window_mean, window_std, window_sums
+
+
+def _band(mid: np.ndarray, std: np.ndarray, width: float) -> np.ndarray:
+    """中轨加 width 倍标准差"""
+    return mid + std * width
+
+
+def _pctb(price: np.ndarray, upper: np.ndarray, lower: np.ndarray) -> np.ndarray:
+    """%B = (价格 - 下轨) / (上轨 - 下轨)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (price - lower) / (upper - lower)
+
+
+def _width(mid: np.ndarray, upper: np.ndarray, lower: np.ndarray) -> np.ndarray:
+    """带宽 = (上轨 - 下轨) / 中轨 × 100"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (upper - lower) / mid * 100
 
 
 class BOLLIndicator:
     """布林带指标计算器"""
+
+    VALUE_COLUMNS = {'boll_mid': np.float64, 'boll_upper': np.float64, 'boll_lower': np.float64,
+                     'boll_pctb': np.float64, 'boll_width': np.float64}
     
     def __init__(self, period: int = 20, std_dev: float = 2):
         """
@@ -31,27 +53,45 @@ class BOLLIndicator:
         Returns:
             添加了布林带数据的DataFrame
         """
+        out = allocate_columns(len(df), self.VALUE_COLUMNS)
+        self.compute({'close': df[price_col].to_numpy()}, out)
         df = df.copy()
-        
-        # 计算中轨 (MB - Middle Band)
-        df['boll_mid'] = df[price_col].rolling(window=self.period).mean()
-        
-        # 计算标准差
-        std = df[price_col].rolling(window=self.period).std()
-        
-        # 计算上轨 (UP - Upper Band)
-        df['boll_upper'] = df['boll_mid'] + (std * self.std_dev)
-        
-        # 计算下轨 (DN - Lower Band)
-        df['boll_lower'] = df['boll_mid'] - (std * self.std_dev)
-        
-        # 计算 %B 指标
-        df['boll_pctb'] = (df[price_col] - df['boll_lower']) / (df['boll_upper'] - df['boll_lower'])
-        
-        # 计算带宽 (Bandwidth)
-        df['boll_width'] = (df['boll_upper'] - df['boll_lower']) / df['boll_mid'] * 100
-        
+        for col, values in out.items():
+            df[col] = values
         return df
+
+    def nodes(self):
+        """
+        声明布林带的计算图
+
+        Returns:
+            {VALUE_COLUMNS 中的列名: 节点}，中轨与同周期的 MA 共用同一个节点
+        """
+        # 中轨 (MB) 和标准差
+        sums = Node(window_sums, 'close')
+        mid = Node(window_mean, sums, window=self.period)
+        std = Node(window_std, sums, window=self.period)
+
+        # 上轨 (UP)、下轨 (DN)、%B 指标和带宽 (Bandwidth)
+        upper = Node(_band, mid, std, width=self.std_dev)
+        lower = Node(_band, mid, std, width=-self.std_dev)
+        return {
+            'boll_mid': mid,
+            'boll_upper': upper,
+            'boll_lower': lower,
+            'boll_pctb': Node(_pctb, 'close', upper, lower),
+            'boll_width': Node(_width, mid, upper, lower),
+        }
+
+    def compute(self, data: Mapping[str, np.ndarray], out: Mapping[str, np.ndarray]):
+        """
+        在数组上计算布林带，写入预先分配的 VALUE_COLUMNS 数组
+
+        Args:
+            data: {列名: 一维或二维数组}，包含 close 列
+            out: {列名: 数组}，包含 VALUE_COLUMNS 中的全部列
+        """
+        IndicatorGraph([self.nodes()]).run(data, out)
     
     def get_signals(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -0,0 +1,134 @@
+"""
+指标计算图
+
+每个指标用 Node 声明输出列由哪些中间结果计算得到，多个指标的声明合并成
+一张 IndicatorGraph：相同的节点（同一函数、同样的输入和参数）在一次计算中
+只计算一次，例如 RSI 的 close 差分、MA_MEDIUM 与 boll_mid 共用的 20 日均值、
+MA 各周期共用的前缀和。中间结果按引用计数在最后一个使用者算完后立即释放。
+"""
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Union
+import numpy as np
+
+
+class Node:
+    """
+    计算图节点
+
+    func(*输入, **params) 的结果，输入是其他节点或 K 线列名（如 'close'）。
+    节点按 (func, 输入, 参数) 判等，不同指标各自创建的相同节点视为同一个。
+    """
+
+    __slots__ = ('func', 'inputs', 'params', '_key')
+
+    def __init__(self, func: Callable, *inputs: Union['Node', str], **params):
+        """
+        创建节点
+
+        Args:
+            func: 计算函数，按位置接收各输入的数组，按关键字接收参数
+            *inputs: 输入节点或 K 线列名
+            **params: 参数（需可哈希）
+        """
+        self.func = func
+        self.inputs = inputs
+        self.params = params
+        self._key = (func, inputs, tuple(sorted(params.items())))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Node) and self._key == other._key
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __repr__(self) -> str:
+        args = [repr(node) for node in self.inputs]
+        args += [f"{name}={value!r}" for name, value in self.params.items()]
+        return f"{getattr(self.func, '__name__', self.func)}({', '.join(args)})"
+
+
+class IndicatorGraph:
+    """
+    合并多个指标声明的计算图
+
+    run 按依赖顺序计算每个不同的节点一次，输出节点写入预先分配的输出列，
+    其余中间结果在全部使用者算完后释放。
+    """
+
+    def __init__(self, outputs: Iterable[Mapping[str, Node]] = ()):
+        """
+        初始化计算图
+
+        Args:
+            outputs: 各指标的 {输出列名: 节点}
+        """
+        self.outputs: Dict[Node, List[str]] = {}
+        self._order = None
+        for columns in outputs:
+            self.add(columns)
+
+    def add(self, columns: Mapping[str, Node]):
+        """
+        加入一个指标的 {输出列名: 节点}
+
+        Args:
+            columns: 输出列名到节点的映射，同一节点可对应多个输出列
+        """
+        for col, node in columns.items():
+            self.outputs.setdefault(node, []).append(col)
+        self._order = None
+
+    def _plan(self):
+        """拓扑排序（按声明顺序深度优先），并统计每个节点的使用者个数"""
+        order, refs, seen = [], {}, set()
+
+        def visit(node: Node):
+            if node in seen:
+                return
+            seen.add(node)
+            for source in node.inputs:
+                if isinstance(source, Node):
+                    visit(source)
+                    refs[source] = refs.get(source, 0) + 1
+            order.append(node)
+
+        for node in self.outputs:
+            visit(node)
+        self._order, self._refs = order, refs
+
+    @property
+    def nodes(self) -> List[Node]:
+        """按计算顺序排列的全部不同节点"""
+        if self._order is None:
+            self._plan()
+        return list(self._order)
+
+    def run(self, data: Mapping[str, np.ndarray], out: Mapping[str, np.ndarray]):
+        """
+        计算全部节点，输出节点的结果写入 out 中对应的列
+
+        Args:
+            data: {K 线列名: 一维或二维数组}
+            out: {输出列名: 预先分配的数组}，包含全部输出列
+        """
+        if self._order is None:
+            self._plan()
+        refs = dict(self._refs)
+        cache: Dict[Node, Any] = {}
+        for node in self._order:
+            args = [cache[source] if isinstance(source, Node) else data[source] for source in node.inputs]
+            value = node.func(*args, **node.params)
+
+            columns = self.outputs.get(node)
+            if columns:
+                for col in columns:
+                    out[col][...] = value
+                value = out[columns[0]]
+            if refs.get(node):
+                cache[node] = value
+
+            # 释放已没有使用者的中间结果
+            for source in node.inputs:
+                if isinstance(source, Node):
+                    refs[source] -= 1
+                    if not refs[source]:
+                        del cache[source]
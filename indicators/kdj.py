@@ -3,16 +3,35 @@
 """
 import pandas as pd
 import numpy as np
+from typing import Mapping, Optional
 from .base_indicator import BaseIndicator
+from .graph import Node
+from .kernels import cross_above, cross_below, ewm_mean, rolling_max, rolling_min
+from .streaming import EWMean, RollingExtreme, divide
 from config import INDICATORS
 from utils.logger import setup_logger
 
 logger = setup_logger("kdj_indicator")
 
 
+def _rsv(close: np.ndarray, high: np.ndarray, low: np.ndarray) -> np.ndarray:
+    """未成熟随机值 RSV"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (close - low) / (high - low) * 100
+
+
+def _kdj_j(k: np.ndarray, d: np.ndarray) -> np.ndarray:
+    """J = 3K - 2D"""
+    return 3 * k - 2 * d
+
+
 class KDJ(BaseIndicator):
     """随机指标 KDJ"""
 
+    VALUE_COLUMNS = {'KDJ_K': np.float64, 'KDJ_D': np.float64, 'KDJ_J': np.float64}
+    SIGNAL_COLUMNS = {'KDJ_OVERSOLD': np.int64, 'KDJ_OVERBOUGHT': np.int64,
+                      'KDJ_KD_GOLDEN_CROSS': np.int64, 'KDJ_KD_DEATH_CROSS': np.int64}
+
     def __init__(self, k_period: int = None, d_period: int = None, j_period: int = None):
         """
         初始化 KDJ 指标
@@ -39,19 +58,7 @@ class KDJ(BaseIndicator):
         Returns:
             添加了 KDJ 列的 DataFrame
         """
-        df = df.copy()
-
-        # 计算最高价和最低价
-        high = df['high'].rolling(window=self.k_period).max()
-        low = df['low'].rolling(window=self.k_period).min()
-
-        # 计算 RSV
-        rsv = (df['close'] - low) / (high - low) * 100
-
-        # 计算 K、D、J
-        df['KDJ_K'] = rsv.ewm(com=2, adjust=False).mean()
-        df['KDJ_D'] = df['KDJ_K'].ewm(com=2, adjust=False).mean()
-        df['KDJ_J'] = 3 * df['KDJ_K'] - 2 * df['KDJ_D']
+        df = self._assign(df, self.VALUE_COLUMNS, self.compute)
 
         logger.debug(f"KDJ 指标计算完成，K/D/J 周期: {self.k_period}/{self.d_period}/{self.j_period}")
         return df
@@ -70,29 +77,65 @@ class KDJ(BaseIndicator):
         Returns:
             添加了信号列的 DataFrame
         """
-        df = df.copy()
-
         # 确保有 KDJ 列
         if 'KDJ_K' not in df.columns:
             df = self.calculate(df)
 
-        # 超卖信号
-        df['KDJ_OVERSOLD'] = (df['KDJ_K'] < self.oversold).astype(int)
-
-        # 超买信号
-        df['KDJ_OVERBOUGHT'] = (df['KDJ_K'] > self.overbought).astype(int)
-
-        # KD 金叉
-        df['KDJ_KD_GOLDEN_CROSS'] = (
-            (df['KDJ_K'] > df['KDJ_D']) & (df['KDJ_K'].shift(1) <= df['KDJ_D'].shift(1))
-        ).astype(int)
-
-        # KD 死叉
-        df['KDJ_KD_DEATH_CROSS'] = (
-            (df['KDJ_K'] < df['KDJ_D']) & (df['KDJ_K'].shift(1) >= df['KDJ_D'].shift(1))
-        ).astype(int)
-
-        return df
+        return self._assign(df, self.SIGNAL_COLUMNS, self.compute_signal)
+
+    def nodes(self):
+        # 最高价、最低价和 RSV
+        high = Node(rolling_max, 'high', window=self.k_period)
+        low = Node(rolling_min, 'low', window=self.k_period)
+        rsv = Node(_rsv, 'close', high, low)
+
+        # K、D、J
+        k = Node(ewm_mean, rsv, com=2)
+        d = Node(ewm_mean, k, com=2)
+        return {'KDJ_K': k, 'KDJ_D': d, 'KDJ_J': Node(_kdj_j, k, d)}
+
+    def compute_signal(self, data, out):
+        k, d = data['KDJ_K'], data['KDJ_D']
+        # 超卖信号、超买信号
+        np.less(k, self.oversold, out=out['KDJ_OVERSOLD'], casting='unsafe')
+        np.greater(k, self.overbought, out=out['KDJ_OVERBOUGHT'], casting='unsafe')
+
+        # KD 金叉、死叉
+        cross_above(k, d, out['KDJ_KD_GOLDEN_CROSS'])
+        cross_below(k, d, out['KDJ_KD_DEATH_CROSS'])
+
+    def _reset_state(self):
+        self._highest = RollingExtreme(self.k_period, 'max')
+        self._lowest = RollingExtreme(self.k_period, 'min')
+        self._k = EWMean(com=2)
+        self._d = EWMean(com=2)
+
+    def _step(self, bar: Mapping, revise: bool) -> dict:
+        high, low = float(self._price(bar, 'high')), float(self._price(bar, 'low'))
+        close = float(self._price(bar))
+        if revise:
+            highest, lowest = self._highest.revise_last(high), self._lowest.revise_last(low)
+        else:
+            highest, lowest = self._highest.update(high), self._lowest.update(low)
+
+        rsv = divide(close - lowest, highest - lowest) * 100
+        if revise:
+            k = self._k.revise_last(rsv)
+            d = self._d.revise_last(k)
+        else:
+            k = self._k.update(rsv)
+            d = self._d.update(k)
+        return {'KDJ_K': k, 'KDJ_D': d, 'KDJ_J': 3 * k - 2 * d}
+
+    def _signals(self, values: dict, previous: Optional[dict]) -> dict:
+        k, d = values['KDJ_K'], values['KDJ_D']
+        prev_k, prev_d = (previous['KDJ_K'], previous['KDJ_D']) if previous else (np.nan, np.nan)
+        return {
+            'KDJ_OVERSOLD': int(k < self.oversold),
+            'KDJ_OVERBOUGHT': int(k > self.overbought),
+            'KDJ_KD_GOLDEN_CROSS': int(k > d and prev_k <= prev_d),
+            'KDJ_KD_DEATH_CROSS': int(k < d and prev_k >= prev_d),
+        }
 
     def get_analysis_text(self, df: pd.DataFrame, index: int = -1) -> str:
         """
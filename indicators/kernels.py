@@ -0,0 +1,386 @@
+"""
+NumPy 数组上的指标计算函数
+
+指标直接在 K 线列的底层数组上计算，结果写入调用方预先分配的数组，
+不再为每个指标复制整张 DataFrame。所有函数同时支持一维数组（一只股票的
+时间序列）和 (日期数, 股票数) 的二维数组（按列独立计算，沿第 0 轴滑动）。
+"""
+from typing import Dict, Iterable, List, Mapping, Tuple
+import numpy as np
+import pandas as pd
+
+
+def allocate_columns(shape, columns: Mapping[str, type]) -> Dict[str, np.ndarray]:
+    """
+    预先分配输出列：同类型的列共用一块数组，每列是其中连续的一段
+
+    Args:
+        shape: 每列的形状，行数或 (日期数, 股票数)
+        columns: {列名: dtype}
+
+    Returns:
+        {列名: 数组视图}，数值未初始化
+    """
+    shape = (shape,) if isinstance(shape, int) else tuple(shape)
+    groups: Dict[np.dtype, list] = {}
+    for col, dtype in columns.items():
+        groups.setdefault(np.dtype(dtype), []).append(col)
+
+    out = {}
+    for dtype, cols in groups.items():
+        block = np.empty((len(cols),) + shape, dtype=dtype)
+        for i, col in enumerate(cols):
+            out[col] = block[i]
+    return {col: out[col] for col in columns}
+
+
+def frame_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    DataFrame 各列的底层数组（单一类型的列不复制）
+
+    Args:
+        df: 数据
+
+    Returns:
+        {列名: 一维数组}
+    """
+    return {col: df[col].to_numpy() for col in df.columns}
+
+
+def _pandas(values: np.ndarray):
+    """包装为 Series（一维）或 DataFrame（二维），不复制数据（指数加权仍使用 pandas 实现）"""
+    if values.ndim == 1:
+        return pd.Series(values, copy=False)
+    return pd.DataFrame(values, copy=False)
+
+
+class _WindowSums:
+    """
+    滑动窗口求和用的前缀和（O(n)，沿第 0 轴）
+
+    为减少大数相减的精度损失，先减去每列第一个有效值作为参考值，再对
+    累加时每一步的舍入误差（TwoSum 误差）单独求前缀和作为补偿。NaN
+    按 0 累加，并单独统计窗口内的有效个数、负数个数和连续相同值的长度，
+    用于与 pandas 相同的修正规则。
+    """
+
+    def __init__(self, values: np.ndarray):
+        x = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(x)
+        if len(x):
+            first = np.expand_dims(np.argmax(valid, axis=0), 0)
+            ref = np.take_along_axis(x, first, axis=0)[0]
+            self.ref = np.where(valid.any(axis=0), ref, 0.0)
+        else:
+            self.ref = np.zeros(x.shape[1:])
+        self.values = x
+        self.length = len(x)
+
+        self._shifted = np.where(valid, x - self.ref, 0.0)
+        self.sums = self._compensated(self._shifted)
+        self._square_sums = None
+        self.count = self._prefix(valid.astype(np.int64))
+        self.negative = self._prefix((valid & np.signbit(x)).astype(np.int64))
+
+        # 以每个位置结尾、数值相同的连续长度
+        index = np.arange(self.length).reshape((-1,) + (1,) * (x.ndim - 1))
+        change = np.ones(x.shape, dtype=bool)
+        change[1:] = x[1:] != x[:-1]
+        start = np.maximum.accumulate(np.where(change, index, 0), axis=0)
+        self.run = index - start + 1
+
+    @staticmethod
+    def _prefix(values: np.ndarray) -> np.ndarray:
+        out = np.zeros((len(values) + 1,) + values.shape[1:], dtype=values.dtype)
+        np.cumsum(values, axis=0, out=out[1:])
+        return out
+
+    @classmethod
+    def _compensated(cls, y: np.ndarray):
+        """前缀和及其逐步舍入误差的前缀和"""
+        sums = cls._prefix(y)
+        before, after = sums[:-1], sums[1:]
+        part = after - before
+        error = (before - (after - part)) + (y - part)
+        return sums, cls._prefix(error)
+
+    @property
+    def square_sums(self):
+        """平方的前缀和（计算方差时才生成）"""
+        if self._square_sums is None:
+            self._square_sums = self._compensated(self._shifted * self._shifted)
+        return self._square_sums
+
+    def _window(self, prefix: np.ndarray, window: int) -> np.ndarray:
+        """窗口内的差：out[i] = prefix[i + 1] - prefix[i + 1 - window]，不足窗口时为 0"""
+        out = np.zeros((self.length,) + prefix.shape[1:], dtype=prefix.dtype)
+        if window <= self.length:
+            out[window - 1:] = prefix[window:] - prefix[:-window]
+        return out
+
+    def _sum(self, pair, window: int) -> np.ndarray:
+        sums, errors = pair
+        return self._window(sums, window) + self._window(errors, window)
+
+    def full(self, window: int) -> np.ndarray:
+        """窗口内数据个数足够（且没有 NaN）的位置"""
+        return self._window(self.count, window) == window
+
+    def mean(self, window: int) -> np.ndarray:
+        """滑动均值，规则同 pandas：窗口内全部相同时取该值，全非负（非正）时不出现负（正）值"""
+        mean = self._sum(self.sums, window) / window + self.ref
+        negative = self._window(self.negative, window)
+        mean[(negative == 0) & (mean < 0)] = 0.0
+        mean[(negative == window) & (mean > 0)] = 0.0
+        same = self.run >= window
+        mean[same] = self.values[same]
+        mean[~self.full(window)] = np.nan
+        return mean
+
+    def var(self, window: int) -> np.ndarray:
+        """滑动样本方差（ddof=1），窗口内全部相同时为 0"""
+        if window < 2:
+            return np.full(self.values.shape, np.nan)
+        total = self._sum(self.sums, window)
+        var = (self._sum(self.square_sums, window) - total * total / window) / (window - 1)
+        var[(var < 0) | (self.run >= window)] = 0.0
+        var[~self.full(window)] = np.nan
+        return var
+
+
+def window_sums(values: np.ndarray) -> _WindowSums:
+    """
+    滑动窗口求和用的前缀和，可供多个窗口的 window_mean / window_std 共用
+
+    Args:
+        values: 一维或二维数组
+
+    Returns:
+        前缀和对象
+    """
+    return _WindowSums(values)
+
+
+def window_mean(sums: _WindowSums, window: int) -> np.ndarray:
+    """
+    由 window_sums 的结果计算滑动均值，同 rolling_mean
+
+    Args:
+        sums: window_sums 的结果
+        window: 窗口长度
+
+    Returns:
+        float64 数组
+    """
+    return sums.mean(window)
+
+
+def window_std(sums: _WindowSums, window: int) -> np.ndarray:
+    """
+    由 window_sums 的结果计算滑动样本标准差，同 rolling_std
+
+    Args:
+        sums: window_sums 的结果
+        window: 窗口长度
+
+    Returns:
+        float64 数组
+    """
+    return np.sqrt(sums.var(window))
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    滑动窗口均值（O(n) 补偿前缀和），与 Series.rolling(window).mean() 一致到浮点舍入
+
+    Args:
+        values: 一维或二维数组
+        window: 窗口长度
+
+    Returns:
+        float64 数组，前 window - 1 个及窗口内有 NaN 时为 NaN
+    """
+    return _WindowSums(values).mean(window)
+
+
+def rolling_means(values: np.ndarray, windows: Iterable[int]) -> List[np.ndarray]:
+    """
+    多个窗口的滑动均值，共用一次前缀和
+
+    Args:
+        values: 一维或二维数组
+        windows: 窗口长度列表
+
+    Returns:
+        与 windows 对应的均值数组列表，每个与 rolling_mean 的结果相同
+    """
+    sums = _WindowSums(values)
+    return [sums.mean(window) for window in windows]
+
+
+def rolling_mean_std(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    同一窗口的滑动均值和样本标准差（ddof=1），共用一次前缀和
+
+    Args:
+        values: 一维或二维数组
+        window: 窗口长度
+
+    Returns:
+        (均值, 标准差)，均值与 rolling_mean 的结果相同，
+        标准差与 Series.rolling(window).std() 一致到浮点舍入
+    """
+    sums = _WindowSums(values)
+    return sums.mean(window), np.sqrt(sums.var(window))
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    滑动窗口样本标准差（ddof=1）
+
+    Args:
+        values: 一维或二维数组
+        window: 窗口长度
+
+    Returns:
+        float64 数组
+    """
+    return np.sqrt(_WindowSums(values).var(window))
+
+
+def _rolling_extreme(values: np.ndarray, window: int, ufunc: np.ufunc, fill: float) -> np.ndarray:
+    """
+    滑动极值：单调队列的分块向量化形式（van Herk / Gil-Werman），O(n)
+
+    按窗口长度分块，块内前缀极值和后缀极值各一次 accumulate，
+    位置 i 的窗口跨越至多两块，结果为 后缀[i - window + 1] 与 前缀[i] 的极值。
+    """
+    x = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(x)
+    length = len(x)
+    out = np.full(x.shape, np.nan)
+    if window > length:
+        return out
+
+    blocks = -(-length // window)
+    padded = np.full((blocks * window,) + x.shape[1:], fill)
+    padded[:length] = np.where(valid, x, fill)
+    shaped = padded.reshape((blocks, window) + x.shape[1:])
+    prefix = ufunc.accumulate(shaped, axis=1).reshape(padded.shape)
+    suffix = ufunc.accumulate(shaped[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+
+    out[window - 1:] = ufunc(suffix[:length - window + 1], prefix[window - 1:length])
+    counts = _WindowSums._prefix(valid.astype(np.int64))
+    out[window - 1:][counts[window:] - counts[:-window] < window] = np.nan
+    return out
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    滑动窗口最大值，同 Series.rolling(window).max()
+
+    Args:
+        values: 一维或二维数组
+        window: 窗口长度
+
+    Returns:
+        float64 数组
+    """
+    return _rolling_extreme(values, window, np.maximum, -np.inf)
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    滑动窗口最小值，同 Series.rolling(window).min()
+
+    Args:
+        values: 一维或二维数组
+        window: 窗口长度
+
+    Returns:
+        float64 数组
+    """
+    return _rolling_extreme(values, window, np.minimum, np.inf)
+
+
+def ewm_mean(values: np.ndarray, span: float = None, com: float = None) -> np.ndarray:
+    """
+    指数加权均值，同 Series.ewm(span/com, adjust=False).mean()
+
+    Args:
+        values: 一维或二维数组
+        span: 跨度
+        com: 质心，与 span 二选一
+
+    Returns:
+        float64 数组
+    """
+    return _pandas(values).ewm(span=span, com=com, adjust=False).mean().to_numpy()
+
+
+def diff(values: np.ndarray) -> np.ndarray:
+    """
+    与前一个数据的差，同 Series.diff()（保持原类型，第一个为 NaN）
+
+    Args:
+        values: 一维或二维浮点数组
+
+    Returns:
+        差值数组
+    """
+    out = np.empty_like(values)
+    if len(values):
+        out[0] = np.nan
+        np.subtract(values[1:], values[:-1], out=out[1:])
+    return out
+
+
+def leading_nan(values: np.ndarray) -> np.ndarray:
+    """
+    第一个有效数据之前的位置（如面板中上市前的日期）
+
+    Args:
+        values: 一维或二维浮点数组
+
+    Returns:
+        布尔数组
+    """
+    return np.logical_and.accumulate(np.isnan(values), axis=0)
+
+
+def cross_above(a: np.ndarray, b, out: np.ndarray) -> np.ndarray:
+    """
+    上穿：a > b 且前一根 a <= b（NaN 不算），同
+    (a > b) & (a.shift(1) <= b.shift(1))
+
+    Args:
+        a: 一维或二维数组
+        b: 同形状数组或标量
+        out: 写入结果的整数数组
+
+    Returns:
+        out
+    """
+    b = np.broadcast_to(b, a.shape)
+    out[:1] = 0
+    out[1:] = (a[1:] > b[1:]) & (a[:-1] <= b[:-1])
+    return out
+
+
+def cross_below(a: np.ndarray, b, out: np.ndarray) -> np.ndarray:
+    """
+    下穿：a < b 且前一根 a >= b（NaN 不算），同
+    (a < b) & (a.shift(1) >= b.shift(1))
+
+    Args:
+        a: 一维或二维数组
+        b: 同形状数组或标量
+        out: 写入结果的整数数组
+
+    Returns:
+        out
+    """
+    b = np.broadcast_to(b, a.shape)
+    out[:1] = 0
+    out[1:] = (a[1:] < b[1:]) & (a[:-1] >= b[:-1])
+    return out
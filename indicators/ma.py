@@ -3,7 +3,11 @@
 """
 import pandas as pd
 import numpy as np
+from typing import Mapping, Optional
 from .base_indicator import BaseIndicator
+from .graph import Node
+from .kernels import cross_above, cross_below, window_mean, window_sums
+from .streaming import RollingMean
 from config import INDICATORS
 from utils.logger import setup_logger
 
@@ -13,6 +17,9 @@ logger = setup_logger("ma_indicator")
 class MovingAverage(BaseIndicator):
     """移动平均线指标"""
 
+    VALUE_COLUMNS = {'MA_SHORT': np.float64, 'MA_MEDIUM': np.float64, 'MA_LONG': np.float64}
+    SIGNAL_COLUMNS = {'MA_DIFF': np.float64, 'MA_GOLDEN_CROSS': np.int64, 'MA_DEATH_CROSS': np.int64}
+
     def __init__(self, short_period: int = None, medium_period: int = None, long_period: int = None):
         """
         初始化 MA 指标
@@ -37,11 +44,7 @@ class MovingAverage(BaseIndicator):
         Returns:
             添加了 MA 列的 DataFrame
         """
-        df = df.copy()
-
-        df['MA_SHORT'] = df['close'].rolling(window=self.short_period).mean()
-        df['MA_MEDIUM'] = df['close'].rolling(window=self.medium_period).mean()
-        df['MA_LONG'] = df['close'].rolling(window=self.long_period).mean()
+        df = self._assign(df, self.VALUE_COLUMNS, self.compute)
 
         logger.debug(f"MA 指标计算完成，短/中/长期均线: {self.short_period}/{self.medium_period}/{self.long_period}")
         return df
@@ -60,26 +63,50 @@ class MovingAverage(BaseIndicator):
         Returns:
             添加了信号列的 DataFrame
         """
-        df = df.copy()
-
         # 确保有 MA 列
         if 'MA_SHORT' not in df.columns or 'MA_MEDIUM' not in df.columns:
             df = self.calculate(df)
 
-        # 计算金叉和死叉
-        df['MA_DIFF'] = df['MA_SHORT'] - df['MA_MEDIUM']
-
-        # 金叉：短期均线上穿中期均线
-        df['MA_GOLDEN_CROSS'] = (
-            (df['MA_DIFF'] > 0) & (df['MA_DIFF'].shift(1) <= 0)
-        ).astype(int)
-
-        # 死叉：短期均线下穿中期均线
-        df['MA_DEATH_CROSS'] = (
-            (df['MA_DIFF'] < 0) & (df['MA_DIFF'].shift(1) >= 0)
-        ).astype(int)
-
-        return df
+        return self._assign(df, self.SIGNAL_COLUMNS, self.compute_signal)
+
+    def nodes(self):
+        # 各周期共用同一组 close 前缀和
+        sums = Node(window_sums, 'close')
+        return {
+            'MA_SHORT': Node(window_mean, sums, window=self.short_period),
+            'MA_MEDIUM': Node(window_mean, sums, window=self.medium_period),
+            'MA_LONG': Node(window_mean, sums, window=self.long_period),
+        }
+
+    def compute_signal(self, data, out):
+        diff = out['MA_DIFF']
+        np.subtract(data['MA_SHORT'], data['MA_MEDIUM'], out=diff)
+
+        # 金叉：短期均线上穿中期均线；死叉：短期均线下穿中期均线
+        cross_above(diff, 0, out['MA_GOLDEN_CROSS'])
+        cross_below(diff, 0, out['MA_DEATH_CROSS'])
+
+    def _reset_state(self):
+        self._means = {
+            'MA_SHORT': RollingMean(self.short_period),
+            'MA_MEDIUM': RollingMean(self.medium_period),
+            'MA_LONG': RollingMean(self.long_period),
+        }
+
+    def _step(self, bar: Mapping, revise: bool) -> dict:
+        close = float(self._price(bar))
+        if revise:
+            return {col: mean.revise_last(close) for col, mean in self._means.items()}
+        return {col: mean.update(close) for col, mean in self._means.items()}
+
+    def _signals(self, values: dict, previous: Optional[dict]) -> dict:
+        diff = values['MA_SHORT'] - values['MA_MEDIUM']
+        prev_diff = previous['MA_DIFF'] if previous else np.nan
+        return {
+            'MA_DIFF': diff,
+            'MA_GOLDEN_CROSS': int(diff > 0 and prev_diff <= 0),
+            'MA_DEATH_CROSS': int(diff < 0 and prev_diff >= 0),
+        }
 
     def get_analysis_text(self, df: pd.DataFrame, index: int = -1) -> str:
         """
@@ -3,7 +3,11 @@
 """
 import pandas as pd
 import numpy as np
+from typing import Mapping, Optional
 from .base_indicator import BaseIndicator
+from .graph import Node
+from .kernels import cross_above, cross_below, ewm_mean
+from .streaming import EWMean
 from config import INDICATORS
 from utils.logger import setup_logger
 
@@ -13,6 +17,9 @@ logger = setup_logger("macd_indicator")
 class MACD(BaseIndicator):
     """移动平均收敛发散指标"""
 
+    VALUE_COLUMNS = {'MACD': np.float64, 'MACD_SIGNAL': np.float64, 'MACD_HIST': np.float64}
+    SIGNAL_COLUMNS = {'MACD_DIFF': np.float64, 'MACD_GOLDEN_CROSS': np.int64, 'MACD_DEATH_CROSS': np.int64}
+
     def __init__(self, fast_period: int = None, slow_period: int = None, signal_period: int = None):
         """
         初始化 MACD 指标
@@ -37,20 +44,7 @@ class MACD(BaseIndicator):
         Returns:
             添加了 MACD 列的 DataFrame
         """
-        df = df.copy()
-
-        # 计算 EMA
-        ema_fast = df['close'].ewm(span=self.fast_period, adjust=False).mean()
-        ema_slow = df['close'].ewm(span=self.slow_period, adjust=False).mean()
-
-        # 计算 MACD 线
-        df['MACD'] = ema_fast - ema_slow
-
-        # 计算 DEA 信号线
-        df['MACD_SIGNAL'] = df['MACD'].ewm(span=self.signal_period, adjust=False).mean()
-
-        # 计算 MACD 柱状图
-        df['MACD_HIST'] = df['MACD'] - df['MACD_SIGNAL']
+        df = self._assign(df, self.VALUE_COLUMNS, self.compute)
 
         logger.debug(f"MACD 指标计算完成，快/慢/信号: {self.fast_period}/{self.slow_period}/{self.signal_period}")
         return df
@@ -69,26 +63,53 @@ class MACD(BaseIndicator):
         Returns:
             添加了信号列的 DataFrame
         """
-        df = df.copy()
-
         # 确保有 MACD 列
         if 'MACD' not in df.columns or 'MACD_SIGNAL' not in df.columns:
             df = self.calculate(df)
 
-        # 计算差值
-        df['MACD_DIFF'] = df['MACD'] - df['MACD_SIGNAL']
-
-        # 金叉：MACD 上穿信号线
-        df['MACD_GOLDEN_CROSS'] = (
-            (df['MACD_DIFF'] > 0) & (df['MACD_DIFF'].shift(1) <= 0)
-        ).astype(int)
-
-        # 死叉：MACD 下穿信号线
-        df['MACD_DEATH_CROSS'] = (
-            (df['MACD_DIFF'] < 0) & (df['MACD_DIFF'].shift(1) >= 0)
-        ).astype(int)
-
-        return df
+        return self._assign(df, self.SIGNAL_COLUMNS, self.compute_signal)
+
+    def nodes(self):
+        # MACD 线 = 快线 EMA - 慢线 EMA
+        fast = Node(ewm_mean, 'close', span=self.fast_period)
+        slow = Node(ewm_mean, 'close', span=self.slow_period)
+        macd = Node(np.subtract, fast, slow)
+
+        # DEA 信号线和 MACD 柱状图
+        signal = Node(ewm_mean, macd, span=self.signal_period)
+        return {'MACD': macd, 'MACD_SIGNAL': signal, 'MACD_HIST': Node(np.subtract, macd, signal)}
+
+    def compute_signal(self, data, out):
+        diff = out['MACD_DIFF']
+        np.subtract(data['MACD'], data['MACD_SIGNAL'], out=diff)
+
+        # 金叉：MACD 上穿信号线；死叉：MACD 下穿信号线
+        cross_above(diff, 0, out['MACD_GOLDEN_CROSS'])
+        cross_below(diff, 0, out['MACD_DEATH_CROSS'])
+
+    def _reset_state(self):
+        self._ema_fast = EWMean(span=self.fast_period)
+        self._ema_slow = EWMean(span=self.slow_period)
+        self._ema_signal = EWMean(span=self.signal_period)
+
+    def _step(self, bar: Mapping, revise: bool) -> dict:
+        close = float(self._price(bar))
+        if revise:
+            macd = self._ema_fast.revise_last(close) - self._ema_slow.revise_last(close)
+            signal = self._ema_signal.revise_last(macd)
+        else:
+            macd = self._ema_fast.update(close) - self._ema_slow.update(close)
+            signal = self._ema_signal.update(macd)
+        return {'MACD': macd, 'MACD_SIGNAL': signal, 'MACD_HIST': macd - signal}
+
+    def _signals(self, values: dict, previous: Optional[dict]) -> dict:
+        diff = values['MACD'] - values['MACD_SIGNAL']
+        prev_diff = previous['MACD_DIFF'] if previous else np.nan
+        return {
+            'MACD_DIFF': diff,
+            'MACD_GOLDEN_CROSS': int(diff > 0 and prev_diff <= 0),
+            'MACD_DEATH_CROSS': int(diff < 0 and prev_diff >= 0),
+        }
 
     def get_analysis_text(self, df: pd.DataFrame, index: int = -1) -> str:
         """
@@ -3,16 +3,46 @@
 """
 import pandas as pd
 import numpy as np
+from typing import Mapping, Optional
 from .base_indicator import BaseIndicator
+from .graph import Node
+from .kernels import diff, leading_nan, window_mean, window_sums
+from .streaming import RollingMean, divide
 from config import INDICATORS
 from utils.logger import setup_logger
 
 logger = setup_logger("rsi_indicator")
 
 
+def _gain(delta: np.ndarray, leading: np.ndarray) -> np.ndarray:
+    """上涨幅度，第一个收盘价之前（如面板中上市前的日期）没有数据"""
+    gain = np.where(delta > 0, delta, 0)
+    if leading.any():
+        gain[leading] = np.nan
+    return gain
+
+
+def _loss(delta: np.ndarray, leading: np.ndarray) -> np.ndarray:
+    """下跌幅度（正数），第一个收盘价之前没有数据"""
+    loss = -np.where(delta < 0, delta, 0)
+    if leading.any():
+        loss[leading] = np.nan
+    return loss
+
+
+def _rsi(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    """由平均涨跌幅计算 RSI"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
 class RelativeStrengthIndex(BaseIndicator):
     """相对强弱指数指标"""
 
+    VALUE_COLUMNS = {'RSI': np.float64}
+    SIGNAL_COLUMNS = {'RSI_OVERSOLD': np.int64, 'RSI_OVERBOUGHT': np.int64}
+
     def __init__(self, period: int = None, overbought: int = None, oversold: int = None):
         """
         初始化 RSI 指标
@@ -37,24 +67,7 @@ class RelativeStrengthIndex(BaseIndicator):
         Returns:
             添加了 RSI 列的 DataFrame
         """
-        df = df.copy()
-
-        # 计算价格变化
-        delta = df['close'].diff()
-
-        # 分离上涨和下跌
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-
-        # 计算平均涨跌幅
-        avg_gain = gain.rolling(window=self.period).mean()
-        avg_loss = loss.rolling(window=self.period).mean()
-
-        # 计算相对强度
-        rs = avg_gain / avg_loss
-
-        # 计算 RSI
-        df['RSI'] = 100 - (100 / (1 + rs))
+        df = self._assign(df, self.VALUE_COLUMNS, self.compute)
 
         logger.debug(f"RSI 指标计算完成，周期: {self.period}")
         return df
@@ -73,19 +86,66 @@ class RelativeStrengthIndex(BaseIndicator):
         Returns:
             添加了信号列的 DataFrame
         """
-        df = df.copy()
-
         # 确保有 RSI 列
         if 'RSI' not in df.columns:
             df = self.calculate(df)
 
-        # 超卖信号
-        df['RSI_OVERSOLD'] = (df['RSI'] < self.oversold).astype(int)
-
-        # 超买信号
-        df['RSI_OVERBOUGHT'] = (df['RSI'] > self.overbought).astype(int)
-
-        return df
+        return self._assign(df, self.SIGNAL_COLUMNS, self.compute_signal)
+
+    def nodes(self):
+        # 计算价格变化，分离上涨和下跌
+        delta = Node(diff, 'close')
+        leading = Node(leading_nan, 'close')
+        gain = Node(_gain, delta, leading)
+        loss = Node(_loss, delta, leading)
+
+        # 平均涨跌幅和相对强度
+        avg_gain = Node(window_mean, Node(window_sums, gain), window=self.period)
+        avg_loss = Node(window_mean, Node(window_sums, loss), window=self.period)
+        return {'RSI': Node(_rsi, avg_gain, avg_loss)}
+
+    def compute_signal(self, data, out):
+        rsi = data['RSI']
+        # 超卖信号、超买信号
+        np.less(rsi, self.oversold, out=out['RSI_OVERSOLD'], casting='unsafe')
+        np.greater(rsi, self.overbought, out=out['RSI_OVERBOUGHT'], casting='unsafe')
+
+    def _reset_state(self):
+        self._avg_gain = RollingMean(self.period)
+        self._avg_loss = RollingMean(self.period)
+        # 最新一根和前一根 K 线的收盘价，修正最新一根时涨跌幅仍相对前一根计算
+        self._close = None
+        self._prev_close = None
+        # 是否已出现过有效收盘价（之前的 K 线不计入涨跌）
+        self._started = False
+        self._started_before = False
+
+    def _step(self, bar: Mapping, revise: bool) -> dict:
+        close = self._price(bar)
+        if not revise:
+            self._prev_close = self._close
+            self._started_before = self._started
+        self._close = close
+        self._started = self._started_before or close == close
+
+        # 与 Series.diff() 相同，在价格列类型下计算涨跌幅
+        zero = self._dtype.type(0)
+        delta = close - self._prev_close if self._prev_close is not None else self._dtype.type(np.nan)
+        gain = float(delta if delta > 0 else zero) if self._started else np.nan
+        loss = float(-(delta if delta < 0 else zero)) if self._started else np.nan
+
+        if revise:
+            avg_gain, avg_loss = self._avg_gain.revise_last(gain), self._avg_loss.revise_last(loss)
+        else:
+            avg_gain, avg_loss = self._avg_gain.update(gain), self._avg_loss.update(loss)
+        rs = divide(avg_gain, avg_loss)
+        return {'RSI': 100 - divide(100, 1 + rs)}
+
+    def _signals(self, values: dict, previous: Optional[dict]) -> dict:
+        return {
+            'RSI_OVERSOLD': int(values['RSI'] < self.oversold),
+            'RSI_OVERBOUGHT': int(values['RSI'] > self.overbought),
+        }
 
     def get_analysis_text(self, df: pd.DataFrame, index: int = -1) -> str:
         """
@@ -0,0 +1,302 @@
+"""
+增量计算的滑动窗口状态（每根新 K 线或修正最新一根 K 线的代价为 O(1)）
+
+RollingMean 与 kernels.rolling_mean 的计算步骤逐位一致（与 pandas
+rolling().mean() 一致到浮点舍入），RollingExtreme、EWMean 与 pandas 的
+rolling().max()/min()、ewm(adjust=False).mean() 逐位一致，增量结果与批量
+calculate 完全相同。
+"""
+import math
+from collections import deque
+import numpy as np
+
+NAN = float('nan')
+
+# 窗口未满、没有移出数据时的占位
+_NOTHING = object()
+
+
+def divide(a: float, b: float) -> float:
+    """
+    按 NumPy 规则相除（除以 0 得到 ±inf 或 NaN，不抛出异常），同 Series 间的除法
+
+    Args:
+        a: 被除数
+        b: 除数
+
+    Returns:
+        商
+    """
+    if b == 0 or b != b:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return float(np.float64(a) / np.float64(b))
+    return a / b
+
+
+def ewm_com(span: float = None, com: float = None) -> float:
+    """
+    与 pandas ewm 相同的质心换算
+
+    Args:
+        span: 跨度
+        com: 质心，给出时直接返回
+
+    Returns:
+        质心 com
+    """
+    if com is not None:
+        return float(com)
+    return (span - 1) / 2.0
+
+
+class RollingMean:
+    """
+    滑动窗口均值
+
+    与 kernels.rolling_mean 逐位一致：减去第一个有效数据作为参考值后累加前缀和
+    及 TwoSum 舍入误差的前缀和，窗口均值为两个前缀之差；窗口内数值全部相同时
+    直接返回该值，并按符号计数修正舍入误差。只保留最近 window + 1 个前缀。
+    """
+
+    def __init__(self, window: int):
+        """
+        初始化滑动均值
+
+        Args:
+            window: 窗口长度（同时作为最少数据个数）
+        """
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        """清空状态"""
+        self._ref = None
+        # 前缀 (和, 舍入误差和, 有效个数, 负数个数)，第一个为空前缀
+        self._prefixes = deque([(0.0, 0.0, 0, 0)])
+        self._same = 0
+        self._prev_value = NAN
+        self._undo = None
+
+    def _mean(self, value: float) -> float:
+        prefixes = self._prefixes
+        if len(prefixes) <= self.window:
+            return NAN
+        total, error, nobs, neg = prefixes[-1]
+        old_total, old_error, old_nobs, old_neg = prefixes[0]
+        if nobs - old_nobs < self.window:
+            return NAN
+        if self._same >= self.window:
+            return value
+        result = ((total - old_total) + (error - old_error)) / self.window + self._ref
+        neg -= old_neg
+        if neg == 0 and result < 0:
+            return 0.0
+        if neg == self.window and result > 0:
+            return 0.0
+        return result
+
+    def update(self, value: float) -> float:
+        """
+        移入一个新数据
+
+        Args:
+            value: 新数据
+
+        Returns:
+            当前窗口均值，数据不足时为 NaN
+        """
+        prefixes = self._prefixes
+        self._undo = (self._ref, self._same, self._prev_value, _NOTHING)
+
+        total, error, nobs, neg = prefixes[-1]
+        if value == value:
+            if self._ref is None:
+                self._ref = value
+            y = value - self._ref
+            t = total + y
+            part = t - total
+            error += (total - (t - part)) + (y - part)
+            total = t
+            nobs += 1
+            if math.copysign(1.0, value) < 0:
+                neg += 1
+        prefixes.append((total, error, nobs, neg))
+        if len(prefixes) > self.window + 1:
+            self._undo = self._undo[:3] + (prefixes.popleft(),)
+
+        self._same = self._same + 1 if value == self._prev_value else 1
+        self._prev_value = value
+        return self._mean(value)
+
+    def revise_last(self, value: float) -> float:
+        """
+        替换最近移入的数据
+
+        Args:
+            value: 替换后的数据
+
+        Returns:
+            当前窗口均值
+        """
+        self._ref, self._same, self._prev_value, removed = self._undo
+        self._prefixes.pop()
+        if removed is not _NOTHING:
+            self._prefixes.appendleft(removed)
+        return self.update(value)
+
+
+class RollingExtreme:
+    """
+    滑动窗口最大值 / 最小值（单调队列）
+
+    队列中按位置保存可能成为极值的数据，新数据从队尾挤出不如它的数据，
+    过期数据从队首移出。窗口内有 NaN 时结果为 NaN，同 pandas
+    rolling(window).max()/min()。
+    """
+
+    def __init__(self, window: int, mode: str = 'max'):
+        """
+        初始化滑动极值
+
+        Args:
+            window: 窗口长度（同时作为最少数据个数）
+            mode: 'max' 或 'min'
+        """
+        if mode not in ('max', 'min'):
+            raise ValueError(f"mode 只能是 'max' 或 'min'，而不是 {mode!r}")
+        self.window = window
+        self.mode = mode
+        self.reset()
+
+    def reset(self):
+        """清空状态"""
+        self._queue = deque()
+        self._count = 0
+        self._last_nan = -1
+        self._undo = None
+
+    def _dominated(self, kept: float, value: float) -> bool:
+        return kept <= value if self.mode == 'max' else kept >= value
+
+    def update(self, value: float) -> float:
+        """
+        移入一个新数据（均摊 O(1)）
+
+        Args:
+            value: 新数据
+
+        Returns:
+            当前窗口极值，数据不足或窗口内有 NaN 时为 NaN
+        """
+        i = self._count
+        queue = self._queue
+        expired = queue.popleft() if queue and queue[0][0] <= i - self.window else None
+        last_nan = self._last_nan
+        popped = []
+        if value != value:
+            self._last_nan = i
+            appended = False
+        else:
+            while queue and self._dominated(queue[-1][1], value):
+                popped.append(queue.pop())
+            queue.append((i, value))
+            appended = True
+        self._count += 1
+        self._undo = (expired, popped, appended, last_nan)
+
+        if self._count < self.window or self._last_nan > i - self.window:
+            return NAN
+        return queue[0][1]
+
+    def revise_last(self, value: float) -> float:
+        """
+        替换最近移入的数据（代价不超过窗口长度）
+
+        Args:
+            value: 替换后的数据
+
+        Returns:
+            当前窗口极值
+        """
+        expired, popped, appended, self._last_nan = self._undo
+        self._count -= 1
+        if appended:
+            self._queue.pop()
+        self._queue.extend(reversed(popped))
+        if expired is not None:
+            self._queue.appendleft(expired)
+        return self.update(value)
+
+
+class EWMean:
+    """
+    指数加权均值（adjust=False）
+
+    与 pandas ewm(com=..., adjust=False).mean() 相同：第一个数据作为初值，
+    之后 y = ((1 - α)·y + α·x) / ((1 - α) + α)，遇到 NaN 时保持原值，
+    但下一个有效数据的旧值权重按间隔衰减。
+    """
+
+    def __init__(self, span: float = None, com: float = None):
+        """
+        初始化指数加权均值
+
+        Args:
+            span: 跨度，α = 2 / (span + 1)
+            com: 质心，α = 1 / (1 + com)，与 span 二选一
+        """
+        self.alpha = 1. / (1. + ewm_com(span, com))
+        self.decay = 1. - self.alpha
+        self.reset()
+
+    def reset(self):
+        """清空状态"""
+        self._weighted = None
+        self._old_wt = 1.
+        self._nobs = 0
+        self._undo = None
+
+    def update(self, value: float) -> float:
+        """
+        移入一个新数据
+
+        Args:
+            value: 新数据
+
+        Returns:
+            当前加权均值，还没有有效数据时为 NaN
+        """
+        self._undo = (self._weighted, self._old_wt, self._nobs)
+        is_observation = value == value
+        if self._weighted is None:
+            self._weighted = value
+            self._old_wt = 1.
+            self._nobs = int(is_observation)
+        else:
+            self._nobs += is_observation
+            weighted = self._weighted
+            if weighted == weighted:
+                self._old_wt *= self.decay
+                if is_observation:
+                    # 数值不变时不参与运算，避免常数序列出现舍入误差
+                    if weighted != value:
+                        weighted = self._old_wt * weighted + self.alpha * value
+                        weighted /= (self._old_wt + self.alpha)
+                    self._old_wt = 1.
+            elif is_observation:
+                weighted = value
+            self._weighted = weighted
+        return self._weighted if self._nobs >= 1 else NAN
+
+    def revise_last(self, value: float) -> float:
+        """
+        替换最近移入的数据
+
+        Args:
+            value: 替换后的数据
+
+        Returns:
+            当前加权均值
+        """
+        self._weighted, self._old_wt, self._nobs = self._undo
+        return self.update(value)
@@ -8,7 +8,10 @@ from pathlib import Path
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent))
 
-from data_source import YFinanceDataSource, AKShareDataSource
+from data_source import YFinanceDataSource, AKShareDataSource, BarResampler
+from data_source.resample import resample, MINUTE_TIMEFRAMES
+from data_source.schema import add_trade_date, format_date
+from data_source.persistence import save_frame
 from analysis import SignalAnalyzer
 from chart import plot_stock_analysis, plot_signal_summary
 from config import DEFAULT_STOCK_CODE
@@ -32,7 +35,8 @@ def print_banner():
     print(banner)
 
 
-def analyze_stock(stock_code: str, start_date: str = None, end_date: str = None, use_tushare: bool = False):
+def analyze_stock(stock_code: str, start_date: str = None, end_date: str = None, use_tushare: bool = False,
+                  period: str = None, export_csv: bool = False):
     """
     分析单只股票
 
@@ -41,6 +45,8 @@ def analyze_stock(stock_code: str, start_date: str = None, end_date: str = None,
         start_date: 开始日期
         end_date: 结束日期
         use_tushare: 是否使用 Tushare 数据源（默认使用 Yahoo Finance）
+        period: K 线周期 '5m'/'15m'/'30m'/'60m'/'W'/'M'，默认日线
+        export_csv: 是否另外导出一份 CSV（分析结果默认以 FILE_CONFIG['format'] 格式保存）
     """
     logger.info(f"开始分析股票: {stock_code}")
 
@@ -49,13 +55,21 @@ def analyze_stock(stock_code: str, start_date: str = None, end_date: str = None,
         if use_tushare:
             print("\n[使用 AKShare 数据源 (A股)]...")
             data_source = AKShareDataSource()
-            df = data_source.get_daily_data(stock_code, start_date, end_date)
+            if period:
+                df = BarResampler(data_source).get(stock_code, period, start_date, end_date)
+            else:
+                df = data_source.get_daily_data(stock_code, start_date, end_date)
             stock_info = data_source.get_stock_info(stock_code)
             stock_name = stock_info.get('name', stock_code)
         else:
             print("\n[使用 Yahoo Finance 数据源...]")
             data_source = YFinanceDataSource()
+            if period in MINUTE_TIMEFRAMES:
+                print(f"\n[ERROR] Yahoo Finance 数据源不支持分钟周期 {period}")
+                return
             df = data_source.get_daily_data(stock_code, start_date, end_date)
+            if period:
+                df = resample(df, period)
             stock_info = data_source.get_stock_info(stock_code)
             stock_name = stock_info.get('name', stock_code)
 
@@ -64,7 +78,7 @@ def analyze_stock(stock_code: str, start_date: str = None, end_date: str = None,
             return
 
         print(f"\n[获取到 {len(df)} 条交易数据]")
-        print(f"[日期范围: {df['trade_date'].iloc[0]} ~ {df['trade_date'].iloc[-1]}]")
+        print(f"[日期范围: {format_date(df.index[0])} ~ {format_date(df.index[-1])}]")
 
         # 2. 技术分析
         analyzer = SignalAnalyzer()
@@ -91,9 +105,11 @@ def analyze_stock(stock_code: str, start_date: str = None, end_date: str = None,
 
         # 6. 保存分析结果
         from config import DATA_DIR
-        output_file = DATA_DIR / f"{stock_code}_analysis.csv"
-        df.to_csv(output_file, index=False, encoding='utf-8-sig')
+        output_file = save_frame(df, DATA_DIR / f"{stock_code}_analysis")
         print(f"\n[分析结果已保存到: {output_file}]")
+        if export_csv:
+            csv_file = save_frame(add_trade_date(df), DATA_DIR / f"{stock_code}_analysis.csv")
+            print(f"[CSV 已导出到: {csv_file}]")
 
     except Exception as e:
         logger.error(f"分析股票时出错: {e}")
@@ -127,7 +143,13 @@ def show_help():
 ║  3. 指定日期范围:                                         ║
 ║     python main.py AAPL 2024-01-01 2024-12-31           ║
 ║                                                           ║
-║  4. 交互模式:                                             ║
+║  4. 指定K线周期 (5m/15m/30m/60m/W/M，分钟线仅限A股):     ║
+║     python main.py 000001.SZ --tushare --period=W         ║
+║                                                           ║
+║  5. 另外导出 CSV (分析结果默认保存为 Feather):           ║
+║     python main.py 000001.SZ --tushare --csv              ║
+║                                                           ║
+║  6. 交互模式:                                             ║
 ║     python main.py                                        ║
 ║                                                           ║
 ║  股票代码格式:                                            ║
@@ -191,17 +213,23 @@ def main():
         stock_code = sys.argv[1]
         start_date = None
         end_date = None
+        period = None
 
-        # 跳过 --tushare 参数，获取日期参数
+        export_csv = '--csv' in sys.argv
+
+        # 跳过 --tushare / --csv / --period 参数，获取日期参数
         for i, arg in enumerate(sys.argv[2:], start=2):
-            if arg == '--tushare':
+            if arg in ('--tushare', '--csv'):
+                continue
+            if arg.startswith('--period='):
+                period = arg.split('=', 1)[1]
                 continue
             if start_date is None:
                 start_date = arg
             elif end_date is None:
                 end_date = arg
 
-        analyze_stock(stock_code, start_date, end_date, use_tushare)
+        analyze_stock(stock_code, start_date, end_date, use_tushare, period, export_csv)
     else:
         # 交互模式
         show_help()
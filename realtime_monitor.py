@@ -196,6 +196,33 @@ def get_stock_name(stock_code, data_source=None):
         return stock_code
 
 
+def analyze_incremental(df, cache_key):
+    """
+    技术分析：K 线日期与上次刷新相同时，只增量修正最新一根 K 线
+
+    自动刷新时历史 K 线不变，实时行情只改变最后一根。分析结果和
+    SignalAnalyzer 的增量状态保存在 session_state 中，每次刷新的计算量
+    与历史长度无关；换股、改参数或出现新交易日时重新完整计算。
+    """
+    cached = st.session_state.get('rt_analysis')
+    if cached and cached['key'] == cache_key and cached['df'].index.equals(df.index):
+        result = cached['df']
+        last = df.index[-1]
+        bar = df.iloc[-1]
+        row = cached['analyzer'].revise_last(bar)
+        for col in df.columns:
+            result.at[last, col] = bar[col]
+        for col, value in row.items():
+            result.at[last, col] = value
+        return result
+
+    analyzer = SignalAnalyzer()
+    result = analyzer.analyze(df)
+    analyzer.seed(df)
+    st.session_state['rt_analysis'] = {'key': cache_key, 'df': result, 'analyzer': analyzer}
+    return result
+
+
 # 加载自选股票列表
 if st.session_state['rt_watchlist'] is None:
     st.session_state['rt_watchlist'] = load_watchlist()
@@ -397,7 +424,6 @@ try:
 
     # 获取数据
     data_source = AKShareDataSource()
-    analyzer = SignalAnalyzer()
 
     end_date = datetime.now().strftime('%Y-%m-%d')
     start_date = (datetime.now() - timedelta(days=data_days)).strftime('%Y-%m-%d')
@@ -431,8 +457,10 @@ try:
             if 'open' in realtime_row and pd.notna(realtime_row['open']):
                 df.loc[df.index[-1], 'open'] = realtime_row['open']
 
-        # 技术分析
-        df = analyzer.analyze(df)
+        # 技术分析（参数不变时增量更新最新一根 K 线）
+        analysis_key = (stock_code, data_days, buy_threshold, sell_threshold, rsi_overbought, rsi_oversold,
+                        kdj_overbought, kdj_oversold, ma_short, ma_medium, ma_long)
+        df = analyze_incremental(df, analysis_key)
 
         # 获取最新数据
         latest = df.iloc[-1]
@@ -0,0 +1,60 @@
+"""
+多接口请求熔断测试
+"""
+import pandas as pd
+import pytest
+from data_source.hedge import CircuitBreaker, HedgedCaller
+from data_source.rate_limiter import RateLimitTimeout
+
+
+def make_caller():
+    return HedgedCaller('test', ['primary', 'backup'], {'failure_threshold': 3, 'reset_timeout': 60})
+
+
+def bad_symbol():
+    raise KeyError('data')
+
+
+def test_bad_symbol_errors_leave_breaker_closed():
+    caller = make_caller()
+    for _ in range(10):
+        with pytest.raises(KeyError):
+            caller.call([('primary', bad_symbol)], hedge=False)
+    assert caller.breakers['primary'].state == CircuitBreaker.CLOSED
+
+
+def test_empty_results_and_limiter_timeouts_leave_breaker_closed():
+    caller = make_caller()
+
+    def timeout():
+        raise RateLimitTimeout('等待令牌超时')
+
+    for _ in range(10):
+        result = caller.call([('primary', pd.DataFrame)], is_valid=lambda df: not df.empty, hedge=False)
+        assert result.empty
+        with pytest.raises(RateLimitTimeout):
+            caller.call([('primary', timeout)], hedge=False)
+    assert caller.breakers['primary'].state == CircuitBreaker.CLOSED
+
+
+def test_connection_errors_open_breaker_and_fail_over():
+    caller = make_caller()
+
+    def down():
+        raise ConnectionError('连接被重置')
+
+    calls = [('primary', down), ('backup', lambda: 'ok')]
+    for _ in range(3):
+        assert caller.call(calls, hedge=False) == 'ok'
+    assert caller.breakers['primary'].state == CircuitBreaker.OPEN
+    assert caller.breakers['backup'].state == CircuitBreaker.CLOSED
+
+
+def test_ignored_probe_releases_half_open_breaker():
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_ignored()
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,59 @@
+"""
+交易日历边界测试（内置节假日表覆盖 2020-01-01 ~ 2026-12-31）
+"""
+from datetime import datetime
+import pandas as pd
+import pytest
+from utils.trading_calendar import HOLIDAYS, TradingCalendar, _builtin_trading_days
+
+
+@pytest.fixture
+def calendar():
+    years = sorted(HOLIDAYS)
+    return TradingCalendar(_builtin_trading_days(), f"{years[0]}-01-01", f"{years[-1]}-12-31")
+
+
+@pytest.mark.parametrize('date, expected', [
+    ('2027-01-04', '2026-12-31'),   # 覆盖范围后的第一个周一
+    ('2027-01-01', '2026-12-31'),
+    ('2027-01-02', '2026-12-31'),   # 周六
+    ('2027-01-05', '2027-01-04'),
+    ('2027-03-15', '2027-03-12'),   # 周一
+    ('2027-03-17', '2027-03-16'),   # 周三
+    ('2028-03-15', '2028-03-14'),
+    ('2027-10-08', '2027-10-07'),
+    ('2026-12-31', '2026-12-30'),
+    ('2020-01-02', '2019-12-31'),   # 第一个交易日
+    ('2019-06-03', '2019-05-31'),
+    ('2019-06-05', '2019-06-04'),
+])
+def test_previous_trading_day(calendar, date, expected):
+    assert calendar.previous_trading_day(date) == pd.Timestamp(expected)
+
+
+@pytest.mark.parametrize('date, expected', [
+    ('2019-06-03', '2019-06-04'),
+    ('2019-06-07', '2019-06-10'),   # 周五
+    ('2019-12-31', '2020-01-02'),   # 2020-01-01 休市
+    ('2019-12-30', '2019-12-31'),
+    ('2026-12-31', '2027-01-04'),   # 覆盖范围外按工作日处理，元旦固定休市
+    ('2027-01-04', '2027-01-05'),
+    ('2027-03-12', '2027-03-15'),
+    ('2026-09-30', '2026-10-08'),   # 国庆假期
+])
+def test_next_trading_day(calendar, date, expected):
+    assert calendar.next_trading_day(date) == pd.Timestamp(expected)
+
+
+def test_last_session_day_after_table(calendar):
+    # 开盘前取上一个交易日，开盘后取当天
+    assert calendar.last_session_day(datetime(2027, 1, 4, 8, 0)) == pd.Timestamp('2026-12-31')
+    assert calendar.last_session_day(datetime(2027, 1, 4, 10, 0)) == pd.Timestamp('2027-01-04')
+    assert calendar.last_session_day(datetime(2027, 3, 13, 10, 0)) == pd.Timestamp('2027-03-12')
+
+
+def test_is_trading_day_outside_table(calendar):
+    assert calendar.is_trading_day('2027-01-04')
+    assert not calendar.is_trading_day('2027-01-01')
+    assert not calendar.is_trading_day('2027-01-02')
+    assert calendar.count_trading_days('2026-12-28', '2027-01-08') == 9
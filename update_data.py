@@ -10,6 +10,8 @@ import os
 
 os.chdir('/root/.openclaw/workspace-finance/stock-analyzer')
 
+from warmup import warm_up
+
 # 批量分析热门股票
 STOCKS = "600519.SH 600036.SH 601318.SH 600900.SH 000001.SZ 300750.SZ 002594.SZ 300059.SZ 601888.SH 000002.SZ"
 
@@ -17,6 +19,14 @@ print("=" * 50)
 print("收盘后更新网站数据")
 print("=" * 50)
 
+# 预热全市场本地数据和分析结果，次日开盘分析直接读取
+print("\n预热本地数据...")
+try:
+    stats = warm_up()
+    print(f"✅ 预热完成: 成功 {stats['ok']}/{stats['total']}，耗时 {stats['seconds']} 秒")
+except Exception as e:
+    print(f"❌ 预热失败: {e}")
+
 # 运行批量分析
 print("\n运行批量分析...")
 result = subprocess.run(
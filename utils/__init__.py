@@ -2,5 +2,6 @@
 工具模块
 """
 from .logger import setup_logger
+from .trading_calendar import TradingCalendar, get_trading_calendar
 
-__all__ = ['setup_logger']
+__all__ = ['setup_logger', 'TradingCalendar', 'get_trading_calendar']
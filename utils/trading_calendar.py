@@ -0,0 +1,307 @@
+"""
+A 股交易日历（本地节假日表，按交易日数组二分查找）
+"""
+import threading
+import numpy as np
+import pandas as pd
+from datetime import datetime, time as dtime
+from typing import List, Optional, Tuple
+from config import CALENDAR_CONFIG
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 沪深交易所休市的工作日（周末本来就休市，调休上班的周末也不开市）
+HOLIDAYS = {
+    2020: ['0101', '0124', '0127', '0128', '0129', '0130', '0131', '0406', '0501', '0504',
+           '0505', '0625', '0626', '1001', '1002', '1005', '1006', '1007', '1008'],
+    2021: ['0101', '0211', '0212', '0215', '0216', '0217', '0405', '0503', '0504', '0505',
+           '0614', '0920', '0921', '1001', '1004', '1005', '1006', '1007'],
+    2022: ['0103', '0131', '0201', '0202', '0203', '0204', '0404', '0405', '0502', '0503',
+           '0504', '0603', '0912', '1003', '1004', '1005', '1006', '1007'],
+    2023: ['0102', '0123', '0124', '0125', '0126', '0127', '0405', '0501', '0502', '0503',
+           '0622', '0623', '0929', '1002', '1003', '1004', '1005', '1006'],
+    2024: ['0101', '0209', '0212', '0213', '0214', '0215', '0216', '0404', '0405', '0501',
+           '0502', '0503', '0610', '0916', '0917', '1001', '1002', '1003', '1004', '1007'],
+    2025: ['0101', '0128', '0129', '0130', '0131', '0203', '0204', '0404', '0501', '0502',
+           '0505', '0602', '1001', '1002', '1003', '1006', '1007', '1008'],
+    2026: ['0101', '0102', '0216', '0217', '0218', '0219', '0220', '0223', '0406', '0501',
+           '0504', '0505', '0619', '0925', '1001', '1002', '1005', '1006', '1007'],
+}
+
+# 节假日表之外的年份也固定休市的日期（元旦、劳动节、国庆节前三天）
+FIXED_HOLIDAYS = ['0101', '0501', '1001', '1002', '1003']
+
+# 交易时段（连续竞价）
+SESSIONS = [(dtime(9, 30), dtime(11, 30)), (dtime(13, 0), dtime(15, 0))]
+
+# 开盘集合竞价开始时间
+AUCTION_OPEN = dtime(9, 15)
+
+
+def _builtin_trading_days() -> pd.DatetimeIndex:
+    """由内置节假日表生成交易日（工作日去掉休市日）"""
+    years = sorted(HOLIDAYS)
+    weekdays = pd.bdate_range(f"{years[0]}-01-01", f"{years[-1]}-12-31")
+    holidays = pd.DatetimeIndex([f"{year}{day}" for year in years for day in HOLIDAYS[year]])
+    return weekdays.difference(holidays)
+
+
+def _fixed_holidays(first: np.datetime64, last: np.datetime64) -> np.ndarray:
+    """[first, last] 前后各一年内的固定休市日，供超出覆盖范围时按工作日推算"""
+    lo = first.astype('datetime64[Y]').astype(int) + 1970 - 1
+    hi = last.astype('datetime64[Y]').astype(int) + 1970 + 1
+    return np.array([f"{year}-{day[:2]}-{day[2:]}" for year in range(lo, hi + 1) for day in FIXED_HOLIDAYS],
+                    dtype='datetime64[D]')
+
+
+class TradingCalendar:
+    """
+    A 股交易日历
+
+    交易日保存为升序的日期数组（二分查找前后交易日、区间交易日）和
+    整数集合（O(1) 判断是否为交易日）。超出日历覆盖范围的日期按工作日处理
+    （去掉 FIXED_HOLIDAYS 中的固定休市日）。
+    """
+
+    def __init__(self, days: pd.DatetimeIndex, start=None, end=None):
+        """
+        初始化交易日历
+
+        Args:
+            days: 全部交易日
+            start: 日历覆盖的第一天，默认为第一个交易日
+            end: 日历覆盖的最后一天，默认为最后一个交易日
+        """
+        self.days = pd.DatetimeIndex(days).normalize().unique().sort_values()
+        self._values = self.days.values.astype('datetime64[D]')
+        self._set = set(self._values.astype(np.int64).tolist())
+        self.first = pd.Timestamp(start) if start is not None else self.days[0]
+        self.last = pd.Timestamp(end) if end is not None else self.days[-1]
+        self._first = self._day(self.first)
+        self._last = self._day(self.last)
+
+    @classmethod
+    def load(cls) -> 'TradingCalendar':
+        """
+        加载交易日历：内置节假日表，并合并 refresh() 保存在本地的交易所日历
+
+        Returns:
+            交易日历
+        """
+        days = _builtin_trading_days()
+        years = sorted(HOLIDAYS)
+        start, end = pd.Timestamp(f"{years[0]}-01-01"), pd.Timestamp(f"{years[-1]}-12-31")
+        path = CALENDAR_CONFIG['path']
+        if path.exists():
+            try:
+                saved = pd.DatetimeIndex(pd.read_parquet(path)['date'])
+                # 本地保存的交易所日历优先，之后的年份用内置表补充
+                days = saved.append(days[days > saved.max()])
+                start, end = min(start, saved.min()), max(end, saved.max())
+            except Exception as e:
+                logger.warning(f"读取本地交易日历 {path} 失败，使用内置节假日表: {e}")
+        return cls(days, start, end)
+
+    @classmethod
+    def refresh(cls) -> 'TradingCalendar':
+        """
+        从 AKShare 下载交易所历史交易日并保存到本地
+
+        Returns:
+            更新后的交易日历
+        """
+        import akshare as ak
+        df = ak.tool_trade_date_hist_sina()
+        days = pd.DatetimeIndex(pd.to_datetime(df['trade_date']), name='date')
+        path = CALENDAR_CONFIG['path']
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame({'date': days}).to_parquet(path, index=False)
+        logger.info(f"交易日历已更新，共 {len(days)} 个交易日（至 {days.max():%Y-%m-%d}）")
+        return cls.load()
+
+    @staticmethod
+    def _day(date) -> np.datetime64:
+        return np.datetime64(pd.Timestamp(date).date(), 'D')
+
+    def _covered(self, day: np.datetime64) -> bool:
+        return self._first <= day <= self._last
+
+    def is_trading_day(self, date=None) -> bool:
+        """
+        判断是否为交易日
+
+        Args:
+            date: 日期，默认今天
+
+        Returns:
+            是否为交易日
+        """
+        day = self._day(date if date is not None else datetime.now())
+        if not self._covered(day):
+            return bool(np.is_busday(day, holidays=_fixed_holidays(day, day)))
+        return int(day.astype(np.int64)) in self._set
+
+    def previous_trading_day(self, date=None) -> pd.Timestamp:
+        """
+        上一个交易日（不含当天）
+
+        Args:
+            date: 日期，默认今天
+
+        Returns:
+            上一个交易日
+        """
+        day = self._day(date if date is not None else datetime.now())
+        if day - 1 > self._last:
+            # 晚于覆盖范围：从当天按工作日向前推，推回覆盖范围内时取最后一个交易日
+            candidate = np.busday_offset(day, -1, roll='forward', holidays=_fixed_holidays(day, day))
+            return pd.Timestamp(candidate if candidate > self._last else self._values[-1])
+        pos = np.searchsorted(self._values, day, side='left')
+        if pos == 0:
+            # 早于覆盖范围内的第一个交易日：从当天（或覆盖范围起点）按工作日向前推
+            day = min(day, self._first)
+            return pd.Timestamp(np.busday_offset(day, -1, roll='forward', holidays=_fixed_holidays(day, day)))
+        return pd.Timestamp(self._values[pos - 1])
+
+    def next_trading_day(self, date=None) -> pd.Timestamp:
+        """
+        下一个交易日（不含当天）
+
+        Args:
+            date: 日期，默认今天
+
+        Returns:
+            下一个交易日
+        """
+        day = self._day(date if date is not None else datetime.now())
+        if day + 1 < self._first:
+            # 早于覆盖范围：从当天按工作日向后推，推进覆盖范围内时取第一个交易日
+            candidate = np.busday_offset(day, 1, roll='backward', holidays=_fixed_holidays(day, day))
+            return pd.Timestamp(candidate if candidate < self._first else self._values[0])
+        pos = np.searchsorted(self._values, day, side='right')
+        if pos == len(self._values):
+            # 晚于覆盖范围内的最后一个交易日：从当天（或覆盖范围终点）按工作日向后推
+            day = max(day, self._last)
+            return pd.Timestamp(np.busday_offset(day, 1, roll='backward', holidays=_fixed_holidays(day, day)))
+        return pd.Timestamp(self._values[pos])
+
+    def trading_days_between(self, start, end) -> pd.DatetimeIndex:
+        """
+        区间内的全部交易日（含首尾）
+
+        Args:
+            start: 开始日期
+            end: 结束日期
+
+        Returns:
+            交易日序列
+        """
+        start, end = self._day(start), self._day(end)
+        if start > end:
+            return pd.DatetimeIndex([])
+        if self._covered(start) and self._covered(end):
+            lo = np.searchsorted(self._values, start, side='left')
+            hi = np.searchsorted(self._values, end, side='right')
+            return self.days[lo:hi]
+        # 超出覆盖范围的部分按工作日处理
+        weekdays = pd.bdate_range(pd.Timestamp(start), pd.Timestamp(end))
+        weekdays = weekdays.difference(pd.DatetimeIndex(_fixed_holidays(start, end)))
+        inside = (weekdays >= self.first) & (weekdays <= self.last)
+        known = self.days[(self.days >= pd.Timestamp(start)) & (self.days <= pd.Timestamp(end))]
+        return known.append(weekdays[~inside]).sort_values()
+
+    def trading_day_values(self, start, end) -> np.ndarray:
+        """
+        区间内的全部交易日（含首尾），返回 datetime64[D] 数组，供向量化计算使用
+
+        Args:
+            start: 开始日期
+            end: 结束日期
+
+        Returns:
+            交易日数组
+        """
+        lo, hi = self._day(start), self._day(end)
+        if self._covered(lo) and self._covered(hi):
+            return self._values[np.searchsorted(self._values, lo, side='left'):
+                                np.searchsorted(self._values, hi, side='right')]
+        return self.trading_days_between(start, end).values.astype('datetime64[D]')
+
+    def count_trading_days(self, start, end) -> int:
+        """
+        区间内的交易日数（含首尾）
+
+        Args:
+            start: 开始日期
+            end: 结束日期
+
+        Returns:
+            交易日数
+        """
+        return len(self.trading_days_between(start, end))
+
+    def session_times(self, date=None) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        某日的连续竞价时段
+
+        Args:
+            date: 日期，默认今天
+
+        Returns:
+            [(开始, 结束), ...]，非交易日返回空列表
+        """
+        date = pd.Timestamp(date if date is not None else datetime.now()).normalize()
+        if not self.is_trading_day(date):
+            return []
+        return [(pd.Timestamp.combine(date.date(), open_), pd.Timestamp.combine(date.date(), close))
+                for open_, close in SESSIONS]
+
+    def is_trading_time(self, now: Optional[datetime] = None) -> bool:
+        """
+        判断是否处于交易时段（含开盘集合竞价）
+
+        Args:
+            now: 当前时间，默认取系统时间
+
+        Returns:
+            是否处于交易时段
+        """
+        now = now or datetime.now()
+        if not self.is_trading_day(now):
+            return False
+        t = now.time()
+        return AUCTION_OPEN <= t <= SESSIONS[0][1] or SESSIONS[1][0] <= t <= SESSIONS[1][1]
+
+    def last_session_day(self, now: Optional[datetime] = None) -> pd.Timestamp:
+        """
+        最近一个已开盘（或正在交易）的交易日
+
+        Args:
+            now: 当前时间，默认取系统时间
+
+        Returns:
+            交易日日期
+        """
+        now = now or datetime.now()
+        if self.is_trading_day(now) and now.time() >= AUCTION_OPEN:
+            return pd.Timestamp(now.date())
+        return self.previous_trading_day(now)
+
+
+_calendar: Optional[TradingCalendar] = None
+_calendar_lock = threading.Lock()
+
+
+def get_trading_calendar() -> TradingCalendar:
+    """
+    获取进程内共享的交易日历（首次调用时加载）
+
+    Returns:
+        交易日历
+    """
+    global _calendar
+    with _calendar_lock:
+        if _calendar is None:
+            _calendar = TradingCalendar.load()
+        return _calendar
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+收盘后预热任务 - 更新全市场日线、基础信息表并预计算分析结果
+
+运行后本地行情存储、股票基础信息表和分析结果缓存都是最新的，
+次日开盘前后的分析可以直接读取，不再请求网络。
+
+用法:
+    python warmup.py                    # 全市场（或 WARMUP_CONFIG['symbols']）
+    python warmup.py 600519.SH 000001.SZ
+    python warmup.py --limit=100
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from data_source import AKShareDataSource, SYMBOL_METADATA, AKSHARE_LIMITER, UniversePanel
+from analysis import SignalAnalyzer
+from analysis.signal_cache import SignalCache, summarize
+from config import WARMUP_CONFIG
+from utils.logger import setup_logger
+from utils.trading_calendar import get_trading_calendar
+
+logger = setup_logger("warmup")
+
+
+def warm_up(symbols: Optional[List[str]] = None, limit: Optional[int] = None,
+            precompute: bool = True) -> Dict:
+    """
+    预热本地缓存：基础信息表、日线存储、分析结果缓存和全市场日线面板
+
+    Args:
+        symbols: 股票代码列表，默认取 WARMUP_CONFIG['symbols']，仍为空时取全市场
+        limit: 只处理前 limit 只股票
+        precompute: 是否预计算并保存分析结果
+
+    Returns:
+        统计信息 {'total', 'ok', 'failed', 'as_of', 'seconds'}
+    """
+    started = time.monotonic()
+    calendar = get_trading_calendar()
+    as_of = calendar.last_session_day()
+
+    # 1. 基础信息表（名称、交易所、板块、行业、上市日期）
+    SYMBOL_METADATA.load(refresh=True)
+    data_source = AKShareDataSource()
+    universe = data_source.get_universe().to_dict()
+
+    symbols = symbols or WARMUP_CONFIG['symbols'] or list(universe)
+    if limit:
+        symbols = symbols[:limit]
+    start_date = (as_of - timedelta(days=WARMUP_CONFIG['lookback_days'])).strftime('%Y%m%d')
+    logger.info(f"开始预热 {len(symbols)} 只股票（{start_date} ~ {as_of:%Y%m%d}）")
+
+    # 2. 并行下载日线，实际并发和请求速率由 AKShare 限流器自适应控制
+    analyzer = SignalAnalyzer() if precompute else None
+    cache = SignalCache() if precompute else None
+    summary, frames, failed = {}, {}, {}
+
+    with ThreadPoolExecutor(max_workers=WARMUP_CONFIG['workers']) as pool:
+        futures = {pool.submit(data_source.get_daily_data, code, start_date): code for code in symbols}
+        for i, future in enumerate(as_completed(futures), 1):
+            code = futures[future]
+            try:
+                df = future.result()
+                if df.empty:
+                    raise ValueError("无数据")
+                if WARMUP_CONFIG['build_panel']:
+                    frames[code] = df
+                # 3. 预计算分析结果
+                if precompute:
+                    df = analyzer.analyze(df)
+                    cache.save_symbol(code, df)
+                    summary[code] = {'name': universe.get(code, code), **summarize(df)}
+            except Exception as e:
+                failed[code] = str(e)
+            if i % 200 == 0 or i == len(futures):
+                logger.info(f"预热进度 {i}/{len(futures)}，失败 {len(failed)}，限流器 {AKSHARE_LIMITER.stats()}")
+
+    if precompute and summary:
+        cache.save_summary(summary, as_of)
+
+    # 4. 全市场日线面板，供指标计算以内存映射方式零拷贝读取
+    if frames:
+        UniversePanel.from_frames(frames, start_date, as_of).save()
+
+    stats = {
+        'total': len(symbols),
+        'ok': len(symbols) - len(failed),
+        'failed': failed,
+        'as_of': as_of.strftime('%Y%m%d'),
+        'seconds': round(time.monotonic() - started, 1),
+    }
+    logger.info(f"预热完成: 成功 {stats['ok']}/{stats['total']}，耗时 {stats['seconds']} 秒")
+    return stats
+
+
+def main():
+    """命令行入口"""
+    args = sys.argv[1:]
+    limit = None
+    symbols = []
+    for arg in args:
+        if arg.startswith('--limit='):
+            limit = int(arg.split('=', 1)[1])
+        else:
+            symbols.append(arg)
+
+    if not get_trading_calendar().is_trading_day(datetime.now()):
+        print("今天不是交易日，使用最近一个交易日的数据预热")
+
+    stats = warm_up(symbols or None, limit)
+    print(f"预热完成: 成功 {stats['ok']}/{stats['total']}，数据日期 {stats['as_of']}，"
+          f"耗时 {stats['seconds']} 秒")
+    for code, reason in list(stats['failed'].items())[:10]:
+        print(f"  失败 {code}: {reason}")
+
+
+if __name__ == '__main__':
+    main()
@@ -46,6 +46,9 @@ def watch():
     current_signals = {}
     alerts = []
     
+    # 一次请求获取全部盯盘股票的实时行情
+    quotes = data_source.get_realtime_batch(WATCH_STOCKS)
+    
     for code in WATCH_STOCKS:
         try:
             # 获取最近5天数据
@@ -56,8 +59,8 @@ def watch():
             df_analyzed = analyzer.analyze(df)
             latest = df_analyzed.iloc[-1]
             
-            name = data_source.get_stock_info(code).get('name', code)
-            close = latest['close']
+            name = quotes.at[code, 'name'] if code in quotes.index else code
+            close = quotes.at[code, 'price'] if code in quotes.index else latest['close']
             buy_score = int(latest.get('BUY_SCORE', 0))
             sell_score = int(latest.get('SELL_SCORE', 0))
             signal = latest.get('SIGNAL', 'HOLD')
@@ -12,7 +12,7 @@ import pandas as pd
 from datetime import datetime, timedelta
 import json
 
-from data_source import AKShareDataSource, YFinanceDataSource
+from data_source import AKShareDataSource, YFinanceDataSource, SYMBOL_METADATA
 
 # 自选股文件路径
 WATCHLIST_FILE = Path(__file__).parent / "data"
@@ -39,30 +39,19 @@ if not st.session_state['authenticated']:
     
     st.stop()
 
-# 股票名称映射
-STOCK_NAMES = {
-    "000001.SZ": "平安银行", "600519.SH": "贵州茅台", "600036.SH": "招商银行",
-    "600900.SH": "长江电力", "601318.SH": "中国平安", "300750.SZ": "宁德时代",
-    "300059.SZ": "东方财富", "600410.SH": "华胜天成", "002185.SZ": "华天科技",
-    "002009.SZ": "天奇股份", "002594.SZ": "比亚迪", "000002.SZ": "万科A",
-    "601888.SH": "中国中免", "002475.SZ": "立讯精密", "002230.SZ": "科大讯飞",
+# 美股名称映射（A 股名称来自本地基础信息表）
+US_STOCK_NAMES = {
     "AAPL": "苹果", "TSLA": "特斯拉", "NVDA": "英伟达", "MSFT": "微软",
     "GOOGL": "谷歌", "AMZN": "亚马逊", "META": "Meta", "AMD": "AMD",
 }
 
-# 股票代码自动加后缀
-STOCK_MARKET_MAP = {
-    "600000": "SH", "600036": "SH", "600519": "SH", "600900": "SH", "600410": "SH", 
-    "601318": "SH", "601888": "SH", "600016": "SH", "600030": "SH", "600031": "SH", 
-    "600887": "SH", "688981": "SH", "000001": "SZ", "000002": "SZ", "000333": "SZ", 
-    "000651": "SZ", "000858": "SZ", "300750": "SZ", "300059": "SZ", "002594": "SZ", 
-    "002475": "SZ", "002185": "SZ", "002009": "SZ", "002230": "SZ", "002371": "SZ",
-}
-
 def detect_market(code):
     code = code.strip().upper().replace(".SH", "").replace(".SZ", "")
-    if code in STOCK_MARKET_MAP:
-        return code + "." + STOCK_MARKET_MAP[code]
+    if code.isdigit():
+        # 优先使用本地基础信息表中的完整代码
+        info = SYMBOL_METADATA.lookup(code)
+        if info is not None:
+            return info['symbol']
     if code.startswith("6") or code.startswith("688"):
         return code + ".SH"
     if code.startswith("00") or code.startswith("30"):
@@ -70,7 +59,9 @@ def detect_market(code):
     return code  # 美股直接返回
 
 def get_stock_name(full_code):
-    return STOCK_NAMES.get(full_code, full_code)
+    if full_code[:6].isdigit():
+        return SYMBOL_METADATA.get_name(full_code)
+    return US_STOCK_NAMES.get(full_code, full_code)
 
 # 页面配置
 st.set_page_config(page_title="股票技术分析系统", page_icon="📈", layout="wide")